@@ -1,4 +1,4 @@
-import { useState, useRef } from 'react';
+import { useState, useRef, useEffect } from 'react';
 import axios from 'axios';
 import { Mic, Zap, ArrowLeft, BarChart3 } from 'lucide-react';
 
@@ -16,7 +16,16 @@ interface AnalysisResult {
     confidence: number;
 }
 
+interface LiveResult {
+    revision: number;
+    error?: string;
+    prediction?: number;
+    confidence?: number;
+}
+
 const API_URL = (import.meta as any).env.VITE_API_URL || '';
+// Live preview socket: the server debounces updates and only answers the latest revision
+const LIVE_URL = `${(API_URL || window.location.origin).replace(/^http/, 'ws')}/api/ws/predict`;
 /* ---- SVG Result Icons ---- */
 const SmileIcon = () => (
     <svg width="40" height="40" viewBox="0 0 48 48" fill="none">
@@ -43,7 +52,62 @@ const Analyzer = () => {
     const [isLoading, setIsLoading] = useState<boolean>(false);
     const [error, setError] = useState<string>('');
     const [validationError, setValidationError] = useState<string>('');
+    const [livePreview, setLivePreview] = useState<LiveResult | null>(null);
     const recognitionRef = useRef<any>(null);
+    const socketRef = useRef<WebSocket | null>(null);
+    const revisionRef = useRef<number>(0);
+    const messageRef = useRef<string>('');
+
+    useEffect(() => {
+        let retryTimer: ReturnType<typeof setTimeout> | undefined;
+        let attempts = 0;
+        let unmounted = false;
+
+        const connect = () => {
+            const socket = new WebSocket(LIVE_URL);
+            socket.onopen = () => {
+                attempts = 0;
+                // Re-send what is in the box so a reconnect picks up where it left off
+                if (messageRef.current.trim().length >= 3) {
+                    socket.send(JSON.stringify({
+                        revision: revisionRef.current,
+                        message: messageRef.current,
+                    }));
+                }
+            };
+            socket.onmessage = (event) => {
+                const data: LiveResult = JSON.parse(event.data);
+                // Ignore anything but the answer to what is in the box right now
+                if (data.revision === revisionRef.current) setLivePreview(data);
+            };
+            socket.onclose = () => {
+                socketRef.current = null;
+                if (unmounted) return;
+                // Reconnect with exponential backoff (1s, 2s, 4s ... capped at 30s)
+                retryTimer = setTimeout(connect, Math.min(1000 * 2 ** attempts, 30000));
+                attempts += 1;
+            };
+            socketRef.current = socket;
+        };
+
+        connect();
+        return () => {
+            unmounted = true;
+            clearTimeout(retryTimer);
+            socketRef.current?.close();
+        };
+    }, []);
+
+    useEffect(() => {
+        revisionRef.current += 1;
+        messageRef.current = message;
+        const socket = socketRef.current;
+        if (message.trim().length < 3 || !socket || socket.readyState !== WebSocket.OPEN) {
+            setLivePreview(null);
+            return;
+        }
+        socket.send(JSON.stringify({ revision: revisionRef.current, message }));
+    }, [message]);
 
     const validate = (): boolean => {
         if (!message.trim()) {
@@ -203,6 +267,16 @@ const Analyzer = () => {
 
                                     <div className="char-counter">{message.length} / 2,000</div>
 
+                                    {livePreview && livePreview.prediction !== undefined && (
+                                        <div className="live-preview" aria-live="polite">
+                                            Live preview:{' '}
+                                            <span className={`stat-card-value ${livePreview.prediction === 1 ? 'positive' : 'negative'}`}>
+                                                {livePreview.prediction === 1 ? 'Positive' : 'Negative'}
+                                            </span>
+                                            {' '}· {livePreview.confidence}%
+                                        </div>
+                                    )}
+
                                     <button
                                         type="submit"
                                         className="btn-submit"
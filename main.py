@@ -1,12 +1,27 @@
 import os
+import sys
+import json
+import time
+import asyncio
 import logging
-
-from fastapi import FastAPI, HTTPException, Request
+import secrets
+import threading
+from contextlib import asynccontextmanager
+from typing import List
+from urllib.parse import urlsplit
+
+from fastapi import (
+    BackgroundTasks, FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect,
+)
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from pydantic import BaseModel, field_validator
+from fastapi.concurrency import run_in_threadpool
+from limits import parse as parse_rate_limit
+from limits.storage import MemoryStorage
+from limits.strategies import MovingWindowRateLimiter
+from pydantic import BaseModel, field_validator, model_validator
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -18,6 +33,56 @@ DEBUG_MODE = os.environ.get("DEBUG", "false").lower() == "true"
 ALLOWED_ORIGINS = os.environ.get(
     "ALLOWED_ORIGINS", "http://localhost:5173"
 ).split(",")
+# "distilbert" (default), or "mnb"/"fasttext": hot-swappable artefacts of
+# that type from MODELS_DIR (artefacts of the other type are ignored)
+MODEL_BACKEND = os.environ.get("MODEL_BACKEND", "distilbert").lower()
+# MODEL_BACKEND -> manifest model_type values it serves
+REGISTRY_BACKENDS = {"mnb": ("tfidf-mnb", "hashed-mnb"), "fasttext": ("fasttext",)}
+MODEL_WATCH_INTERVAL = float(os.environ.get("MODEL_WATCH_INTERVAL", "10"))
+# Admin endpoints are disabled unless a token is configured
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+# Shared checkpoint that labelled reviews posted to /admin/training are
+# folded into (unset = disabled; needs scikit-learn)
+ONLINE_CHECKPOINT = os.environ.get("ONLINE_CHECKPOINT", "")
+# Candidate model scored on sampled traffic off the request path: an
+# artefact version in MODELS_DIR, an artefact path, or "distilbert"
+SHADOW_MODEL = os.environ.get("SHADOW_MODEL", "")
+SHADOW_SAMPLE_RATE = float(os.environ.get("SHADOW_SAMPLE_RATE", "0.1"))
+SHADOW_BUFFER_SIZE = int(os.environ.get("SHADOW_BUFFER_SIZE", "1000"))
+# Persist predictions to this SQLite file (unset = disabled)
+PREDICTION_DB = os.environ.get("PREDICTION_DB", "")
+PREDICTION_BATCH_SIZE = int(os.environ.get("PREDICTION_BATCH_SIZE", "100"))
+PREDICTION_FLUSH_INTERVAL = float(os.environ.get("PREDICTION_FLUSH_INTERVAL", "1.0"))
+PREDICTION_QUEUE_SIZE = int(os.environ.get("PREDICTION_QUEUE_SIZE", "10000"))
+# "drop" (never wait) or "block" (wait for queue space, off the event loop)
+PREDICTION_QUEUE_POLICY = os.environ.get("PREDICTION_QUEUE_POLICY", "drop").lower()
+# Longest a "block" submit waits for queue space before dropping the record
+PREDICTION_BLOCK_TIMEOUT = float(os.environ.get("PREDICTION_BLOCK_TIMEOUT", "1.0"))
+# Shared directory where each worker publishes its rolling analytics
+# (unset = this process's counts only)
+ANALYTICS_DIR = os.environ.get("ANALYTICS_DIR", "")
+ANALYTICS_SYNC_INTERVAL = float(os.environ.get("ANALYTICS_SYNC_INTERVAL", "5"))
+# Live analysis WebSocket: score after this much typing quiet, but at
+# least every LIVE_MAX_DELAY_MS while updates keep arriving
+LIVE_DEBOUNCE_MS = float(os.environ.get("LIVE_DEBOUNCE_MS", "300"))
+LIVE_MAX_DELAY_MS = float(os.environ.get("LIVE_MAX_DELAY_MS", "1500"))
+# Live-preview inferences per client IP, shared by all of its connections
+LIVE_RATE_LIMIT = os.environ.get("LIVE_RATE_LIMIT", "30/minute")
+# "low": bfloat16 DistilBERT from mmapped safetensors, single-threaded
+# torch, fewer malloc arenas and heap trimming after bursts
+MEMORY_PROFILE = os.environ.get("MEMORY_PROFILE", "default").lower()
+LOW_MEMORY = MEMORY_PROFILE == "low"
+# torch thread pools (0 = torch's default of one thread per core)
+TORCH_NUM_THREADS = int(os.environ.get("TORCH_NUM_THREADS", "1" if LOW_MEMORY else "0"))
+TORCH_INTEROP_THREADS = int(os.environ.get("TORCH_INTEROP_THREADS", "1" if LOW_MEMORY else "0"))
+# Most texts per DistilBERT forward pass; requests are not batched across
+# callers, so only aspect requests (review + sentences) send more than one
+INFERENCE_BATCH_SIZE = int(os.environ.get("INFERENCE_BATCH_SIZE", "32"))
+MALLOC_ARENA_MAX = int(os.environ.get("MALLOC_ARENA_MAX", "2" if LOW_MEMORY else "0"))
+MALLOC_TRIM_IDLE_SECONDS = float(os.environ.get("MALLOC_TRIM_IDLE_SECONDS", "5"))
+# Where profiles of requests sent with an ``X-Profile`` header are saved
+# (allowed in DEBUG mode or with the admin token)
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
 
 # ---------------------------------------------------------------------------
 # Logging -- structured format for production observability
@@ -34,15 +99,31 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 RATE_LIMIT = os.environ.get("RATE_LIMIT", "10/minute")
 limiter = Limiter(key_func=get_remote_address, default_limits=[RATE_LIMIT])
+# WebSockets bypass slowapi; live-preview inferences have their own budget
+live_rate_limit = parse_rate_limit(LIVE_RATE_LIMIT)
+live_limiter = MovingWindowRateLimiter(MemoryStorage())
+
 
 # ---------------------------------------------------------------------------
 # App initialisation
 # ---------------------------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Flush background writers before the process exits
+    if prediction_store is not None:
+        await run_in_threadpool(prediction_store.close, 10)
+    if shadow_scorer is not None:
+        await run_in_threadpool(shadow_scorer.stop, 5)
+    await run_in_threadpool(stop_analytics_publisher)
+
+
 app = FastAPI(
     title="Restaurant Review Sentiment Analyser",
     description="ML-powered sentiment analysis for restaurant reviews",
     version="2.0.0",
     debug=DEBUG_MODE,
+    lifespan=lifespan,
 )
 
 app.state.limiter = limiter
@@ -68,38 +149,226 @@ if os.path.exists(client_assets_dir):
 
 
 # ---------------------------------------------------------------------------
-# Load Modern Transformer Model
+# Load the serving model
 # ---------------------------------------------------------------------------
-try:
-    from transformers import pipeline
-    logger.info("Loading DistilBERT sentiment analysis pipeline... this may take a moment on boot.")
-    
+# Inference backends, the model registry and preprocessing live in scripts/
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "scripts"))
+# Never download WordNet on the request path; provision it with
+# `python scripts/preprocess.py --download` (read when preprocess is imported)
+os.environ.setdefault("NLTK_OFFLINE", "true")
+MODELS_DIR = os.environ.get("MODELS_DIR", os.path.join(SCRIPT_DIR, "models"))
+
+# Needed before the model loads (RSS baseline, malloc arenas); stdlib only
+from memory_profile import (  # noqa: E402
+    BurstTrimmer, cap_torch_threads, limit_malloc_arenas, malloc_trim, rss_mb,
+    transformer_low_memory_kwargs,
+)
+
+rss_before_load = rss_mb()
+if MALLOC_ARENA_MAX > 0:
+    limit_malloc_arenas(MALLOC_ARENA_MAX)
+
+
+def load_transformer():
+    """DistilBERT on CPU with the configured threads and memory profile."""
+    if TORCH_NUM_THREADS > 0 or TORCH_INTEROP_THREADS > 0:
+        threads = cap_torch_threads(TORCH_NUM_THREADS, TORCH_INTEROP_THREADS)
+        logger.info(
+            "torch threads | intra_op=%d | inter_op=%d", threads["intra_op"], threads["inter_op"]
+        )
     # device=-1 forces CPU inference to prevent OOM errors on free-tier containers
-    sentiment_model = pipeline(
-        "sentiment-analysis", 
-        model="distilbert/distilbert-base-uncased-finetuned-sst-2-english",
-        device=-1 
+    return TransformerBackend(
+        device=-1,
+        max_batch_size=INFERENCE_BATCH_SIZE,
+        pipeline_kwargs=transformer_low_memory_kwargs() if LOW_MEMORY else None,
     )
-    logger.info("DistilBERT model loaded successfully into RAM.")
+
+
+try:
+    from aspects import analyse_aspects, tag_aspects
+    from inference import TransformerBackend
+    from live_analysis import LiveAnalysisSession
+    from request_profiling import PROFILE_FORMATS, profile_call
+    from rolling_analytics import DEFAULT_WINDOWS, RollingAnalytics, SharedAnalytics, parse_window
+    from single_flight import SingleFlight
+    from model_registry import HotSwapModel, ModelRegistry, StaticModel
+
+    if MODEL_BACKEND in REGISTRY_BACKENDS:
+        logger.info("Loading model artefact from %s", MODELS_DIR)
+        model_registry = ModelRegistry(MODELS_DIR, model_types=REGISTRY_BACKENDS[MODEL_BACKEND])
+        if not model_registry.versions():
+            how_to = {
+                "mnb": "train one (scripts/hyperparameter_tuning.py), export the online model "
+                       f"(python scripts/online_training.py ... --export-to {MODELS_DIR}) or "
+                       "convert the legacy pickles: python scripts/compiled_scorer.py "
+                       "models/cv-transform.pkl models/restaurant-sentiment-mnb-model.pkl "
+                       f"--models-dir {MODELS_DIR}",
+                "fasttext": "train one: python scripts/fasttext_model.py "
+                            f"--models-dir {MODELS_DIR}",
+            }[MODEL_BACKEND]
+            wanted = "/".join(model_registry.model_types)
+            logger.error("No %s artefacts in %s; %s", wanted, MODELS_DIR, how_to)
+            raise SystemExit(
+                f"FATAL: No {wanted} artefacts in {MODELS_DIR} (see models/README.md)."
+            )
+        serving_model = HotSwapModel(model_registry)
+        serving_model.load()
+        if MODEL_WATCH_INTERVAL > 0:
+            serving_model.start_watcher(MODEL_WATCH_INTERVAL)
+        logger.info("Model version %s loaded.", serving_model.version)
+    else:
+        logger.info(
+            "Loading DistilBERT sentiment analysis pipeline... this may take a moment on boot."
+        )
+        serving_model = StaticModel(load_transformer())
+        logger.info("DistilBERT model loaded successfully into RAM.")
 except ImportError as exc:
-    logger.error("Transformers library not installed: %s", exc)
+    logger.error("Inference dependencies not installed: %s", exc)
     raise SystemExit(
         "FATAL: Missing dependencies. Run `pip install -r requirements.txt`"
     ) from exc
 except Exception as exc:
     logger.error("Failed to load model: %s", exc)
     raise SystemExit(
-        "FATAL: Could not initialise the transformer pipeline."
+        "FATAL: Could not initialise the sentiment model."
     ) from exc
 
+
+# ---------------------------------------------------------------------------
+# Shadow model (optional; never blocks or fails the serving model)
+# ---------------------------------------------------------------------------
+shadow_scorer = None
+if SHADOW_MODEL:
+    try:
+        from inference import backend_from_artefact
+        from shadow_scoring import ShadowScorer
+
+        if SHADOW_MODEL == "distilbert":
+            shadow_backend = load_transformer()
+        else:
+            shadow_path = SHADOW_MODEL
+            if not os.path.isdir(shadow_path):
+                shadow_path = os.path.join(MODELS_DIR, SHADOW_MODEL)
+            shadow_backend = backend_from_artefact(shadow_path)
+        shadow_scorer = ShadowScorer(
+            shadow_backend,
+            sample_rate=SHADOW_SAMPLE_RATE,
+            buffer_size=SHADOW_BUFFER_SIZE,
+        )
+        shadow_scorer.start()
+        logger.info("Shadow model %s scoring %.0f%% of predictions.",
+                    shadow_backend.name, SHADOW_SAMPLE_RATE * 100)
+    except Exception:
+        logger.exception("Could not load shadow model %s; shadow scoring disabled.", SHADOW_MODEL)
+        shadow_scorer = None
+
+# ---------------------------------------------------------------------------
+# Prediction store (optional; batched background writes to SQLite)
+# ---------------------------------------------------------------------------
+prediction_store = None
+if PREDICTION_DB:
+    from prediction_store import PredictionStore
+
+    prediction_store = PredictionStore(
+        PREDICTION_DB,
+        batch_size=PREDICTION_BATCH_SIZE,
+        flush_interval=PREDICTION_FLUSH_INTERVAL,
+        queue_size=PREDICTION_QUEUE_SIZE,
+        policy=PREDICTION_QUEUE_POLICY,
+        block_timeout=PREDICTION_BLOCK_TIMEOUT,
+    )
+    prediction_store.start()
+    logger.info("Storing predictions in %s (%s policy).", PREDICTION_DB, PREDICTION_QUEUE_POLICY)
+
+# ---------------------------------------------------------------------------
+# Rolling analytics (O(1) per prediction; other workers' files re-read on change)
+# ---------------------------------------------------------------------------
+rolling_analytics = RollingAnalytics()
+analytics_view = rolling_analytics
+analytics_path = None
+analytics_stop = threading.Event()
+analytics_publisher = None
+if ANALYTICS_DIR:
+    os.makedirs(ANALYTICS_DIR, exist_ok=True)
+    analytics_path = os.path.join(ANALYTICS_DIR, f"worker-{os.getpid()}.npz")
+    analytics_view = SharedAnalytics(
+        ANALYTICS_DIR, rolling_analytics, analytics_path, refresh_seconds=ANALYTICS_SYNC_INTERVAL
+    )
+
+    def _publish_analytics() -> None:
+        while not analytics_stop.wait(ANALYTICS_SYNC_INTERVAL):
+            try:
+                rolling_analytics.save(analytics_path)
+            except OSError:
+                logger.exception("Could not publish rolling analytics to %s", analytics_path)
+
+    analytics_publisher = threading.Thread(
+        target=_publish_analytics, name="analytics-sync", daemon=True
+    )
+    analytics_publisher.start()
+
+
+def stop_analytics_publisher() -> None:
+    """Stop publishing and withdraw this worker's file from the directory."""
+    analytics_stop.set()
+    if analytics_publisher is not None:
+        analytics_publisher.join(timeout=5)
+    if analytics_path is not None:
+        try:
+            os.remove(analytics_path)
+        except FileNotFoundError:
+            pass
+
+
+# Concurrent requests for the same model + text share one inference
+inference_flights = SingleFlight()
+
+# ---------------------------------------------------------------------------
+# Memory: trim what loading freed, then after each burst (low profile)
+# ---------------------------------------------------------------------------
+malloc_trim()
+startup_memory = {"rss_before_load_mb": rss_before_load, "rss_after_load_mb": rss_mb()}
+logger.info("Memory profile %s | RSS before model load %.1f MiB | after %.1f MiB",
+            MEMORY_PROFILE, startup_memory["rss_before_load_mb"],
+            startup_memory["rss_after_load_mb"])
+memory_trimmer = None
+if LOW_MEMORY:
+    memory_trimmer = BurstTrimmer(idle_seconds=MALLOC_TRIM_IDLE_SECONDS)
+    memory_trimmer.start()
+
 # ---------------------------------------------------------------------------
 # Request / response models
 # ---------------------------------------------------------------------------
 MAX_REVIEW_LENGTH = 5000
+MAX_TRAINING_BATCH = 1000
+
+
+class ActivateModelRequest(BaseModel):
+    version: str
+
+
+class TrainingBatchRequest(BaseModel):
+    reviews: List[str]
+    # 1 = positive, 0 = negative, one per review
+    labels: List[int]
+
+    @model_validator(mode="after")
+    def check_batch(self) -> "TrainingBatchRequest":
+        if not self.reviews:
+            raise ValueError("The batch must contain at least one review.")
+        if len(self.reviews) > MAX_TRAINING_BATCH:
+            raise ValueError(f"A batch must not exceed {MAX_TRAINING_BATCH} reviews.")
+        if len(self.labels) != len(self.reviews):
+            raise ValueError("Provide exactly one label per review.")
+        if any(label not in (0, 1) for label in self.labels):
+            raise ValueError("Labels must be 0 (negative) or 1 (positive).")
+        return self
 
 
 class ReviewRequest(BaseModel):
     message: str
+    # Also return per-aspect sentiment (scored in the same batched call)
+    aspects: bool = False
 
     @field_validator("message")
     @classmethod
@@ -190,10 +459,54 @@ async def read_index():
 
 
 
+async def submit_shadow(message: str, prediction: int, score: float) -> None:
+    # async so Starlette calls it on the event loop, not the threadpool
+    shadow_scorer.submit(message, prediction, score)
+
+
+def run_inference(backend, message: str, aspects: bool):
+    """(prediction, confidence 0-1, aspect breakdown or None) for one review."""
+    if aspects:
+        breakdown = analyse_aspects(backend, message)
+        return breakdown["prediction"], breakdown["confidence"], breakdown
+    prediction, score = backend.predict([message])[0]
+    return prediction, score, None
+
+
+def flight_key(message: str, aspects: bool) -> str:
+    """Whitespace-normalised text for single-flight keys (never scored).
+
+    Line breaks split aspect sentences, so they are kept when aspects are
+    requested; otherwise any whitespace run is equivalent.
+    """
+    if aspects:
+        return "\n".join(" ".join(line.split()) for line in message.splitlines() if line.strip())
+    return " ".join(message.split())
+
+
+async def store_prediction(record: dict) -> None:
+    if prediction_store.blocking:
+        # A full queue may wait; keep that off the event loop
+        await run_in_threadpool(prediction_store.submit, record)
+    else:
+        prediction_store.submit(record)
+
+
 @app.post("/api/predict")
 @limiter.limit(RATE_LIMIT)
-async def predict_api(request: Request, body: ReviewRequest):
+async def predict_api(request: Request, response: Response, body: ReviewRequest,
+                      background_tasks: BackgroundTasks):
     """JSON API endpoint consumed by the React frontend."""
+    # "pstats" or "collapsed": profile this request (one header lookup when off)
+    profile_format = request.headers.get("X-Profile")
+    if profile_format:
+        if not DEBUG_MODE:
+            require_admin(request)
+        if profile_format not in PROFILE_FORMATS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"X-Profile must be one of {sorted(PROFILE_FORMATS)}.",
+            )
     try:
         message = body.message
         logger.info("Prediction request | length=%d | preview='%s'",
@@ -208,20 +521,65 @@ async def predict_api(request: Request, body: ReviewRequest):
                 detail="Input appears to be non-English. This model only supports English reviews.",
             )
 
-        # Modern Inference
-        result = sentiment_model(message[:512])[0]  # truncate to DistilBERT max context
-        prediction = 1 if result["label"] == "POSITIVE" else 0
-        confidence = round(result["score"] * 100, 2)
+        if memory_trimmer is not None:
+            memory_trimmer.note_activity()
+
+        # Read the backend once: a hot-swap mid-request must not change
+        # the model this request is scored with.
+        backend = serving_model.current
+        # Identical reviews in flight together on the same backend are
+        # scored once; the forward pass runs off the event loop.
+        started = time.perf_counter()
+        if profile_format:
+            # Scored on its own, so the profile is this request's work only
+            (prediction, score, breakdown), profile_path = await run_in_threadpool(
+                profile_call, profile_format, PROFILE_DIR,
+                run_inference, backend, message, body.aspects,
+            )
+            response.headers["X-Profile-File"] = os.path.basename(profile_path)
+            logger.info("Request profile saved to %s", profile_path)
+        else:
+            prediction, score, breakdown = await inference_flights.do(
+                (id(backend), body.aspects, flight_key(message, body.aspects)),
+                run_inference, backend, message, body.aspects,
+            )
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        confidence = round(score * 100, 2)
         custom_msg = get_witty_response(prediction, message)
 
         logger.info("Prediction result | sentiment=%s | confidence=%.2f%%",
                     "positive" if prediction == 1 else "negative", confidence)
 
-        return {
+        if breakdown is not None:
+            negative_aspects = [a for a, v in breakdown["aspects"].items() if v["prediction"] == 0]
+        else:
+            negative_aspects = tag_aspects(message) if prediction == 0 else []
+        rolling_analytics.record(prediction, score, negative_aspects)
+
+        if shadow_scorer is not None:
+            # Runs after the response is sent; submit() only enqueues
+            background_tasks.add_task(submit_shadow, message, prediction, score)
+        if prediction_store is not None:
+            background_tasks.add_task(store_prediction, {
+                "created_at": time.time(),
+                "model": backend.name,
+                "prediction": prediction,
+                "confidence": score,
+                "latency_ms": latency_ms,
+                "text_length": len(message),
+                "text": message,
+                "aspects": breakdown["aspects"] if breakdown is not None else None,
+            })
+
+        result = {
             "prediction": prediction,
             "confidence": confidence,
             "custom_msg": custom_msg,
         }
+        if breakdown is not None:
+            result["aspects"] = breakdown["aspects"]
+            result["sentences"] = breakdown["sentences"]
+        return result
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
     except Exception as exc:
@@ -232,12 +590,272 @@ async def predict_api(request: Request, body: ReviewRequest):
         ) from exc
 
 
+# ---------------------------------------------------------------------------
+# Live analysis while typing (WebSocket)
+# ---------------------------------------------------------------------------
+def score_live(message: str) -> dict:
+    """Score a draft; same input rules as /api/predict, errors as data."""
+    message = message.strip()
+    if not message:
+        return {"error": "Review text must not be empty."}
+    if len(message) > MAX_REVIEW_LENGTH:
+        return {"error": f"Review text must not exceed {MAX_REVIEW_LENGTH} characters."}
+    ascii_ratio = sum(1 for c in message if ord(c) < 128) / len(message)
+    if ascii_ratio < 0.5:
+        return {
+            "error": "Input appears to be non-English. This model only supports English reviews."
+        }
+    if memory_trimmer is not None:
+        memory_trimmer.note_activity()
+    # Drafts are not recorded in analytics, the store or the shadow model
+    prediction, score = serving_model.current.predict([message])[0]
+    return {
+        "prediction": prediction,
+        "confidence": round(score * 100, 2),
+        "custom_msg": get_witty_response(prediction, message),
+    }
+
+
+def live_origin_allowed(websocket: WebSocket) -> bool:
+    """CORS does not apply to WebSockets, so browsers' Origins are checked here.
+
+    Same-origin pages and ALLOWED_ORIGINS may connect (any origin in DEBUG
+    mode). Clients that send no Origin are not browsers; they are held to
+    the per-IP budget like everyone else.
+    """
+    origin = websocket.headers.get("origin")
+    if origin is None or DEBUG_MODE or origin in ALLOWED_ORIGINS:
+        return True
+    return urlsplit(origin).netloc == websocket.headers.get("host")
+
+
+def live_budget(client: str) -> float:
+    """Seconds until ``client`` may run another live inference (0 = now, spent)."""
+    if live_limiter.hit(live_rate_limit, "live", client):
+        return 0.0
+    reset_at = live_limiter.get_window_stats(live_rate_limit, "live", client).reset_time
+    return max(reset_at - time.time(), 0.1)
+
+
+@app.websocket("/api/ws/predict")
+async def predict_live(websocket: WebSocket):
+    """Accepts ``{"revision": n, "message": "..."}`` updates as the user types.
+
+    Updates are debounced per connection; revisions superseded before
+    they are scored are never scored, and results for anything but the
+    latest revision are discarded. Replies carry the revision they answer.
+    Inferences count against a per-IP budget (LIVE_RATE_LIMIT); once it
+    is spent, the latest revision waits until the budget allows it.
+    """
+    if not live_origin_allowed(websocket):
+        logger.warning("Live analysis rejected | origin=%s", websocket.headers.get("origin"))
+        await websocket.close(code=1008)  # policy violation; 403 on the handshake
+        return
+    await websocket.accept()
+    client = get_remote_address(websocket)
+    session = LiveAnalysisSession(
+        score_live,
+        websocket.send_json,
+        debounce=LIVE_DEBOUNCE_MS / 1000.0,
+        max_delay=LIVE_MAX_DELAY_MS / 1000.0,
+        throttle=lambda: live_budget(client),
+    )
+    worker = asyncio.create_task(session.run())
+    revision = 0
+    try:
+        while True:
+            try:
+                update = json.loads(await websocket.receive_text())
+                message = update["message"]
+                if not isinstance(message, str):
+                    raise TypeError("message must be a string")
+                revision = int(update.get("revision", revision + 1))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                await websocket.send_json(
+                    {"error": 'Expected {"revision": <int>, "message": <text>}.'}
+                )
+                continue
+            session.update(revision, message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        worker.cancel()
+        logger.debug("Live analysis session closed | %s", session.stats)
+
+
+# ---------------------------------------------------------------------------
+# Admin: model registry & hot-swap
+# ---------------------------------------------------------------------------
+def require_admin(request: Request) -> None:
+    """Reject the request unless it carries the configured admin token."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled.")
+    token = request.headers.get("X-Admin-Token", "")
+    if not secrets.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
+def require_hot_swap() -> HotSwapModel:
+    if not isinstance(serving_model, HotSwapModel):
+        raise HTTPException(
+            status_code=409,
+            detail="Hot-swap is only available with MODEL_BACKEND=mnb or fasttext.",
+        )
+    return serving_model
+
+
+@app.get("/admin/models")
+async def list_models(request: Request):
+    require_admin(request)
+    model = require_hot_swap()
+    return {
+        "active": model.version,
+        "previous": model.previous_version,
+        "versions": model.registry.describe(),
+    }
+
+
+@app.post("/admin/models/activate")
+async def activate_model(request: Request, body: ActivateModelRequest):
+    """Load + warm a version off the event loop, then switch atomically."""
+    require_admin(request)
+    model = require_hot_swap()
+    try:
+        version = await run_in_threadpool(model.activate, body.version)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Activation of model %s failed", body.version)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Could not activate {body.version}; still serving {model.version}.",
+        ) from exc
+    return {"active": version, "previous": model.previous_version}
+
+
+@app.post("/admin/models/rollback")
+async def rollback_model(request: Request):
+    require_admin(request)
+    model = require_hot_swap()
+    try:
+        version = await run_in_threadpool(model.rollback)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return {"active": version, "previous": model.previous_version}
+
+
+@app.get("/admin/shadow")
+async def shadow_summary(request: Request):
+    """Agreement, confidence deltas and latency of the shadow model."""
+    require_admin(request)
+    if shadow_scorer is None:
+        raise HTTPException(
+            status_code=409, detail="Shadow scoring is not enabled (set SHADOW_MODEL)."
+        )
+    return {"primary": serving_model.version, **shadow_scorer.summary()}
+
+
+@app.get("/admin/profiles/{name}")
+async def download_profile(request: Request, name: str):
+    """Fetch a file named in a profiled response's X-Profile-File header."""
+    if not DEBUG_MODE:
+        require_admin(request)
+    path = os.path.join(PROFILE_DIR, os.path.basename(name))
+    if not name.endswith(tuple(PROFILE_FORMATS.values())) or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail=f"No profile named {name}.")
+    return FileResponse(
+        path, media_type="application/octet-stream", filename=os.path.basename(name)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Admin: online training
+# ---------------------------------------------------------------------------
+def require_online_training():
+    if not ONLINE_CHECKPOINT:
+        raise HTTPException(
+            status_code=409, detail="Online training is not enabled (set ONLINE_CHECKPOINT)."
+        )
+    try:
+        import online_training  # scikit-learn is only needed by this feature
+    except ImportError as exc:
+        raise HTTPException(
+            status_code=501, detail=f"Online training is unavailable: {exc}."
+        ) from exc
+    return online_training
+
+
+@app.post("/admin/training")
+async def ingest_training_batch(request: Request, body: TrainingBatchRequest):
+    """Fold labelled reviews into the shared online-training checkpoint."""
+    require_admin(request)
+    online_training = require_online_training()
+    counts = await run_in_threadpool(
+        online_training.train_batch, body.reviews, body.labels, ONLINE_CHECKPOINT
+    )
+    return {"accepted": len(body.reviews), **counts}
+
+
+@app.post("/admin/training/export")
+async def export_online_model(request: Request):
+    """Publish the online model as a new artefact version in MODELS_DIR.
+
+    Activate it like any other version (POST /admin/models/activate).
+    """
+    require_admin(request)
+    online_training = require_online_training()
+    try:
+        path = await run_in_threadpool(
+            online_training.export_artefact, MODELS_DIR, ONLINE_CHECKPOINT
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return {"version": os.path.basename(path)}
+
+
+# ---------------------------------------------------------------------------
+# Analytics
+# ---------------------------------------------------------------------------
+def _analytics_snapshot(windows):
+    return {
+        "workers": getattr(analytics_view, "workers", 1),
+        "windows": {name: analytics_view.summary(seconds) for name, seconds in windows.items()},
+    }
+
+
+@app.get("/api/analytics")
+async def analytics(window: str = ""):
+    """Positive share, mean confidence and top negative aspects per window."""
+    names = [w.strip() for w in window.split(",") if w.strip()] or list(DEFAULT_WINDOWS)
+    try:
+        windows = {name: parse_window(name) for name in names}
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    too_long = [n for n, sec in windows.items() if sec > rolling_analytics.horizon_seconds]
+    if too_long:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Windows longer than {rolling_analytics.horizon_seconds}s are not kept: "
+                f"{too_long}"
+            ),
+        )
+    return await run_in_threadpool(_analytics_snapshot, windows)
+
+
 # ---------------------------------------------------------------------------
 # Health check
 # ---------------------------------------------------------------------------
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "debug": DEBUG_MODE}
+    status = {"status": "healthy", "debug": DEBUG_MODE, "model": serving_model.version}
+    if prediction_store is not None:
+        status["prediction_store"] = prediction_store.stats()
+    status["single_flight"] = inference_flights.summary()
+    status["memory"] = {"profile": MEMORY_PROFILE, "rss_mb": rss_mb(), **startup_memory}
+    if memory_trimmer is not None:
+        status["memory"]["malloc_trim"] = memory_trimmer.stats
+    return status
 
 @app.get("/api/health")
 async def health_check():
@@ -272,4 +890,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=port,
         reload=DEBUG_MODE,
+        # Same variable the uvicorn CLI reads; ignored with reload
+        workers=int(os.environ.get("WEB_CONCURRENCY", "1")),
     )
\ No newline at end of file
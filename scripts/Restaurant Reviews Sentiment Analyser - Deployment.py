@@ -7,6 +7,7 @@ Improvements over the original:
   - Lemmatisation (WordNetLemmatizer) instead of stemming
   - TF-IDF vectorisation instead of raw Bag-of-Words
   - Automated vocabulary size analysis to choose optimal max_features
+    (count once, slice the sparse matrix per candidate -- no refits)
   - Full evaluation metrics (Classification Report, Confusion Matrix,
     Accuracy, F1-Score, ROC-AUC)
   - Cross-platform path handling via os.path.join
@@ -14,34 +15,29 @@ Improvements over the original:
 
 # -- Imports -------------------------------------------------------------------
 import os
-import re
-import pickle
 
 import numpy as np
 import pandas as pd
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.model_selection import train_test_split
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.metrics import (
-    classification_report,
-    confusion_matrix,
-    accuracy_score,
-    f1_score,
-    roc_auc_score,
+from sklearn.metrics import classification_report, f1_score
+
+from compiled_scorer import CompiledScorer
+from corpus_cache import load_corpus
+from evaluation import compute_metrics
+from model_artefact import MODELS_DIR, save_artefact
+from preprocess import applied_clean_kwargs
+from sparse_features import (
+    build_vectorizer,
+    count_corpus,
+    term_frequency_order,
+    tfidf_from_counts,
+    top_k_columns,
 )
 
-# -- NLTK data -----------------------------------------------------------------
-nltk.download("stopwords", quiet=True)
-nltk.download("wordnet", quiet=True)
-
 # -- Paths ---------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATASET_PATH = os.path.join(SCRIPT_DIR, "Restaurant_Reviews.tsv")
-MODEL_PATH = os.path.join(SCRIPT_DIR, "restaurant-sentiment-mnb-model.pkl")
-VECTORIZER_PATH = os.path.join(SCRIPT_DIR, "cv-transform.pkl")
 
 # ── 1. Load dataset ─────────────────────────────────────────────────────────
 print("=" * 70)
@@ -53,16 +49,12 @@ print(f"\n[DATA] Dataset loaded: {len(df)} reviews")
 print(f"       Positive: {(df['Liked'] == 1).sum()} | Negative: {(df['Liked'] == 0).sum()}")
 
 # ── 2. Text preprocessing ───────────────────────────────────────────────────
-lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words("english"))
-
-corpus = []
-for review_text in df["Review"]:
-    # Remove special characters, lowercase, tokenise
-    cleaned = re.sub(r"[^a-zA-Z]", " ", str(review_text)).lower().split()
-    # Remove stop-words & lemmatise
-    cleaned = [lemmatizer.lemmatize(w) for w in cleaned if w not in stop_words]
-    corpus.append(" ".join(cleaned))
+# Remove special characters, lowercase, tokenise, drop stop-words, lemmatise.
+# The cleaned corpus is cached on disk and reused until the dataset or these
+# options change.
+corpus, y = load_corpus(
+    DATASET_PATH, expand_contraction=False, min_word_length=1
+)
 
 print(f"[OK] Preprocessing complete ({len(corpus)} reviews cleaned)")
 
@@ -71,20 +63,24 @@ print("\n" + "-" * 70)
 print("VOCABULARY SIZE ANALYSIS")
 print("-" * 70)
 
-y = df["Liked"].values
 candidates = [500, 1000, 1500, 2000, 2500, 3000, None]
 best_score = 0
 best_features = None
 
+# Tokenise and count once; every candidate is a column slice of the same
+# sparse count matrix, re-weighted with TF-IDF. Nothing is densified.
+counter, counts = count_corpus(corpus)
+tf_order = term_frequency_order(counts)
+train_idx, test_idx = train_test_split(
+    np.arange(len(y)), test_size=0.20, random_state=0
+)
+
 for n in candidates:
-    vec = TfidfVectorizer(max_features=n)
-    X_temp = vec.fit_transform(corpus).toarray()
-    X_tr, X_te, y_tr, y_te = train_test_split(
-        X_temp, y, test_size=0.20, random_state=0
-    )
+    cols = top_k_columns(counts, n, tf_order)
+    X_temp, _ = tfidf_from_counts(counts[:, cols])
     clf = MultinomialNB(alpha=0.2)
-    clf.fit(X_tr, y_tr)
-    score = f1_score(y_te, clf.predict(X_te), average="weighted")
+    clf.fit(X_temp[train_idx], y[train_idx])
+    score = f1_score(y[test_idx], clf.predict(X_temp[test_idx]), average="weighted")
     label = str(n) if n else "ALL"
     print(f"   max_features={label:>5s}  ->  F1-Score (weighted): {score:.4f}")
     if score > best_score:
@@ -99,16 +95,16 @@ print("\n" + "-" * 70)
 print("TRAINING FINAL MODEL")
 print("-" * 70)
 
-tfidf = TfidfVectorizer(max_features=best_features)
-X = tfidf.fit_transform(corpus).toarray()
+best_cols = top_k_columns(counts, best_features, tf_order)
+X, idf = tfidf_from_counts(counts[:, best_cols])
+tfidf = build_vectorizer(counter.get_feature_names_out()[best_cols], idf)
 
 actual_vocab_size = len(tfidf.vocabulary_)
 print(f"   Vocabulary size: {actual_vocab_size}")
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.20, random_state=0
-)
-print(f"   Training set: {len(X_train)} | Test set: {len(X_test)}")
+X_train, X_test = X[train_idx], X[test_idx]
+y_train, y_test = y[train_idx], y[test_idx]
+print(f"   Training set: {X_train.shape[0]} | Test set: {X_test.shape[0]}")
 
 classifier = MultinomialNB(alpha=0.2)
 classifier.fit(X_train, y_train)
@@ -125,14 +121,17 @@ y_proba = classifier.predict_proba(X_test)[:, 1]
 print("\nClassification Report:")
 print(classification_report(y_test, y_pred, target_names=["Negative", "Positive"]))
 
+# Every metric from the one set of cached predictions
+metrics = compute_metrics(y_test, y_pred, y_proba)
+
 print("Confusion Matrix:")
-cm = confusion_matrix(y_test, y_pred)
+cm = metrics["confusion_matrix"]
 print(f"   TN={cm[0][0]:>4d}  FP={cm[0][1]:>4d}")
 print(f"   FN={cm[1][0]:>4d}  TP={cm[1][1]:>4d}")
 
-acc = accuracy_score(y_test, y_pred)
-f1 = f1_score(y_test, y_pred, average="weighted")
-roc = roc_auc_score(y_test, y_proba)
+acc = metrics["accuracy"]
+f1 = metrics["f1_weighted"]
+roc = metrics["roc_auc"]
 
 print(f"\n   Accuracy : {acc:.4f}")
 print(f"   F1-Score : {f1:.4f}")
@@ -143,13 +142,26 @@ print("\n" + "-" * 70)
 print("SAVING ARTEFACTS")
 print("-" * 70)
 
-with open(VECTORIZER_PATH, "wb") as f:
-    pickle.dump(tfidf, f)
-print(f"   [OK] Vectoriser saved -> {VECTORIZER_PATH}")
-
-with open(MODEL_PATH, "wb") as f:
-    pickle.dump(classifier, f)
-print(f"   [OK] Model saved      -> {MODEL_PATH}")
+scorer = CompiledScorer.from_sklearn(tfidf, classifier)
+artefact_path = save_artefact(
+    MODELS_DIR,
+    scorer,
+    metadata={
+        "source": "training_script",
+        # clean_text options the serving backend must reproduce
+        "preprocess": applied_clean_kwargs(
+            {"expand_contraction": False, "min_word_length": 1}
+        ),
+        "max_features": best_features,
+        "alpha": classifier.alpha,
+        "accuracy": round(acc, 4),
+        "f1_weighted": round(f1, 4),
+        "roc_auc": round(roc, 4),
+        "n_train": int(X_train.shape[0]),
+        "n_test": int(X_test.shape[0]),
+    },
+)
+print(f"   [OK] Model artefact saved -> {artefact_path}")
 
 print("\n" + "=" * 70)
 print("PIPELINE COMPLETE")
@@ -0,0 +1,122 @@
+"""
+aspects.py - Aspect-Level Sentiment from One Batched Call
+==========================================================
+Breaks a review down by what it talks about:
+
+    1. split the review into sentences (``.``, ``!``, ``?``, ``;`` and
+       line breaks)
+    2. tag each sentence with the aspects its keywords mention -- wait
+       time, taste, price, staff, atmosphere -- or ``general``
+    3. score the whole review *and* every sentence in a single
+       ``backend.predict`` call, so a ten-sentence review costs one
+       batched forward pass rather than eleven
+    4. aggregate per aspect: the mean positive-class probability of its
+       sentences gives the aspect's label and confidence
+
+Works with any backend of inference.py.
+
+Usage:
+    from aspects import analyse_aspects
+
+    result = analyse_aspects(backend, "Food was great. We waited an hour.")
+    result["aspects"]["wait_time"]["sentiment"]   # "negative"
+"""
+
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+GENERAL = "general"
+
+# Keyword stems per aspect (regex fragments matched at word starts, so
+# "wait" also matches "waited"; the lookahead keeps "waiter" out of it)
+ASPECT_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "wait_time": (
+        r"wait(?!er|ress|staff)", "slow", "hour", "minute", "forever", r"took\s+long",
+        "quick", "fast", "prompt",
+    ),
+    "taste": (
+        "tast", "flavo", "delicious", "yumm", "bland", "salty", "sweet", "cold", "fresh",
+        "overcooked", "undercooked", "seasoned", "food", "dish", "meal",
+    ),
+    "price": (
+        "pric", "money", "expensive", "cheap", "cost", "value", "overpriced", "worth", "bill",
+    ),
+    "staff": (
+        "staff", "service", "waiter", "waitress", "server", "manager", "host", "rude",
+        "friendly", "attentive",
+    ),
+    "atmosphere": (
+        "atmosphere", "ambiance", "ambience", "vibe", "decor", "music", "noisy", "loud",
+        "clean", "dirty", "cozy", "place", "interior",
+    ),
+}
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;])\s+|[\r\n]+")
+_ASPECT_RES = {
+    aspect: re.compile(r"\b(?:" + "|".join(keywords) + ")", re.IGNORECASE)
+    for aspect, keywords in ASPECT_KEYWORDS.items()
+}
+
+
+def split_sentences(text: str) -> List[str]:
+    """Non-empty sentences of ``text`` (the whole text if it has no breaks)."""
+    sentences = [s.strip() for s in _SENTENCE_SPLIT_RE.split(text)]
+    return [s for s in sentences if re.search(r"\w", s)] or [text.strip()]
+
+
+def tag_aspects(sentence: str) -> List[str]:
+    """Aspects mentioned in ``sentence`` (``["general"]`` if none)."""
+    found = [aspect for aspect, pattern in _ASPECT_RES.items() if pattern.search(sentence)]
+    return found or [GENERAL]
+
+
+def _positive_probability(label: int, confidence: float) -> float:
+    return confidence if label == 1 else 1.0 - confidence
+
+
+def _verdict(p_positive: float) -> Dict[str, Any]:
+    label = 1 if p_positive > 0.5 else 0
+    return {
+        "sentiment": "positive" if label else "negative",
+        "prediction": label,
+        "confidence": round(max(p_positive, 1.0 - p_positive) * 100, 2),
+    }
+
+
+def aggregate_aspects(
+    sentences: Sequence[str],
+    predictions: Sequence[Tuple[int, float]],
+) -> Dict[str, Any]:
+    """Per-sentence tags and per-aspect verdicts from sentence predictions."""
+    scored, by_aspect = [], {}
+    for sentence, (label, confidence) in zip(sentences, predictions):
+        aspects = tag_aspects(sentence)
+        p_positive = _positive_probability(int(label), float(confidence))
+        scored.append({"text": sentence, "aspects": aspects, **_verdict(p_positive)})
+        for aspect in aspects:
+            by_aspect.setdefault(aspect, []).append(p_positive)
+    return {
+        "aspects": {
+            aspect: {**_verdict(sum(ps) / len(ps)), "mentions": len(ps)}
+            for aspect, ps in by_aspect.items()
+        },
+        "sentences": scored,
+    }
+
+
+def analyse_aspects(backend: Any, text: str) -> Dict[str, Any]:
+    """Whole-review prediction plus the aspect breakdown, in one batch.
+
+    Returns:
+        Dict with ``prediction``/``confidence`` (raw backend output for the
+        whole review, confidence in 0-1), ``aspects`` and ``sentences``.
+    """
+    sentences = split_sentences(text)
+    # The review itself rides in the same batch as its sentences
+    predictions = backend.predict([text] + sentences)
+    prediction, confidence = predictions[0]
+    return {
+        "prediction": int(prediction),
+        "confidence": float(confidence),
+        **aggregate_aspects(sentences, predictions[1:]),
+    }
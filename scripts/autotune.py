@@ -0,0 +1,428 @@
+"""
+autotune.py - Worker / Torch Thread Autotuner
+==============================================
+Finds the uvicorn worker count and torch intra-/inter-op thread counts
+that give the best request throughput on *this* machine while keeping
+latency under a target, and prints them as the environment variables
+``main.py`` and uvicorn read:
+
+    WEB_CONCURRENCY         uvicorn worker processes
+    TORCH_NUM_THREADS       torch intra-op threads per worker
+    TORCH_INTEROP_THREADS   torch inter-op threads per worker
+
+For every (workers, intra-op, inter-op) combination the tuner starts that
+many worker processes, each loading the serving backend (the loaders of
+benchmark.py) with its thread caps. Once all have loaded and warmed up,
+they score reviews from ``data/Restaurant_Reviews.tsv`` simultaneously
+for ``--duration`` seconds per call shape, as busy uvicorn workers would.
+
+The serving recommendation is measured at the shapes ``/api/predict``
+actually sends: one review per call (``--serving-shapes 1``), or the
+review plus its sentences for aspect requests (e.g. ``--serving-shapes
+1 5``). Requests are never batched across callers, so larger batches say
+nothing about serving. A combination qualifies if its p99 call latency
+meets the target at every shape; the best has the most requests/s,
+averaged over the shapes.
+
+Batch size is reported separately, as a knob for offline scoring
+(``batch_scoring.py --batch-size/--processes/--torch-threads``): the
+``--offline-batch-sizes`` are measured on the same combinations, and the
+one with the most reviews/s is recommended, with no latency target.
+
+Combinations with more busy threads (workers x intra-op) than CPU cores
+are skipped unless ``--oversubscribe`` is given.
+
+Usage:
+    python autotune.py
+    python autotune.py --backend artefact:models/20260101_120000 \\
+        --workers 1 2 4 --intra-op 1 2 4 --serving-shapes 1 5 \\
+        --offline-batch-sizes 16 64 --latency-target-ms 100 --env-output tuned.env
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import itertools
+import threading
+import subprocess
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from benchmark import DATASET_PATH, PROJECT_ROOT, latency_summary, load_backend
+
+RESULTS_PATH = os.path.join(PROJECT_ROOT, "autotune-results.json")
+
+DEFAULT_BACKEND = "distilbert"
+DEFAULT_SERVING_SHAPES = (1,)  # texts per /api/predict call
+DEFAULT_OFFLINE_BATCH_SIZES = (8, 32, 64)
+DEFAULT_INTEROP = (1, 2)
+DEFAULT_DURATION = 5.0  # seconds measured per call shape / batch size
+DEFAULT_LATENCY_TARGET_MS = 200.0
+DEFAULT_TIMEOUT = 900  # seconds per combination
+WARMUP_CALLS = 3
+
+ENV_KEYS = {
+    "workers": "WEB_CONCURRENCY",
+    "intra_op": "TORCH_NUM_THREADS",
+    "inter_op": "TORCH_INTEROP_THREADS",
+}
+COMBO_KEYS = tuple(ENV_KEYS)
+
+
+def powers_of_two(limit: int) -> List[int]:
+    """1, 2, 4, ... up to ``limit``, always including ``limit`` itself."""
+    values = [1]
+    while values[-1] * 2 <= limit:
+        values.append(values[-1] * 2)
+    if values[-1] != limit:
+        values.append(limit)
+    return values
+
+
+def thread_grid(
+    workers: Iterable[int],
+    intra_op: Iterable[int],
+    inter_op: Iterable[int],
+    cores: int,
+    oversubscribe: bool = False,
+) -> List[Dict[str, int]]:
+    """(workers, intra-op, inter-op) combinations worth measuring."""
+    grid = []
+    for w, intra, inter in itertools.product(
+        sorted(set(workers)), sorted(set(intra_op)), sorted(set(inter_op))
+    ):
+        if not oversubscribe and w * intra > cores:
+            continue
+        grid.append({"workers": w, "intra_op": intra, "inter_op": inter})
+    return grid
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+
+
+def _read_reviews(dataset_path: str) -> List[str]:
+    import pandas as pd
+
+    df = pd.read_csv(dataset_path, delimiter="\t", quoting=3)
+    return df["Review"].dropna().astype(str).tolist()
+
+
+def run_worker(spec: str, dataset_path: str, intra_op: int, inter_op: int,
+               batch_sizes: Sequence[int], duration: float, offset: int) -> None:
+    """Load, report ready, then measure one batch size per ``go`` line on stdin."""
+    if spec == "distilbert":
+        from memory_profile import cap_torch_threads
+
+        cap_torch_threads(intra_op, inter_op)
+    backend = load_backend(spec)
+    texts = _read_reviews(dataset_path)
+    # Workers start at different reviews so they do not score in lockstep
+    texts = texts[offset % len(texts):] + texts[:offset % len(texts)]
+    for _ in range(WARMUP_CALLS):
+        backend.predict(texts[:max(batch_sizes)])
+    print("ready", flush=True)
+
+    for batch_size in batch_sizes:
+        if sys.stdin.readline().strip() != "go":
+            return
+        samples_ns, scored, i = [], 0, 0
+        started = time.perf_counter()
+        while time.perf_counter() - started < duration:
+            batch = [texts[(i + k) % len(texts)] for k in range(batch_size)]
+            i += batch_size
+            t0 = time.perf_counter_ns()
+            backend.predict(batch)
+            samples_ns.append(time.perf_counter_ns() - t0)
+            scored += batch_size
+        elapsed = time.perf_counter() - started
+        print(json.dumps({
+            "batch_size": batch_size,
+            "calls": len(samples_ns),
+            "scored": scored,
+            "elapsed_s": elapsed,
+            "batch_latency_ns": samples_ns,
+        }), flush=True)
+
+
+# ---------------------------------------------------------------------------
+# Orchestration (parent process)
+# ---------------------------------------------------------------------------
+
+
+def measure_combination(
+    spec: str,
+    combo: Dict[str, int],
+    batch_sizes: Sequence[int],
+    *,
+    dataset_path: str = DATASET_PATH,
+    duration: float = DEFAULT_DURATION,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> List[Dict[str, Any]]:
+    """One result per batch size for ``combo``; failures become ``skipped``."""
+    procs, logs = [], []
+    for n in range(combo["workers"]):
+        command = [
+            sys.executable, os.path.abspath(__file__),
+            "--worker", spec,
+            "--dataset", dataset_path,
+            "--intra-op", str(combo["intra_op"]),
+            "--inter-op", str(combo["inter_op"]),
+            "--batch-sizes", *map(str, batch_sizes),
+            "--duration", repr(duration),
+            "--offset", str(n * 97),
+        ]
+        # stderr goes to a file: model loading logs must not fill a pipe
+        logs.append(tempfile.TemporaryFile(mode="w+"))
+        procs.append(subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=logs[-1],
+            text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+        ))
+
+    def failed(reason: str) -> List[Dict[str, Any]]:
+        if watchdog.finished.is_set():
+            reason = f"timed out after {timeout:.0f}s"
+        return [{**combo, "batch_size": b, "skipped": reason} for b in batch_sizes]
+
+    def kill_all() -> None:
+        for proc in procs:
+            proc.kill()
+
+    # Killed workers close their pipes, which unblocks the reads below
+    watchdog = threading.Timer(timeout, kill_all)
+    watchdog.start()
+    try:
+        for proc, log in zip(procs, logs):
+            if proc.stdout.readline().strip() != "ready":
+                proc.wait()
+                log.seek(0)
+                lines = log.read().strip().splitlines()
+                return failed(lines[-1] if lines else f"exit code {proc.returncode}")
+        results = []
+        for batch_size in batch_sizes:
+            # All workers start together, like concurrent busy uvicorn workers
+            for proc in procs:
+                proc.stdin.write("go\n")
+                proc.stdin.flush()
+            reports = [json.loads(proc.stdout.readline()) for proc in procs]
+            samples = [ns for r in reports for ns in r["batch_latency_ns"]]
+            results.append({
+                **combo,
+                "batch_size": batch_size,
+                "throughput_per_s": sum(r["scored"] / r["elapsed_s"] for r in reports),
+                "calls_per_s": sum(r["calls"] / r["elapsed_s"] for r in reports),
+                "batch_latency_ms": latency_summary(samples),
+            })
+        return results
+    except (OSError, ValueError) as exc:
+        return failed(str(exc) or type(exc).__name__)
+    finally:
+        watchdog.cancel()
+        for proc, log in zip(procs, logs):
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            log.close()
+
+
+def _by_combo(
+    results: Sequence[Dict[str, Any]], sizes: Sequence[int]
+) -> Dict[tuple, List[Dict[str, Any]]]:
+    """Measured results at ``sizes``, grouped by (workers, intra-op, inter-op)."""
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for r in results:
+        if "skipped" not in r and r["batch_size"] in sizes:
+            groups.setdefault(tuple(r[key] for key in COMBO_KEYS), []).append(r)
+    return groups
+
+
+def recommend(
+    results: Sequence[Dict[str, Any]],
+    latency_target_ms: float,
+    serving_shapes: Sequence[int] = DEFAULT_SERVING_SHAPES,
+) -> Optional[Dict[str, Any]]:
+    """Serving combination: most requests/s with p99 under the target at
+    every shape, else the lowest worst-shape p99."""
+    candidates = []
+    for combo, rows in _by_combo(results, serving_shapes).items():
+        if len(rows) < len(set(serving_shapes)):
+            continue  # not measured at every shape
+        candidates.append({
+            **dict(zip(COMBO_KEYS, combo)),
+            "requests_per_s": sum(r["calls_per_s"] for r in rows) / len(rows),
+            "p99_ms": max(r["batch_latency_ms"]["p99"] for r in rows),
+        })
+    if not candidates:
+        return None
+    within = [c for c in candidates if c["p99_ms"] <= latency_target_ms]
+    if within:
+        # Ties go to fewer processes/threads (less memory)
+        return max(within, key=lambda c: (c["requests_per_s"], -c["workers"], -c["intra_op"]))
+    return min(candidates, key=lambda c: c["p99_ms"])
+
+
+def recommend_offline(
+    results: Sequence[Dict[str, Any]],
+    batch_sizes: Sequence[int] = DEFAULT_OFFLINE_BATCH_SIZES,
+) -> Optional[Dict[str, Any]]:
+    """Offline scoring: most reviews/s over combinations and batch sizes."""
+    rows = [r for group in _by_combo(results, batch_sizes).values() for r in group]
+    if not rows:
+        return None
+    best = max(rows, key=lambda r: (r["throughput_per_s"], -r["workers"], -r["intra_op"]))
+    return {
+        "processes": best["workers"],
+        "torch_threads": best["intra_op"],
+        "batch_size": best["batch_size"],
+        "reviews_per_s": best["throughput_per_s"],
+    }
+
+
+def env_lines(config: Dict[str, Any]) -> List[str]:
+    return [f"{env}={config[key]}" for key, env in ENV_KEYS.items()]
+
+
+def offline_args(config: Dict[str, Any]) -> str:
+    return (f"--processes {config['processes']} --torch-threads {config['torch_threads']} "
+            f"--batch-size {config['batch_size']}")
+
+
+def print_table(
+    results: List[Dict[str, Any]],
+    best: Optional[Dict[str, Any]],
+    offline: Optional[Dict[str, Any]],
+    latency_target_ms: float,
+) -> None:
+    print("\n" + "=" * 78)
+    print("THREAD / WORKER AUTOTUNE")
+    print("=" * 78)
+    header = (
+        f"  {'Workers':>7} {'Intra':>6} {'Inter':>6} {'Texts':>6} "
+        f"{'Calls/s':>9} {'Rev/s':>9} {'p99 ms':>9}"
+    )
+    print(header)
+    print("  " + "-" * (len(header) - 2))
+    for r in results:
+        prefix = f"  {r['workers']:>7} {r['intra_op']:>6} {r['inter_op']:>6} {r['batch_size']:>6}"
+        if "skipped" in r:
+            print(f"{prefix}  skipped: {r['skipped']}")
+            continue
+        print(f"{prefix} {r['calls_per_s']:>9.1f} {r['throughput_per_s']:>9.1f} "
+              f"{r['batch_latency_ms']['p99']:>9.2f}")
+    print("=" * 78)
+    if best is None:
+        print("\n  No serving configuration could be measured.")
+    else:
+        if best["p99_ms"] > latency_target_ms:
+            print(f"\n  No configuration met p99 <= {latency_target_ms:g} ms; lowest-latency one:")
+        else:
+            print(
+                f"\n  Serving: {best['requests_per_s']:.1f} requests/s "
+                f"with p99 <= {latency_target_ms:g} ms:"
+            )
+        for line in env_lines(best):
+            print(f"    export {line}")
+    if offline is not None:
+        print(f"\n  Offline scoring ({offline['reviews_per_s']:.1f} reviews/s):")
+        print(f"    python batch_scoring.py <input> <output> {offline_args(offline)}")
+
+
+def run_autotune(
+    spec: str,
+    grid: Sequence[Dict[str, int]],
+    serving_shapes: Sequence[int] = DEFAULT_SERVING_SHAPES,
+    offline_batch_sizes: Sequence[int] = (),
+    *,
+    dataset_path: str = DATASET_PATH,
+    duration: float = DEFAULT_DURATION,
+    latency_target_ms: float = DEFAULT_LATENCY_TARGET_MS,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Dict[str, Any]:
+    """Measure every combination and return the JSON-serialisable report."""
+    sizes = sorted(set(serving_shapes) | set(offline_batch_sizes))
+    results = []
+    for combo in grid:
+        print(f"  Measuring workers={combo['workers']} intra_op={combo['intra_op']} "
+              f"inter_op={combo['inter_op']} ...", flush=True)
+        results.extend(measure_combination(
+            spec, combo, sizes, dataset_path=dataset_path, duration=duration, timeout=timeout,
+        ))
+    best = recommend(results, latency_target_ms, serving_shapes)
+    offline = recommend_offline(results, offline_batch_sizes)
+    return {
+        "backend": spec,
+        "cpu_count": os.cpu_count(),
+        "duration_s": duration,
+        "latency_target_ms": latency_target_ms,
+        "serving_shapes": list(serving_shapes),
+        "offline_batch_sizes": list(offline_batch_sizes),
+        "results": results,
+        "recommended": best,
+        "env": best and env_lines(best),
+        "offline": offline,
+    }
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Tune uvicorn workers and torch threads.")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND,
+                        help="Backend spec as in benchmark.py (default: distilbert)")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--workers", type=int, nargs="+", default=powers_of_two(cores))
+    parser.add_argument("--intra-op", type=int, nargs="+", default=powers_of_two(cores))
+    parser.add_argument("--inter-op", type=int, nargs="+", default=list(DEFAULT_INTEROP))
+    parser.add_argument("--serving-shapes", type=int, nargs="+",
+                        default=list(DEFAULT_SERVING_SHAPES),
+                        help="Texts per /api/predict call: 1, or 1 + sentences with aspects")
+    parser.add_argument("--offline-batch-sizes", type=int, nargs="*",
+                        default=list(DEFAULT_OFFLINE_BATCH_SIZES),
+                        help="Batch sizes for batch_scoring.py (none to skip)")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="Seconds measured per shape / batch size")
+    parser.add_argument("--latency-target-ms", type=float, default=DEFAULT_LATENCY_TARGET_MS,
+                        help="p99 request latency the serving recommendation must stay under")
+    parser.add_argument("--oversubscribe", action="store_true",
+                        help="Also try workers x intra-op threads > CPU cores")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--output", default=RESULTS_PATH, help="JSON report path")
+    parser.add_argument("--env-output", help="Also write the recommendation as a .env file")
+    # Internal: one worker process of a combination
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", help=argparse.SUPPRESS)
+    parser.add_argument("--offset", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.dataset, args.intra_op[0], args.inter_op[0],
+                   args.batch_sizes, args.duration, args.offset)
+        sys.exit(0)
+
+    grid = thread_grid(args.workers, args.intra_op, args.inter_op, cores, args.oversubscribe)
+    if not grid:
+        sys.exit(f"No combination fits {cores} cores; pass --oversubscribe to try anyway.")
+    report = run_autotune(
+        args.backend,
+        grid,
+        args.serving_shapes,
+        args.offline_batch_sizes,
+        dataset_path=args.dataset,
+        duration=args.duration,
+        latency_target_ms=args.latency_target_ms,
+        timeout=args.timeout,
+    )
+    print_table(report["results"], report["recommended"], report["offline"], args.latency_target_ms)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n  [OK] JSON report -> {args.output}")
+    if args.env_output and report["env"]:
+        with open(args.env_output, "w", encoding="utf-8") as f:
+            f.write("\n".join(report["env"]) + "\n")
+        print(f"  [OK] Environment -> {args.env_output}")
@@ -0,0 +1,406 @@
+"""
+batch_scoring.py - Resumable Offline Batch Scoring
+===================================================
+Scores large review dumps (millions of rows) on one machine without the
+HTTP API and its rate limit, using the same backends as the server
+(``inference.py`` via the specs of benchmark.py).
+
+    - The input (TSV, CSV or JSONL) is read ``chunk_size`` rows at a time,
+      so memory stays bounded whatever the file size.
+    - Each chunk is scored in a process pool; every worker loads the
+      backend once and scores the chunk in ``batch_size`` slices.
+    - Results are written in input order: appended to one JSONL file, or
+      one Parquet part per chunk in an output directory.
+    - After each chunk is written, a checkpoint (``<output>.checkpoint.json``)
+      records how many input rows are done and how far the output goes.
+      A killed job rerun with the same arguments truncates anything
+      written past the checkpoint and continues from the next row.
+
+Output rows are ``{"id", "prediction", "confidence"}``; ``id`` is the
+``--id-column`` value or the 0-based row number, and rows with no text
+get ``null`` prediction and confidence.
+
+Usage:
+    python batch_scoring.py reviews.tsv scores.jsonl --backend artefact:models/20260101_120000
+    python batch_scoring.py dump.jsonl scores/ --format-out parquet \\
+        --text-column text --id-column review_id --processes 8
+"""
+
+import os
+import sys
+import json
+import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+DEFAULT_BACKEND = "distilbert"
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 64
+INPUT_FORMATS = ("tsv", "csv", "jsonl")
+OUTPUT_FORMATS = ("jsonl", "parquet")
+
+# (chunk index, ids, texts)
+ChunkTask = Tuple[int, List[Any], List[Optional[str]]]
+
+
+def infer_format(path: str, formats: Sequence[str]) -> str:
+    """Format from the file extension (``.json``/``.ndjson`` count as JSONL)."""
+    ext = os.path.splitext(path.rstrip("/"))[1].lower().lstrip(".")
+    ext = {"json": "jsonl", "ndjson": "jsonl", "txt": "tsv"}.get(ext, ext)
+    if ext not in formats:
+        raise ValueError(f"Cannot tell the format of {path!r}; pass one of {formats}")
+    return ext
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+def read_chunks(
+    path: str,
+    fmt: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    start_row: int = 0,
+) -> Iterator[pd.DataFrame]:
+    """Chunks of the rows of ``path`` from ``start_row`` on (0-based, header excluded)."""
+    if fmt == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            rows: List[Dict[str, Any]] = []
+            row = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                if row >= start_row:
+                    rows.append(json.loads(line))
+                    if len(rows) == chunk_size:
+                        yield pd.DataFrame(rows, index=range(row - chunk_size + 1, row + 1))
+                        rows = []
+                row += 1
+            if rows:
+                yield pd.DataFrame(rows, index=range(row - len(rows), row))
+        return
+    reader = pd.read_csv(
+        path,
+        delimiter="\t" if fmt == "tsv" else ",",
+        # Reviews contain bare quotes; TSV rows are never quoted
+        quoting=3 if fmt == "tsv" else 0,
+        chunksize=chunk_size,
+        dtype=str,
+        keep_default_na=False,
+    )
+    # Skip parsed rows, not lines: pandas drops blank lines, and rows_done
+    # counts the rows it returned
+    remaining = start_row
+    while remaining > 0:
+        try:
+            remaining -= len(reader.get_chunk(min(remaining, chunk_size)))
+        except StopIteration:
+            return
+    offset = start_row
+    for chunk in reader:
+        chunk.index = range(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def chunk_task(
+    index: int, chunk: pd.DataFrame, text_column: str, id_column: Optional[str]
+) -> ChunkTask:
+    if text_column not in chunk.columns:
+        raise KeyError(f"Text column {text_column!r} not in {list(chunk.columns)}")
+    ids = chunk[id_column].tolist() if id_column else chunk.index.tolist()
+    texts = [
+        text if isinstance(text, str) and text.strip() else None
+        for text in chunk[text_column].tolist()
+    ]
+    return index, ids, texts
+
+
+# ---------------------------------------------------------------------------
+# Scoring (worker processes)
+# ---------------------------------------------------------------------------
+
+_backend = None
+_batch_size = DEFAULT_BATCH_SIZE
+
+
+def _init_worker(spec: str, batch_size: int, torch_threads: int) -> None:
+    """Load the backend once per worker process."""
+    global _backend, _batch_size
+    if spec == "distilbert" and torch_threads > 0:
+        from memory_profile import cap_torch_threads
+
+        cap_torch_threads(torch_threads, 1)
+    from benchmark import load_backend
+
+    _backend = load_backend(spec)
+    _batch_size = batch_size
+
+
+def score_chunk(task: ChunkTask) -> Tuple[int, List[Dict[str, Any]]]:
+    """Output rows for one chunk (runs in a worker process)."""
+    index, ids, texts = task
+    present = [i for i, text in enumerate(texts) if text is not None]
+    predictions: Dict[int, Tuple[int, float]] = {}
+    for start in range(0, len(present), _batch_size):
+        batch = present[start:start + _batch_size]
+        for i, result in zip(batch, _backend.predict([texts[i] for i in batch])):
+            predictions[i] = result
+    rows = []
+    for i, row_id in enumerate(ids):
+        label, confidence = predictions.get(i, (None, None))
+        rows.append({
+            "id": row_id.item() if hasattr(row_id, "item") else row_id,
+            "prediction": None if label is None else int(label),
+            "confidence": None if confidence is None else float(confidence),
+        })
+    return index, rows
+
+
+# ---------------------------------------------------------------------------
+# Writing & checkpoints
+# ---------------------------------------------------------------------------
+
+
+def checkpoint_path(output: str) -> str:
+    return output.rstrip("/") + ".checkpoint.json"
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Atomic replace, so a kill never leaves a torn checkpoint."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class JsonlWriter:
+    """Appends rows to one file; ``position`` is the committed byte offset."""
+
+    def __init__(self, path: str, position: int = 0):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._f = open(path, "a+b")
+        # Drop anything written after the last checkpoint
+        self._f.truncate(position)
+        self._f.seek(position)
+
+    def write(self, index: int, rows: List[Dict[str, Any]]) -> int:
+        self._f.write("".join(json.dumps(row) + "\n" for row in rows).encode("utf-8"))
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return self._f.tell()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class ParquetWriter:
+    """One ``part-<chunk>.parquet`` per chunk in the output directory."""
+
+    def __init__(self, directory: str, position: int = 0):
+        try:
+            import pyarrow  # noqa: F401  (pandas' Parquet engine)
+        except ImportError as exc:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow") from exc
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        # Parts from chunks after the checkpoint are rewritten
+        for name in os.listdir(directory):
+            is_part = name.startswith("part-") and name.endswith(".parquet")
+            if is_part and int(name[5:-8]) >= position:
+                os.remove(os.path.join(directory, name))
+
+    def write(self, index: int, rows: List[Dict[str, Any]]) -> int:
+        pd.DataFrame(rows, columns=["id", "prediction", "confidence"]).to_parquet(
+            os.path.join(self.directory, f"part-{index:06d}.parquet"), index=False
+        )
+        return index + 1  # chunks committed
+
+    def close(self) -> None:
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Job
+# ---------------------------------------------------------------------------
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    *,
+    backend: str = DEFAULT_BACKEND,
+    text_column: str = "Review",
+    id_column: Optional[str] = None,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    processes: Optional[int] = None,
+    torch_threads: int = 1,
+    max_chunks: Optional[int] = None,
+    restart: bool = False,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """Score ``input_path`` into ``output_path``, resuming from its checkpoint.
+
+    Args:
+        backend: Backend spec as in benchmark.py (``distilbert``, ``artefact:<path>``).
+        processes: Worker processes (``None`` = all cores, 1 = in-process).
+        torch_threads: Intra-op threads per worker for DistilBERT, so
+            workers x threads does not oversubscribe the cores.
+        max_chunks: Stop after this many chunks (the rest resumes later).
+        restart: Ignore an existing checkpoint and start over.
+
+    Returns:
+        The final checkpoint state.
+    """
+    input_format = input_format or infer_format(input_path, INPUT_FORMATS)
+    if not output_format:
+        has_extension = bool(os.path.splitext(output_path.rstrip("/"))[1])
+        output_format = infer_format(output_path, OUTPUT_FORMATS) if has_extension else "parquet"
+    if chunk_size < 1 or batch_size < 1:
+        raise ValueError("chunk_size and batch_size must be at least 1")
+
+    job = {
+        "input": os.path.abspath(input_path),
+        "input_format": input_format,
+        "output_format": output_format,
+        "backend": backend,
+        "text_column": text_column,
+        "id_column": id_column,
+        "chunk_size": chunk_size,
+    }
+    ckpt_path = checkpoint_path(output_path)
+    state = None if restart else load_checkpoint(ckpt_path)
+    if state is not None:
+        if state["job"] != job:
+            raise ValueError(
+                f"{ckpt_path} belongs to a different job; pass --restart to start over"
+            )
+        if state["complete"]:
+            if verbose:
+                print(f"  Already complete: {state['rows_done']} rows in {output_path}")
+            return state
+    else:
+        state = {"job": job, "rows_done": 0, "chunks_done": 0, "position": 0, "complete": False}
+
+    writer_cls = JsonlWriter if output_format == "jsonl" else ParquetWriter
+    writer = writer_cls(output_path, state["position"])
+    started, rows_at_start = time.perf_counter(), state["rows_done"]
+    if verbose and state["rows_done"]:
+        print(f"  Resuming at row {state['rows_done']} (chunk {state['chunks_done']})")
+
+    chunks = read_chunks(input_path, input_format, chunk_size, start_row=state["rows_done"])
+    tasks = (
+        chunk_task(state["chunks_done"] + n, chunk, text_column, id_column)
+        for n, chunk in enumerate(itertools.islice(chunks, max_chunks))
+    )
+    committed = 0
+
+    def commit(index: int, rows: List[Dict[str, Any]]) -> None:
+        nonlocal committed
+        committed += 1
+        state["position"] = writer.write(index, rows)
+        state["rows_done"] += len(rows)
+        state["chunks_done"] = index + 1
+        save_checkpoint(ckpt_path, state)
+        if verbose:
+            rate = (state["rows_done"] - rows_at_start) / max(time.perf_counter() - started, 1e-9)
+            print(
+                f"  chunk {index}: {state['rows_done']} rows done ({rate:.0f} rows/s)", flush=True
+            )
+
+    try:
+        if processes == 1:
+            _init_worker(backend, batch_size, torch_threads)
+            for task in tasks:
+                commit(*score_chunk(task))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker,
+                initargs=(backend, batch_size, torch_threads),
+            ) as pool:
+                # Keep a few chunks in flight per worker; map() would read the
+                # whole input ahead. Results are committed in input order.
+                window = 2 * (processes or os.cpu_count() or 1)
+                pending = []
+                for task in tasks:
+                    pending.append(pool.submit(score_chunk, task))
+                    if len(pending) >= window:
+                        commit(*pending.pop(0).result())
+                for future in pending:
+                    commit(*future.result())
+    finally:
+        writer.close()
+
+    if max_chunks is None or committed < max_chunks:
+        state["complete"] = True
+        save_checkpoint(ckpt_path, state)
+    if verbose:
+        status = "complete" if state["complete"] else "paused"
+        print(f"  [OK] {state['rows_done']} rows scored ({status}) -> {output_path}")
+    return state
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a review dump offline, resumably.")
+    parser.add_argument("input", help="TSV, CSV or JSONL file")
+    parser.add_argument("output", help="JSONL file, or directory for Parquet parts")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND,
+                        help="Backend spec as in benchmark.py (default: distilbert)")
+    parser.add_argument("--text-column", default="Review")
+    parser.add_argument("--id-column", default=None, help="Default: row number")
+    parser.add_argument("--format-in", choices=INPUT_FORMATS, default=None)
+    parser.add_argument("--format-out", choices=OUTPUT_FORMATS, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Rows per chunk (and per checkpoint)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Texts per predict() call")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--torch-threads", type=int, default=1,
+                        help="Intra-op threads per worker (DistilBERT)")
+    parser.add_argument("--max-chunks", type=int, default=None,
+                        help="Stop after this many chunks; rerun to continue")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint")
+    args = parser.parse_args()
+
+    try:
+        score_file(
+            args.input,
+            args.output,
+            backend=args.backend,
+            text_column=args.text_column,
+            id_column=args.id_column,
+            input_format=args.format_in,
+            output_format=args.format_out,
+            chunk_size=args.chunk_size,
+            batch_size=args.batch_size,
+            processes=args.processes,
+            torch_threads=args.torch_threads,
+            max_chunks=args.max_chunks,
+            restart=args.restart,
+        )
+    except (ValueError, KeyError) as exc:
+        sys.exit(f"Error: {exc}")
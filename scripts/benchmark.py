@@ -0,0 +1,378 @@
+"""
+benchmark.py - Backend Benchmark on a Held-Out Split
+=====================================================
+Measures every available sentiment backend on the same held-out reviews
+so the serving choice (``MODEL_BACKEND``) is made with numbers:
+
+    - quality: accuracy, weighted F1 and ROC-AUC (via evaluation.py)
+    - latency: single-review and batched p50/p90/p99/mean (ms)
+    - throughput: reviews per second in batched mode
+    - memory: peak RSS of the process serving the backend
+    - cold start: process spawn -> imports -> model load -> first prediction
+
+Each backend runs in its own fresh interpreter, so cold start and peak
+RSS are not polluted by other backends. The held-out split is the 20%
+test set of the training script (``train_test_split(..., test_size=0.2,
+random_state=0)``) unless ``--test-size``/``--seed`` say otherwise.
+
+Backends:
+    distilbert        TransformerBackend (skipped if it cannot load)
+    mnb-legacy        models/cv-transform.pkl + restaurant-sentiment-mnb-model.pkl
+    artefact:<path>   a versioned artefact, TF-IDF/MNB or fastText-style
+                      (default: the newest of each model type in models/)
+
+Usage:
+    python benchmark.py
+    python benchmark.py --backends mnb-legacy artefact:models/20260101_120000 \\
+        --batch-size 64 --output benchmark-results.json
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import argparse
+import tempfile
+import subprocess
+from typing import Any, Callable, Dict, List, Sequence
+
+# Heavy imports (NumPy, pandas, sklearn, transformers) are deferred so that
+# the cold start of a worker process only pays for what its backend needs.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DATASET_PATH = os.path.join(PROJECT_ROOT, "data", "Restaurant_Reviews.tsv")
+MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
+RESULTS_PATH = os.path.join(PROJECT_ROOT, "benchmark-results.json")
+
+LEGACY_VECTORIZER = "cv-transform.pkl"
+LEGACY_CLASSIFIER = "restaurant-sentiment-mnb-model.pkl"
+# clean_text options the legacy pickles were trained with
+LEGACY_PREPROCESS = {"expand_contraction": False, "min_word_length": 1}
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_REPEATS = 1
+DEFAULT_TIMEOUT = 900  # seconds per backend
+WARMUP_CALLS = 3
+PERCENTILES = (50, 90, 99)
+
+
+# ---------------------------------------------------------------------------
+# Backend construction (runs inside the worker process)
+# ---------------------------------------------------------------------------
+
+
+def _load_legacy(models_dir: str = MODELS_DIR):
+    import pickle
+
+    from compiled_scorer import CompiledScorer
+    from inference import CompiledBackend
+
+    # Trusted files shipped in this repository
+    with open(os.path.join(models_dir, LEGACY_VECTORIZER), "rb") as f:
+        vectorizer = pickle.load(f)
+    with open(os.path.join(models_dir, LEGACY_CLASSIFIER), "rb") as f:
+        classifier = pickle.load(f)
+    scorer = CompiledScorer.from_sklearn(vectorizer, classifier)
+    return CompiledBackend(scorer, LEGACY_PREPROCESS, name="mnb-legacy")
+
+
+def _load_distilbert():
+    from inference import TransformerBackend
+
+    return TransformerBackend(device=-1)
+
+
+def _load_artefact(path: str):
+    from inference import backend_from_artefact
+
+    return backend_from_artefact(path)
+
+
+BACKEND_LOADERS: Dict[str, Callable[[], Any]] = {
+    "distilbert": _load_distilbert,
+    "mnb-legacy": _load_legacy,
+}
+
+
+def load_backend(spec: str):
+    """Build the backend named by ``spec`` (see module docstring)."""
+    if spec.startswith("artefact:"):
+        return _load_artefact(spec.split(":", 1)[1])
+    if spec not in BACKEND_LOADERS:
+        raise ValueError(f"Unknown backend: {spec}")
+    return BACKEND_LOADERS[spec]()
+
+
+def available_backends(models_dir: str = MODELS_DIR) -> List[str]:
+    """Backend specs that can be attempted in this environment."""
+    import importlib.util
+
+    from model_artefact import read_manifest
+    from model_registry import ModelRegistry
+
+    specs = []
+    if importlib.util.find_spec("transformers") is not None:
+        specs.append("distilbert")
+    if all(
+        os.path.isfile(os.path.join(models_dir, name))
+        for name in (LEGACY_VECTORIZER, LEGACY_CLASSIFIER)
+    ):
+        specs.append("mnb-legacy")
+    registry = ModelRegistry(models_dir)
+    newest_by_type = {}
+    for version in registry.versions():
+        path = registry.path(version)
+        newest_by_type[read_manifest(path)["model_type"]] = path
+    specs.extend(f"artefact:{path}" for path in newest_by_type.values())
+    return specs
+
+
+# ---------------------------------------------------------------------------
+# Measurement (worker process)
+# ---------------------------------------------------------------------------
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def latency_summary(samples_ns: Sequence[int]) -> Dict[str, float]:
+    """Percentiles and mean of latency samples, in milliseconds."""
+    import numpy as np
+
+    ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    summary = {f"p{p}": float(np.percentile(ms, p)) for p in PERCENTILES}
+    summary["mean"] = float(ms.mean())
+    return summary
+
+
+def run_worker(spec: str, payload_path: str, spawned_at: float) -> Dict[str, Any]:
+    """Load one backend, time it on the payload texts and report."""
+    backend = load_backend(spec)
+    with open(payload_path, encoding="utf-8") as f:
+        payload = json.load(f)
+    texts: List[str] = payload["texts"]
+    backend.predict(texts[:1])
+    cold_start = time.time() - spawned_at
+
+    for _ in range(WARMUP_CALLS):
+        backend.predict(texts[:1])
+
+    single_ns = []
+    for _ in range(payload["repeats"]):
+        for text in texts:
+            start = time.perf_counter_ns()
+            backend.predict([text])
+            single_ns.append(time.perf_counter_ns() - start)
+
+    batch_size = payload["batch_size"]
+    batch_ns, predictions = [], []
+    for _ in range(payload["repeats"]):
+        predictions = []
+        for i in range(0, len(texts), batch_size):
+            start = time.perf_counter_ns()
+            predictions.extend(backend.predict(texts[i:i + batch_size]))
+            batch_ns.append(time.perf_counter_ns() - start)
+
+    return {
+        "backend": getattr(backend, "name", spec),
+        "spec": spec,
+        "cold_start_s": cold_start,
+        "peak_rss_mb": _peak_rss_mb(),
+        "single_latency_ms": latency_summary(single_ns),
+        "batch_latency_ms": latency_summary(batch_ns),
+        "batch_size": batch_size,
+        "throughput_per_s": len(batch_ns) and (
+            len(texts) * payload["repeats"] / (sum(batch_ns) / 1e9)
+        ),
+        "predictions": [[int(label), float(conf)] for label, conf in predictions],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Orchestration (parent process)
+# ---------------------------------------------------------------------------
+
+
+def held_out_split(dataset_path: str, test_size: float, seed: int):
+    """Raw held-out reviews and labels (same split as the training script)."""
+    import numpy as np
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    df = pd.read_csv(dataset_path, delimiter="\t", quoting=3)
+    df = df.dropna(subset=["Review", "Liked"])
+    _, test_idx = train_test_split(np.arange(len(df)), test_size=test_size, random_state=seed)
+    test = df.iloc[np.sort(test_idx)]
+    return test["Review"].astype(str).tolist(), test["Liked"].astype(int).to_numpy()
+
+
+def benchmark_backend(
+    spec: str, payload_path: str, timeout: float = DEFAULT_TIMEOUT
+) -> Dict[str, Any]:
+    """Run ``spec`` in a fresh interpreter; errors become a ``skipped`` entry."""
+    command = [
+        sys.executable, os.path.abspath(__file__),
+        "--worker", spec,
+        "--payload", payload_path,
+        "--spawned-at", repr(time.time()),
+    ]
+    try:
+        proc = subprocess.run(
+            command, capture_output=True, text=True, timeout=timeout, cwd=SCRIPT_DIR
+        )
+    except subprocess.TimeoutExpired:
+        return {"spec": spec, "skipped": f"timed out after {timeout:.0f}s"}
+    if proc.returncode != 0:
+        lines = (proc.stderr or proc.stdout).strip().splitlines()
+        return {"spec": spec, "skipped": lines[-1] if lines else f"exit code {proc.returncode}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def add_quality(result: Dict[str, Any], y_true) -> None:
+    """Accuracy/F1/ROC-AUC from the worker's predictions (computed here)."""
+    import numpy as np
+
+    from evaluation import compute_metrics
+
+    preds = np.array(result.pop("predictions"))
+    y_pred = preds[:, 0].astype(int)
+    # Backends report the confidence of their label; recover P(positive)
+    y_score = np.where(y_pred == 1, preds[:, 1], 1.0 - preds[:, 1])
+    metrics = compute_metrics(y_true, y_pred, y_score)
+    result.update(
+        accuracy=metrics["accuracy"],
+        f1_weighted=metrics["f1_weighted"],
+        roc_auc=metrics["roc_auc"],
+        confusion_matrix=metrics["confusion_matrix"],
+    )
+
+
+def pareto_front(results: List[Dict[str, Any]]) -> List[str]:
+    """Specs not dominated on (F1 up, p50 single latency down, peak RSS down)."""
+    def objectives(r):
+        return (-r["f1_weighted"], r["single_latency_ms"]["p50"], r["peak_rss_mb"])
+
+    measured = [r for r in results if "skipped" not in r]
+    front = []
+    for r in measured:
+        mine = objectives(r)
+        dominated = any(
+            all(o <= m for o, m in zip(objectives(other), mine))
+            and objectives(other) != mine
+            for other in measured
+            if other is not r
+        )
+        if not dominated:
+            front.append(r["spec"])
+    return front
+
+
+def print_table(results: List[Dict[str, Any]], front: List[str]) -> None:
+    print("\n" + "=" * 100)
+    print("BACKEND BENCHMARK")
+    print("=" * 100)
+    header = (
+        f"  {'Backend':<24} {'Acc':>6} {'F1':>6} {'1x p50':>8} {'1x p99':>8} "
+        f"{'Batch p50':>10} {'Rev/s':>9} {'RSS MB':>8} {'Cold s':>7}  Pareto"
+    )
+    print(header)
+    print("  " + "-" * (len(header) - 2))
+    for r in results:
+        if "skipped" in r:
+            print(f"  {r['spec']:<24} skipped: {r['skipped']}")
+            continue
+        print(
+            f"  {r['backend'][:24]:<24} {r['accuracy']:>6.3f} {r['f1_weighted']:>6.3f} "
+            f"{r['single_latency_ms']['p50']:>8.3f} {r['single_latency_ms']['p99']:>8.3f} "
+            f"{r['batch_latency_ms']['p50']:>10.3f} {r['throughput_per_s']:>9.0f} "
+            f"{r['peak_rss_mb']:>8.1f} {r['cold_start_s']:>7.2f}  "
+            f"{'*' if r['spec'] in front else ''}"
+        )
+    print("\n  Latencies in ms; Pareto = not dominated on F1, single p50 latency and peak RSS.")
+    print("=" * 100)
+
+
+def run_benchmark(
+    specs: Sequence[str],
+    *,
+    dataset_path: str = DATASET_PATH,
+    test_size: float = 0.2,
+    seed: int = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    repeats: int = DEFAULT_REPEATS,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Dict[str, Any]:
+    """Benchmark ``specs`` and return the JSON-serialisable report."""
+    texts, y_true = held_out_split(dataset_path, test_size, seed)
+    fd, payload_path = tempfile.mkstemp(suffix=".json", prefix="benchmark-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"texts": texts, "batch_size": batch_size, "repeats": repeats}, f)
+        results = []
+        for spec in specs:
+            print(f"  Benchmarking {spec} ...", flush=True)
+            result = benchmark_backend(spec, payload_path, timeout)
+            if "skipped" not in result:
+                add_quality(result, y_true)
+            results.append(result)
+    finally:
+        os.remove(payload_path)
+
+    front = pareto_front(results)
+    for r in results:
+        r["pareto"] = r["spec"] in front
+    return {
+        "dataset": os.path.relpath(dataset_path, PROJECT_ROOT),
+        "n_test": len(texts),
+        "test_size": test_size,
+        "seed": seed,
+        "batch_size": batch_size,
+        "repeats": repeats,
+        "results": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sentiment backends.")
+    parser.add_argument("--backends", nargs="*", default=None,
+                        help="Backend specs (default: every available backend)")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--output", default=RESULTS_PATH, help="JSON report path")
+    # Internal: run one backend in this (fresh) process
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--payload", help=argparse.SUPPRESS)
+    parser.add_argument("--spawned-at", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.payload, args.spawned_at)))
+        sys.exit(0)
+
+    specs = args.backends if args.backends else available_backends()
+    report = run_benchmark(
+        specs,
+        dataset_path=args.dataset,
+        test_size=args.test_size,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        repeats=args.repeats,
+        timeout=args.timeout,
+    )
+    print_table(report["results"], [r["spec"] for r in report["results"] if r.get("pareto")])
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n  [OK] JSON report -> {args.output}")
@@ -0,0 +1,415 @@
+"""
+compiled_scorer.py - NumPy-Only Scorer for the TF-IDF + Naive Bayes Model
+==========================================================================
+Loading the pickled ``TfidfVectorizer`` and ``MultinomialNB`` pulls in all
+of scikit-learn, and scoring one review goes through generic sparse
+transforms. This module "compiles" the fitted pair into a handful of
+arrays -- the vocabulary, IDF weights, ``feature_log_prob_`` and the class
+log-priors -- plus a token -> column map, and scores with plain NumPy.
+
+Predictions match ``classifier.predict(vectorizer.transform(texts))``
+exactly; probabilities agree to floating-point precision. The module only
+imports NumPy, so serving processes start without scikit-learn.
+
+``HashedScorer`` does the same for a ``HashingVectorizer`` +
+``MultinomialNB`` pair (the incrementally trained model of
+online_training.py): there is no vocabulary, so tokens are mapped to
+columns with the same MurmurHash3 as scikit-learn.
+
+Inputs are scored exactly as the vectoriser would see them: apply the
+same cleaning as the training corpus (e.g. ``preprocess.clean_text``)
+before scoring.
+
+Usage:
+    # Compile (needs scikit-learn to unpickle the originals)
+    python compiled_scorer.py cv-transform.pkl restaurant-sentiment-mnb-model.pkl \\
+        -o restaurant-sentiment-compiled.npz
+
+    # Score (NumPy only)
+    from compiled_scorer import CompiledScorer
+
+    scorer = CompiledScorer.load("restaurant-sentiment-compiled.npz")
+    scorer.predict(["food great", "cold soup rude staff"])
+    label, proba = scorer.score_one("food great")
+"""
+
+import re
+import json
+import struct
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Bump when the array layout or the scoring semantics change
+COMPILED_FORMAT_VERSION = 1
+
+# Vectoriser settings the NumPy scorer reproduces; anything else is rejected
+_SUPPORTED_DEFAULTS = {
+    "analyzer": "word",
+    "ngram_range": (1, 1),
+    "preprocessor": None,
+    "tokenizer": None,
+    "stop_words": None,
+    "strip_accents": None,
+    "input": "content",
+    "binary": False,
+}
+
+
+class CompiledScorer:
+    """Vectorised MultinomialNB scoring over a TF-IDF vocabulary.
+
+    Args:
+        terms: Vocabulary, index-aligned with the model's columns.
+        idf: IDF weight per column (ones when ``use_idf`` was False).
+        feature_log_prob: ``(n_classes, n_features)`` log-probabilities.
+        class_log_prior: ``(n_classes,)`` log-priors.
+        classes: Class labels.
+        config: Tokenisation/weighting settings captured from the vectoriser.
+    """
+
+    model_type = "tfidf-mnb"
+
+    def __init__(
+        self,
+        terms: np.ndarray,
+        idf: np.ndarray,
+        feature_log_prob: np.ndarray,
+        class_log_prior: np.ndarray,
+        classes: np.ndarray,
+        config: Dict[str, Any],
+    ):
+        self.terms = terms
+        self.idf = idf
+        self.feature_log_prob = feature_log_prob
+        self.class_log_prior = class_log_prior
+        self.classes = classes
+        self.config = dict(config)
+        self.n_features = len(idf)
+        self.token_index: Dict[str, int] = {str(t): i for i, t in enumerate(terms.tolist())}
+        self._token_re = re.compile(self.config["token_pattern"])
+        self._lowercase = bool(self.config["lowercase"])
+        self._sublinear_tf = bool(self.config["sublinear_tf"])
+        self._norm = self.config["norm"]
+        # Transposed *view* (no copy) so memory-mapped arrays stay shared
+        self._log_prob_t = feature_log_prob.T
+
+    # -- compilation -------------------------------------------------------------
+
+    @classmethod
+    def from_sklearn(cls, vectorizer, classifier) -> "CompiledScorer":
+        """Compile a fitted ``TfidfVectorizer`` + ``MultinomialNB`` pair.
+
+        A plain ``CountVectorizer`` (the legacy pickles) compiles as TF-IDF
+        without IDF, normalisation or sublinear TF.
+        """
+        params = vectorizer.get_params()
+        for key, expected in _SUPPORTED_DEFAULTS.items():
+            value = tuple(params[key]) if key == "ngram_range" else params[key]
+            if value != expected:
+                raise ValueError(
+                    f"Cannot compile vectoriser with {key}={params[key]!r}; "
+                    f"only {expected!r} is supported."
+                )
+        if re.compile(params["token_pattern"]).groups > 1:
+            raise ValueError("token_pattern must have at most one capturing group.")
+
+        n_features = len(vectorizer.vocabulary_)
+        terms = np.empty(n_features, dtype=object)
+        for term, idx in vectorizer.vocabulary_.items():
+            terms[idx] = term
+        idf = (
+            np.asarray(vectorizer.idf_, dtype=np.float64)
+            if params.get("use_idf", False)
+            else np.ones(n_features)
+        )
+        config = {
+            "token_pattern": params["token_pattern"],
+            "lowercase": params["lowercase"],
+            "norm": params.get("norm"),
+            "sublinear_tf": params.get("sublinear_tf", False),
+            "format_version": COMPILED_FORMAT_VERSION,
+        }
+        return cls(
+            terms.astype(str),
+            idf,
+            np.asarray(classifier.feature_log_prob_, dtype=np.float64),
+            np.asarray(classifier.class_log_prior_, dtype=np.float64),
+            np.asarray(classifier.classes_),
+            config,
+        )
+
+    # -- persistence -------------------------------------------------------------
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Named arrays that fully describe the model (alongside ``config``)."""
+        return {
+            "terms": self.terms,
+            "idf": self.idf,
+            "feature_log_prob": self.feature_log_prob,
+            "class_log_prior": self.class_log_prior,
+            "classes": self.classes,
+        }
+
+    def save(self, path: str) -> None:
+        """Write the compiled model as a pickle-free ``.npz`` file."""
+        np.savez(
+            path,
+            config=np.array(json.dumps(self.config)),
+            model_type=np.array(self.model_type),
+            **self.arrays(),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledScorer":
+        """Load a model written by ``save`` (of this class)."""
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(str(data["config"]))
+            if config.get("format_version") != COMPILED_FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported compiled model version {config.get('format_version')}"
+                )
+            # Files written before hashed models existed carry no model_type
+            model_type = str(data["model_type"]) if "model_type" in data.files else "tfidf-mnb"
+            if model_type != cls.model_type:
+                raise ValueError(f"{path} holds a {model_type} model, not {cls.model_type}")
+            arrays = {
+                name: data[name] for name in data.files if name not in ("config", "model_type")
+            }
+            return cls(config=config, **arrays)
+
+    # -- scoring -----------------------------------------------------------------
+
+    def _tokens(self, text: str) -> List[int]:
+        if self._lowercase:
+            text = text.lower()
+        lookup = self.token_index.get
+        return [i for i in map(lookup, self._token_re.findall(text)) if i is not None]
+
+    def _weights(
+        self, ids: np.ndarray, counts: np.ndarray, doc_ids: np.ndarray, n_docs: int
+    ) -> np.ndarray:
+        """TF-IDF values (per non-zero entry) with row normalisation."""
+        tf = counts.astype(np.float64)
+        if self._sublinear_tf:
+            tf = np.log(tf) + 1.0
+        values = tf * self.idf[ids]
+        if self._norm == "l2":
+            row_norm = np.sqrt(np.bincount(doc_ids, weights=values * values, minlength=n_docs))
+        elif self._norm == "l1":
+            row_norm = np.bincount(doc_ids, weights=np.abs(values), minlength=n_docs)
+        else:
+            return values
+        row_norm[row_norm == 0.0] = 1.0
+        return values / row_norm[doc_ids]
+
+    def tokenize(self, texts: Iterable[str]) -> List[List[int]]:
+        """Vocabulary ids of each text's in-vocabulary tokens."""
+        return [self._tokens(text) for text in texts]
+
+    def joint_log_likelihood(self, texts: Iterable[str]) -> np.ndarray:
+        """Unnormalised class log-probabilities, shape ``(n_texts, n_classes)``."""
+        return self.joint_log_likelihood_tokens(self.tokenize(texts))
+
+    def joint_log_likelihood_tokens(self, token_ids: Sequence[List[int]]) -> np.ndarray:
+        """``joint_log_likelihood`` of texts already passed through ``tokenize``."""
+        doc_ids, ids = [], []
+        n_docs = len(token_ids)
+        for doc, tokens in enumerate(token_ids):
+            ids.extend(tokens)
+            doc_ids.extend([doc] * len(tokens))
+
+        jll = np.tile(self.class_log_prior, (n_docs, 1))
+        if not ids:
+            return jll
+
+        # Collapse repeated (doc, term) pairs into counts, sorted like CSR
+        n_features = self.n_features
+        keys = np.asarray(doc_ids, dtype=np.int64) * n_features + np.asarray(ids, dtype=np.int64)
+        keys, counts = np.unique(keys, return_counts=True)
+        docs, cols = np.divmod(keys, n_features)
+
+        values = self._weights(cols, counts, docs, n_docs)
+        contrib = self._log_prob_t[cols] * values[:, np.newaxis]
+        for c in range(jll.shape[1]):
+            jll[:, c] += np.bincount(docs, weights=contrib[:, c], minlength=n_docs)
+        return jll
+
+    def predict_proba(self, texts: Iterable[str]) -> np.ndarray:
+        """Class probabilities, matching ``MultinomialNB.predict_proba``."""
+        return self.predict_proba_tokens(self.tokenize(texts))
+
+    def predict_proba_tokens(self, token_ids: Sequence[List[int]]) -> np.ndarray:
+        """``predict_proba`` of texts already passed through ``tokenize``."""
+        jll = self.joint_log_likelihood_tokens(token_ids)
+        peak = jll.max(axis=1, keepdims=True)
+        log_norm = peak + np.log(np.exp(jll - peak).sum(axis=1, keepdims=True))
+        return np.exp(jll - log_norm)
+
+    def predict(self, texts: Iterable[str]) -> np.ndarray:
+        """Predicted labels, matching ``MultinomialNB.predict``."""
+        return self.classes[self.joint_log_likelihood(texts).argmax(axis=1)]
+
+    def score_one(self, text: str) -> Tuple[Any, np.ndarray]:
+        """Fast path for a single review: ``(label, class probabilities)``."""
+        ids = self._tokens(text)
+        jll = self.class_log_prior.copy()
+        if ids:
+            cols, counts = np.unique(np.asarray(ids, dtype=np.int64), return_counts=True)
+            values = self._weights(cols, counts, np.zeros(len(cols), dtype=np.int64), 1)
+            jll += values @ self._log_prob_t[cols]
+        proba = np.exp(jll - jll.max())
+        proba /= proba.sum()
+        return self.classes[int(jll.argmax())], proba
+
+
+# ---------------------------------------------------------------------------
+# Hashed features (no vocabulary)
+# ---------------------------------------------------------------------------
+_M32 = 0xFFFFFFFF
+
+
+def _rotl32(x: int, r: int) -> int:
+    return ((x << r) | (x >> (32 - r))) & _M32
+
+
+def murmurhash3_32(data: bytes, seed: int = 0) -> int:
+    """Signed 32-bit MurmurHash3 (x86), as ``sklearn.utils.murmurhash3_32``."""
+    c1, c2 = 0xCC9E2D51, 0x1B873593
+    h = seed & _M32
+    n_blocks = len(data) // 4
+    for k in struct.unpack_from(f"<{n_blocks}I", data):
+        k = (_rotl32((k * c1) & _M32, 15) * c2) & _M32
+        h = (_rotl32(h ^ k, 13) * 5 + 0xE6546B64) & _M32
+    tail = data[n_blocks * 4:]
+    if tail:
+        k = int.from_bytes(tail, "little")
+        h ^= (_rotl32((k * c1) & _M32, 15) * c2) & _M32
+    h ^= len(data)
+    h = ((h ^ (h >> 16)) * 0x85EBCA6B) & _M32
+    h = ((h ^ (h >> 13)) * 0xC2B2AE35) & _M32
+    h ^= h >> 16
+    return h - (1 << 32) if h & 0x80000000 else h
+
+
+@lru_cache(maxsize=1 << 16)
+def hashed_column(token: str, n_features: int) -> int:
+    """Column ``HashingVectorizer`` assigns to ``token``."""
+    return abs(murmurhash3_32(token.encode("utf-8"))) % n_features
+
+
+class HashedScorer(CompiledScorer):
+    """MultinomialNB over ``HashingVectorizer`` features, NumPy only.
+
+    Args:
+        feature_log_prob: ``(n_classes, n_features)`` log-probabilities.
+        class_log_prior: ``(n_classes,)`` log-priors.
+        classes: Class labels.
+        config: Tokenisation settings plus ``n_features``.
+    """
+
+    model_type = "hashed-mnb"
+
+    def __init__(
+        self,
+        feature_log_prob: np.ndarray,
+        class_log_prior: np.ndarray,
+        classes: np.ndarray,
+        config: Dict[str, Any],
+    ):
+        n_features = int(config["n_features"])
+        super().__init__(
+            np.empty(0, dtype=str),
+            # Unit weights without allocating n_features floats
+            np.broadcast_to(np.float64(1.0), (n_features,)),
+            feature_log_prob,
+            class_log_prior,
+            classes,
+            config,
+        )
+
+    @classmethod
+    def from_sklearn(cls, vectorizer, classifier) -> "HashedScorer":
+        """Compile a ``HashingVectorizer`` + fitted ``MultinomialNB`` pair."""
+        params = vectorizer.get_params()
+        supported = {**_SUPPORTED_DEFAULTS, "alternate_sign": False}
+        for key, expected in supported.items():
+            value = tuple(params[key]) if key == "ngram_range" else params[key]
+            if value != expected:
+                raise ValueError(
+                    f"Cannot compile vectoriser with {key}={params[key]!r}; "
+                    f"only {expected!r} is supported."
+                )
+        if re.compile(params["token_pattern"]).groups > 1:
+            raise ValueError("token_pattern must have at most one capturing group.")
+        config = {
+            "token_pattern": params["token_pattern"],
+            "lowercase": params["lowercase"],
+            "norm": params["norm"],
+            "sublinear_tf": False,
+            "n_features": int(params["n_features"]),
+            "format_version": COMPILED_FORMAT_VERSION,
+        }
+        return cls(
+            np.asarray(classifier.feature_log_prob_, dtype=np.float64),
+            np.asarray(classifier.class_log_prior_, dtype=np.float64),
+            np.asarray(classifier.classes_),
+            config,
+        )
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "feature_log_prob": self.feature_log_prob,
+            "class_log_prior": self.class_log_prior,
+            "classes": self.classes,
+        }
+
+    def _tokens(self, text: str) -> List[int]:
+        if self._lowercase:
+            text = text.lower()
+        n_features = self.n_features
+        return [hashed_column(token, n_features) for token in self._token_re.findall(text)]
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point: compile pickled artefacts
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+    import pickle
+
+    from model_artefact import save_artefact
+
+    parser = argparse.ArgumentParser(description="Compile the pickled TF-IDF + MNB model.")
+    parser.add_argument("vectorizer", help="Pickled TfidfVectorizer (cv-transform.pkl)")
+    parser.add_argument("classifier", help="Pickled MultinomialNB")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--models-dir",
+                        help="Write a versioned artefact here (servable with MODEL_BACKEND=mnb)")
+    target.add_argument("-o", "--output", default="restaurant-sentiment-compiled.npz",
+                        help="Loose .npz file instead (not picked up by the model registry)")
+    args = parser.parse_args()
+
+    with open(args.vectorizer, "rb") as f:
+        vectorizer = pickle.load(f)
+    with open(args.classifier, "rb") as f:
+        classifier = pickle.load(f)
+
+    scorer = CompiledScorer.from_sklearn(vectorizer, classifier)
+    if args.models_dir:
+        path = save_artefact(
+            args.models_dir,
+            scorer,
+            metadata={
+                "source": "legacy_pickle",
+                # clean_text options the legacy pickles were trained with
+                "preprocess": {
+                    "expand_contraction": False, "min_word_length": 1, "lemmatize": True,
+                },
+            },
+        )
+        print(f"  [OK] Compiled {len(scorer.terms)} terms -> artefact {path}")
+    else:
+        scorer.save(args.output)
+        print(f"  [OK] Compiled {len(scorer.terms)} terms -> {args.output}")
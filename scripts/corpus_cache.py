@@ -0,0 +1,202 @@
+"""
+corpus_cache.py - Content-Addressed Cache of Preprocessed Corpora
+==================================================================
+Cleaning the review text is the slowest step of every tuning and training
+run, and its output only depends on the raw dataset bytes and the
+preprocessing options. This module stores cleaned corpora on disk under a
+key derived from both, so repeated runs load the result instead of
+re-cleaning.
+
+Entries are ``.npz`` files holding three flat arrays (no pickling):
+    - ``text``:    UTF-8 bytes of every cleaned review, concatenated
+    - ``offsets``: int64 boundaries into ``text`` (len = n_reviews + 1)
+    - ``labels``:  int64 label column
+
+Usage:
+    from corpus_cache import load_corpus
+
+    corpus, y = load_corpus("Restaurant_Reviews.tsv")
+    corpus, y = load_corpus(path, lemmatize=False)   # separate cache entry
+
+Configuration:
+    CORPUS_CACHE_DIR  Cache directory
+                      (default: ~/.cache/restaurant-sentiment/corpora)
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from preprocess import lemmatizer_available, preprocess_corpus
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+CORPUS_CACHE_DIR = os.environ.get(
+    "CORPUS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "restaurant-sentiment", "corpora"),
+)
+
+# Bump when the cleaning pipeline changes in a way the options do not capture
+CACHE_FORMAT_VERSION = 1
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+# ---------------------------------------------------------------------------
+# Key derivation
+# ---------------------------------------------------------------------------
+
+
+def file_digest(filepath: str) -> str:
+    """Return the SHA-256 hex digest of a file, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _normalise_config(clean_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn ``clean_text`` options into a JSON-stable dict."""
+    config = dict(clean_kwargs)
+    if config.get("custom_stopwords"):
+        config["custom_stopwords"] = sorted(config["custom_stopwords"])
+    else:
+        config.pop("custom_stopwords", None)
+    # The WordNet fallback changes the output, so it must change the key too
+    if config.get("lemmatize", True):
+        config["wordnet"] = lemmatizer_available()
+    return config
+
+
+def cache_key(
+    dataset_digest: str,
+    *,
+    text_column: str = "Review",
+    label_column: str = "Liked",
+    delimiter: str = "\t",
+    **clean_kwargs,
+) -> str:
+    """Derive the cache key for a dataset digest and preprocessing options."""
+    payload = {
+        "version": CACHE_FORMAT_VERSION,
+        "dataset": dataset_digest,
+        "text_column": text_column,
+        "label_column": label_column,
+        "delimiter": delimiter,
+        "clean": _normalise_config(clean_kwargs),
+    }
+    blob = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:32]
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+def _pack(corpus: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode a list of strings as one byte buffer plus offsets."""
+    encoded = [doc.encode("utf-8") for doc in corpus]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    text = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return text, offsets
+
+
+def _unpack(text: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """Inverse of ``_pack``."""
+    raw = text.tobytes()
+    return [
+        raw[start:end].decode("utf-8")
+        for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+    ]
+
+
+def save_entry(path: str, corpus: List[str], labels: np.ndarray) -> None:
+    """Atomically write a cache entry to ``path``."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    text, offsets = _pack(corpus)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, text=text, offsets=offsets, labels=np.asarray(labels, dtype=np.int64))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_entry(path: str) -> Tuple[List[str], np.ndarray]:
+    """Read a cache entry written by ``save_entry``."""
+    with np.load(path, allow_pickle=False) as data:
+        return _unpack(data["text"], data["offsets"]), data["labels"]
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def load_corpus(
+    dataset_path: str,
+    *,
+    text_column: str = "Review",
+    label_column: str = "Liked",
+    delimiter: str = "\t",
+    cache_dir: Optional[str] = None,
+    use_cache: bool = True,
+    **clean_kwargs,
+) -> Tuple[List[str], np.ndarray]:
+    """Return the cleaned corpus and labels for a dataset, using the cache.
+
+    Args:
+        dataset_path: Path to the raw TSV/CSV dataset.
+        text_column: Column holding the review text.
+        label_column: Column holding the binary label.
+        delimiter: Column delimiter (default: tab for TSV).
+        cache_dir: Override for ``CORPUS_CACHE_DIR``.
+        use_cache: Set to False to always re-clean (the result is still stored).
+        **clean_kwargs: Forwarded to ``preprocess_corpus`` and part of the key.
+
+    Returns:
+        Tuple of (list of cleaned strings, label array).
+    """
+    key = cache_key(
+        file_digest(dataset_path),
+        text_column=text_column,
+        label_column=label_column,
+        delimiter=delimiter,
+        **clean_kwargs,
+    )
+    entry_path = os.path.join(cache_dir or CORPUS_CACHE_DIR, f"{key}.npz")
+
+    if use_cache and os.path.isfile(entry_path):
+        try:
+            corpus, labels = load_entry(entry_path)
+            logger.info("Loaded %d cleaned reviews from cache %s", len(corpus), entry_path)
+            return corpus, labels
+        except Exception:
+            logger.warning("Corrupt cache entry %s; rebuilding.", entry_path)
+
+    df = pd.read_csv(dataset_path, delimiter=delimiter, quoting=3)
+    corpus = preprocess_corpus(df[text_column], **clean_kwargs)
+    labels = df[label_column].to_numpy(dtype=np.int64)
+
+    try:
+        save_entry(entry_path, corpus, labels)
+        logger.info("Cached cleaned corpus -> %s", entry_path)
+    except OSError as exc:
+        logger.warning("Could not write corpus cache %s: %s", entry_path, exc)
+
+    return corpus, labels
@@ -3,7 +3,8 @@ data_validation.py - Data Quality Validation Module
 =====================================================
 Validates the restaurant reviews dataset before training or inference.
 Checks for nulls, duplicates, class imbalance, encoding issues, and
-structural integrity.
+structural integrity. All statistics are gathered in a single pass per
+column (``compute_statistics``) and every check is formatted from them.
 
 Usage:
     from data_validation import validate_dataset
@@ -14,6 +15,7 @@ Usage:
 """
 
 import os
+import re
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -31,6 +33,23 @@ DEFAULT_MAX_IMBALANCE_RATIO = 3.0  # majority / minority < 3x
 DEFAULT_MIN_REVIEW_LENGTH = 3  # characters
 DEFAULT_MAX_REVIEW_LENGTH = 10_000
 DEFAULT_DUPLICATE_THRESHOLD = 0.10  # warn if >10% duplicates
+# Distinct row hashes kept for duplicate counting in sharded validation
+# (8 bytes each); counts are exact up to this many distinct reviews and
+# estimated beyond it. In-memory validation keeps every hash (exact).
+DEFAULT_DUPLICATE_SKETCH_SIZE = 1 << 20
+
+# Near-duplicate detection (MinHash + LSH). With 128 permutations in 16
+# bands of 8 rows, pairs become LSH candidates from a Jaccard similarity of
+# roughly (1/16) ** (1/8) ~= 0.71; candidates are then kept only if their
+# estimated similarity reaches the threshold.
+DEFAULT_NEAR_DUPLICATE_THRESHOLD = 0.8  # estimated Jaccard similarity
+DEFAULT_NUM_PERM = 128
+DEFAULT_LSH_BANDS = 16
+DEFAULT_SHINGLE_SIZE = 5  # characters
+MINHASH_SEED = 1
+# Shingles hashed at once; the (num_perm, shingles) uint64 matrix is then
+# at most 32 MiB with 128 permutations, whatever the review lengths
+DEFAULT_MINHASH_BLOCK_SHINGLES = 1 << 15
 
 
 # ---------------------------------------------------------------------------
@@ -54,9 +73,15 @@ def check_required_columns(
     df: pd.DataFrame, required: Optional[set] = None
 ) -> Dict[str, Any]:
     """Verify all required columns are present."""
+    return _required_columns_result(df.columns, required)
+
+
+def _required_columns_result(
+    columns: List[str], required: Optional[set] = None
+) -> Dict[str, Any]:
     required = required or DEFAULT_REQUIRED_COLUMNS
     result = {"check": "required_columns", "passed": False, "details": ""}
-    missing = required - set(df.columns)
+    missing = required - set(columns)
     if missing:
         result["details"] = f"Missing columns: {missing}"
     else:
@@ -65,13 +90,373 @@ def check_required_columns(
     return result
 
 
-def check_null_values(df: pd.DataFrame) -> Dict[str, Any]:
-    """Check for null/NaN values in the dataset."""
+# ---------------------------------------------------------------------------
+# Near-duplicate detection (shingling + MinHash + LSH)
+# ---------------------------------------------------------------------------
+# Each review becomes a set of character shingles of its normalised text.
+# MinHash compresses the set into ``num_perm`` minima of random
+# multiply-shift hash functions h(x) = (a*x + b) >> 32 of the shingle hashes,
+# whose agreement rate estimates Jaccard similarity. LSH splits signatures
+# into bands and only compares reviews sharing a whole band, so the cost
+# stays close to linear in the corpus.
+
+# Signature of a review with no shingles (empty/null text)
+_EMPTY_HASH = np.iinfo(np.uint32).max
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def _normalise(text: Any) -> str:
+    if not isinstance(text, str):
+        return ""
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def _encode(text: Any, shingle_size: int) -> bytes:
+    """Normalised UTF-8 bytes, padded so short texts form one shingle."""
+    encoded = _normalise(text).encode("utf-8")
+    return encoded.ljust(shingle_size) if encoded else encoded
+
+
+def _shingle_hashes(encoded: List[bytes], shingle_size: int):
+    """Hash every character shingle of a batch of encoded texts in one NumPy pass.
+
+    Repeated shingles are kept: they do not change a minimum.
+
+    Returns:
+        ``(hashes, sizes)``: uint64 shingle hashes grouped by text, and the
+        number of shingles per text (0 for empty texts).
+    """
+    lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+    sizes = np.where(lengths > 0, lengths - shingle_size + 1, 0)
+    if not sizes.any():
+        return np.empty(0, dtype=np.uint64), sizes
+
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    n_windows = len(data) - shingle_size + 1
+    hashes = np.zeros(n_windows, dtype=np.uint64)
+    for offset in range(shingle_size):
+        hashes *= np.uint64(257)
+        hashes += data[offset:offset + n_windows]
+
+    # Keep only windows that start and end inside the same text
+    starts = np.cumsum(lengths) - lengths
+    keep = np.concatenate([
+        np.arange(start, start + size) for start, size in zip(starts, sizes) if size
+    ])
+    return hashes[keep], sizes
+
+
+def _hash_params(num_perm: int, seed: int):
+    rng = np.random.RandomState(seed)
+    bits = np.iinfo(np.uint64).max
+    a = rng.randint(0, bits, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.randint(0, bits, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(
+    texts: List[Any],
+    *,
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    seed: int = MINHASH_SEED,
+    block_shingles: int = DEFAULT_MINHASH_BLOCK_SHINGLES,
+) -> np.ndarray:
+    """MinHash signatures, shape ``(len(texts), num_perm)``, dtype uint32.
+
+    Signatures depend only on the text and the parameters, so signatures
+    computed separately (e.g. per shard) can be stacked and compared.
+    Reviews without any shingle (empty/null) get an all-``_EMPTY_HASH`` row.
+
+    Texts are batched by shingle count, not text count, and the hash matrix
+    is built ``block_shingles`` columns at a time, so memory is bounded
+    however long the reviews are.
+    """
+    a, b = _hash_params(num_perm, seed)
+    a, b = a[:, np.newaxis], b[:, np.newaxis]
+    signatures = np.full((len(texts), num_perm), _EMPTY_HASH, dtype=np.uint32)
+
+    batch: List[bytes] = []
+    start = n_shingles = 0
+    for i, text in enumerate(texts):
+        encoded = _encode(text, shingle_size)
+        batch.append(encoded)
+        n_shingles += max(len(encoded) - shingle_size + 1, 0)
+        if n_shingles >= block_shingles or i == len(texts) - 1:
+            x, sizes = _shingle_hashes(batch, shingle_size)
+            _minhash_into(signatures[start:start + len(batch)], x, sizes, a, b, block_shingles)
+            start += len(batch)
+            batch, n_shingles = [], 0
+    return signatures
+
+
+def _minhash_into(out: np.ndarray, x: np.ndarray, sizes: np.ndarray, a, b, block: int) -> None:
+    """Lower ``out`` rows to the min hash of each text's shingles ``x``."""
+    owner = np.repeat(np.arange(len(sizes)), sizes)
+    shift = np.uint64(32)
+    for lo in range(0, len(x), block):
+        # Multiply-shift hashing: uint64 arithmetic wraps modulo 2**64
+        hashed = a * x[lo:lo + block]
+        hashed += b
+        hashed >>= shift
+        block_owner = owner[lo:lo + block]
+        # A text can span blocks: reduce its slice here, then keep the minimum
+        starts = np.flatnonzero(np.r_[True, block_owner[1:] != block_owner[:-1]])
+        rows = block_owner[starts]
+        mins = np.minimum.reduceat(hashed, starts, axis=1).T.astype(np.uint32)
+        out[rows] = np.minimum(out[rows], mins)
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def lsh_clusters(
+    signatures: np.ndarray,
+    *,
+    threshold: float = DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+    bands: int = DEFAULT_LSH_BANDS,
+) -> List[List[int]]:
+    """Group rows whose estimated Jaccard similarity reaches ``threshold``.
+
+    Rows sharing an LSH bucket are verified against a bucket anchor on the
+    full signature and merged with union-find, so clusters are transitive.
+
+    Returns:
+        Clusters of row positions (size >= 2), largest first.
+    """
+    n_rows, num_perm = signatures.shape
+    if bands <= 0 or num_perm % bands:
+        raise ValueError(
+            f"bands ({bands}) must divide the signature length ({num_perm})"
+        )
+    band_width = num_perm // bands
+
+    # Identical signatures (exact and trivial duplicates) are merged up
+    # front, so LSH only sees each distinct signature once
+    rows = np.flatnonzero(signatures[:, 0] != _EMPTY_HASH)
+    row_keys = np.ascontiguousarray(signatures[rows]).view(
+        np.dtype((np.void, signatures.itemsize * num_perm))
+    ).ravel()
+    _, first, inverse = np.unique(row_keys, return_index=True, return_inverse=True)
+    unique_sigs = signatures[rows[first]]
+    n_unique = len(unique_sigs)
+    parent = list(range(n_unique))
+
+    for band in range(bands):
+        block = np.ascontiguousarray(
+            unique_sigs[:, band * band_width:(band + 1) * band_width]
+        )
+        keys = block.view(np.dtype((np.void, block.itemsize * band_width))).ravel()
+        _, bucket, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        shared = np.flatnonzero(counts[bucket] > 1)
+        if len(shared) == 0:
+            continue
+        order = np.argsort(bucket[shared], kind="stable")
+        members, bucket_ids = shared[order], bucket[shared][order]
+        splits = np.flatnonzero(np.diff(bucket_ids)) + 1
+        for group in np.split(members, splits):
+            remaining = group
+            while len(remaining) > 1:
+                anchor = remaining[0]
+                similarity = (unique_sigs[remaining] == unique_sigs[anchor]).mean(axis=1)
+                matched = similarity >= threshold
+                root = _find(parent, int(anchor))
+                for i in remaining[matched]:
+                    other = _find(parent, int(i))
+                    if other != root:
+                        parent[other] = root
+                remaining = remaining[~matched]
+
+    roots = np.array([_find(parent, i) for i in range(n_unique)], dtype=np.int64)
+    component = roots[inverse.ravel()]
+    order = np.argsort(component, kind="stable")
+    splits = np.flatnonzero(np.diff(component[order])) + 1
+    clusters = [
+        rows[group].tolist() for group in np.split(order, splits) if len(group) > 1
+    ]
+    clusters.sort(key=lambda members: (-len(members), members[0]))
+    return clusters
+
+
+# ---------------------------------------------------------------------------
+# Single-pass, mergeable statistics
+# ---------------------------------------------------------------------------
+# Every statistic the checks need is computed once per column: the review
+# column is converted to strings once and yields length aggregates, empties
+# and 64-bit row hashes (duplicates are found on the hashes, not the
+# strings), and the label column yields one value_counts. The check_*
+# functions below are thin formatters over these statistics, so
+# validate_dataset never rescans data.
+#
+# All statistics are mergeable: counts add up, length min/max/sum combine,
+# and distinct row hashes are kept in a KMV sketch (the ``k`` smallest
+# distinct hashes) whose union is again a valid sketch. Statistics of
+# separate shards can therefore be combined with ``merge_statistics`` into
+# exactly what ``compute_statistics`` would return for the whole dataset;
+# only the duplicate count becomes an estimate once a dataset has more than
+# ``k`` distinct reviews. Without a ``k`` (the in-memory default) every
+# distinct hash is kept and the count stays exact.
+
+
+def _null_stats(df: pd.DataFrame) -> Dict[str, Any]:
+    return {"null_counts": {col: int(n) for col, n in df.isna().sum().items()}}
+
+
+def _sketch_full(sketch: np.ndarray, sketch_size: Optional[int]) -> bool:
+    return sketch_size is not None and len(sketch) >= sketch_size
+
+
+def _distinct_count(sketch: np.ndarray, sketch_size: Optional[int]) -> float:
+    """Distinct values summarised by a KMV sketch (exact below its size)."""
+    if not _sketch_full(sketch, sketch_size):
+        return float(len(sketch))
+    kth = float(sketch[sketch_size - 1]) + 1.0
+    return (sketch_size - 1) * 2.0 ** 64 / kth
+
+
+def _finish_duplicates(text_stats: Dict[str, Any]) -> Dict[str, Any]:
+    sketch_size = text_stats["sketch_size"]
+    distinct = _distinct_count(text_stats["sketch"], sketch_size)
+    text_stats["n_duplicates"] = max(0, text_stats["n_hashed"] - int(round(distinct)))
+    text_stats["duplicates_estimated"] = _sketch_full(text_stats["sketch"], sketch_size)
+    return text_stats
+
+
+def _text_stats(
+    values: pd.Series,
+    min_length: int = DEFAULT_MIN_REVIEW_LENGTH,
+    max_length: int = DEFAULT_MAX_REVIEW_LENGTH,
+    sketch_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Length aggregates, empty count and duplicate sketch for the review column."""
+    text = values.astype(str)
+    lengths = text.str.len()
+    empty = (lengths == 0).to_numpy() | text.str.isspace().to_numpy(dtype=bool)
+    hashes = pd.util.hash_pandas_object(values.astype(object), index=False).to_numpy()
+    known = lengths.dropna()
+    return _finish_duplicates({
+        "n_lengths": len(known),
+        "length_min": int(known.min()) if len(known) else None,
+        "length_max": int(known.max()) if len(known) else None,
+        "length_sum": int(known.sum()),
+        "length_bounds": (min_length, max_length),
+        "too_short": int((known < min_length).sum()),
+        "too_long": int((known > max_length).sum()),
+        "n_empty": int(empty.sum()),
+        "n_hashed": len(hashes),
+        "sketch": np.unique(hashes)[:sketch_size],
+        "sketch_size": sketch_size,
+    })
+
+
+def _label_stats(labels: pd.Series) -> Dict[str, Any]:
+    counts = labels.value_counts()
+    return {"label_counts": {k: int(v) for k, v in counts.items()}}
+
+
+def compute_statistics(
+    df: pd.DataFrame,
+    column: str = "Review",
+    label_column: str = "Liked",
+    *,
+    min_length: int = DEFAULT_MIN_REVIEW_LENGTH,
+    max_length: int = DEFAULT_MAX_REVIEW_LENGTH,
+    sketch_size: Optional[int] = None,
+    minhash: bool = False,
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+) -> Dict[str, Any]:
+    """Compute all validation statistics in one pass per column.
+
+    Args:
+        min_length: Reviews shorter than this count as too short.
+        max_length: Reviews longer than this count as too long.
+        sketch_size: Distinct row hashes kept for duplicate counting
+            (None = all, so the count is exact).
+        minhash: Also compute MinHash ``signatures`` for near-duplicate
+            detection (the only statistic that tokenises the text).
+
+    Returns:
+        Dict with ``n_rows``, ``columns``, ``null_counts`` and, when the
+        columns exist, ``text`` (length aggregates, ``n_empty``, duplicate
+        sketch and ``n_duplicates``) and ``labels`` (``label_counts``).
+    """
+    stats: Dict[str, Any] = {"n_rows": len(df), "columns": list(df.columns)}
+    stats.update(_null_stats(df))
+    if column in df.columns:
+        stats["text"] = _text_stats(df[column], min_length, max_length, sketch_size)
+        if minhash:
+            stats["text"]["signatures"] = minhash_signatures(
+                df[column].tolist(), num_perm=num_perm, shingle_size=shingle_size
+            )
+    if label_column in df.columns:
+        stats["labels"] = _label_stats(df[label_column])
+    return stats
+
+
+def _merge_text_stats(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    if a["length_bounds"] != b["length_bounds"] or a["sketch_size"] != b["sketch_size"]:
+        raise ValueError("Cannot merge statistics computed with different settings")
+    known_min = [v for v in (a["length_min"], b["length_min"]) if v is not None]
+    known_max = [v for v in (a["length_max"], b["length_max"]) if v is not None]
+    merged = {
+        "n_lengths": a["n_lengths"] + b["n_lengths"],
+        "length_min": min(known_min) if known_min else None,
+        "length_max": max(known_max) if known_max else None,
+        "length_sum": a["length_sum"] + b["length_sum"],
+        "length_bounds": a["length_bounds"],
+        "too_short": a["too_short"] + b["too_short"],
+        "too_long": a["too_long"] + b["too_long"],
+        "n_empty": a["n_empty"] + b["n_empty"],
+        "n_hashed": a["n_hashed"] + b["n_hashed"],
+        "sketch": np.union1d(a["sketch"], b["sketch"])[:a["sketch_size"]],
+        "sketch_size": a["sketch_size"],
+    }
+    if "signatures" in a and "signatures" in b:
+        merged["signatures"] = np.concatenate([a["signatures"], b["signatures"]])
+    return _finish_duplicates(merged)
+
+
+def merge_statistics(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine statistics of two disjoint parts of a dataset (``a`` first).
+
+    Columns missing from either part are treated as missing overall.
+    MinHash signatures are concatenated, so cluster row positions refer to
+    the rows of ``a`` followed by the rows of ``b``.
+    """
+    columns = [col for col in a["columns"] if col in b["columns"]]
+    merged: Dict[str, Any] = {
+        "n_rows": a["n_rows"] + b["n_rows"],
+        "columns": columns,
+        "null_counts": {
+            col: a["null_counts"][col] + b["null_counts"][col] for col in columns
+        },
+    }
+    if "text" in a and "text" in b:
+        merged["text"] = _merge_text_stats(a["text"], b["text"])
+    if "labels" in a and "labels" in b:
+        counts = dict(a["labels"]["label_counts"])
+        for label, n in b["labels"]["label_counts"].items():
+            counts[label] = counts.get(label, 0) + n
+        merged["labels"] = {"label_counts": counts}
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Checks formatted from statistics
+# ---------------------------------------------------------------------------
+
+
+def _null_values_result(stats: Dict[str, Any]) -> Dict[str, Any]:
     result = {"check": "null_values", "passed": False, "details": ""}
-    null_counts = df.isnull().sum()
-    total_nulls = null_counts.sum()
+    null_counts = stats["null_counts"]
+    total_nulls = sum(null_counts.values())
     if total_nulls > 0:
-        breakdown = {col: int(n) for col, n in null_counts.items() if n > 0}
+        breakdown = {col: n for col, n in null_counts.items() if n > 0}
         result["details"] = f"Found {total_nulls} null(s): {breakdown}"
     else:
         result["passed"] = True
@@ -79,52 +464,47 @@ def check_null_values(df: pd.DataFrame) -> Dict[str, Any]:
     return result
 
 
-def check_duplicates(
-    df: pd.DataFrame,
-    column: str = "Review",
-    threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+def _duplicates_result(
+    text_stats: Optional[Dict[str, Any]], n_rows: int, column: str, threshold: float
 ) -> Dict[str, Any]:
-    """Check for duplicate reviews."""
     result = {"check": "duplicates", "passed": False, "details": ""}
-    if column not in df.columns:
+    if text_stats is None:
         result["details"] = f"Column '{column}' not found for duplicate check"
         return result
 
-    n_dupes = df[column].duplicated().sum()
-    dupe_ratio = n_dupes / len(df) if len(df) > 0 else 0
+    n_dupes = text_stats["n_duplicates"]
+    dupe_ratio = n_dupes / n_rows if n_rows > 0 else 0
+    estimated = " (estimated)" if text_stats["duplicates_estimated"] else ""
 
     if dupe_ratio > threshold:
         result["details"] = (
-            f"High duplicate rate: {n_dupes} duplicates "
+            f"High duplicate rate: {n_dupes} duplicates{estimated} "
             f"({dupe_ratio:.1%}) exceeds threshold ({threshold:.0%})"
         )
     else:
         result["passed"] = True
-        result["details"] = f"{n_dupes} duplicate(s) ({dupe_ratio:.1%})"
+        result["details"] = f"{n_dupes} duplicate(s){estimated} ({dupe_ratio:.1%})"
     return result
 
 
-def check_class_balance(
-    df: pd.DataFrame,
-    label_column: str = "Liked",
-    max_ratio: float = DEFAULT_MAX_IMBALANCE_RATIO,
+def _class_balance_result(
+    label_stats: Optional[Dict[str, Any]], label_column: str, max_ratio: float
 ) -> Dict[str, Any]:
-    """Check class distribution for severe imbalance."""
     result = {"check": "class_balance", "passed": False, "details": ""}
-    if label_column not in df.columns:
+    if label_stats is None:
         result["details"] = f"Label column '{label_column}' not found"
         return result
 
-    counts = df[label_column].value_counts()
+    counts = label_stats["label_counts"]
     if len(counts) < 2:
         result["details"] = f"Only {len(counts)} class(es) found; expected 2"
         return result
 
-    majority = counts.max()
-    minority = counts.min()
+    majority = max(counts.values())
+    minority = min(counts.values())
     ratio = majority / minority if minority > 0 else float("inf")
 
-    distribution = {str(k): int(v) for k, v in counts.items()}
+    distribution = {str(k): v for k, v in counts.items()}
     if ratio > max_ratio:
         result["details"] = (
             f"Imbalanced classes (ratio {ratio:.2f}x): {distribution}"
@@ -137,16 +517,15 @@ def check_class_balance(
     return result
 
 
-def check_label_values(
-    df: pd.DataFrame, label_column: str = "Liked"
+def _label_values_result(
+    label_stats: Optional[Dict[str, Any]], label_column: str
 ) -> Dict[str, Any]:
-    """Ensure labels contain only expected values (0 and 1)."""
     result = {"check": "label_values", "passed": False, "details": ""}
-    if label_column not in df.columns:
+    if label_stats is None:
         result["details"] = f"Label column '{label_column}' not found"
         return result
 
-    unique_vals = set(df[label_column].dropna().unique())
+    unique_vals = set(label_stats["label_counts"])
     expected = {0, 1}
 
     if unique_vals == expected:
@@ -158,28 +537,25 @@ def check_label_values(
     return result
 
 
-def check_review_lengths(
-    df: pd.DataFrame,
-    column: str = "Review",
-    min_length: int = DEFAULT_MIN_REVIEW_LENGTH,
-    max_length: int = DEFAULT_MAX_REVIEW_LENGTH,
+def _review_lengths_result(
+    text_stats: Optional[Dict[str, Any]], column: str
 ) -> Dict[str, Any]:
-    """Check for extremely short or long reviews."""
     result = {"check": "review_lengths", "passed": False, "details": ""}
-    if column not in df.columns:
+    if text_stats is None:
         result["details"] = f"Column '{column}' not found"
         return result
 
-    lengths = df[column].astype(str).str.len()
-    too_short = (lengths < min_length).sum()
-    too_long = (lengths > max_length).sum()
+    min_length, max_length = text_stats["length_bounds"]
+    too_short = text_stats["too_short"]
+    too_long = text_stats["too_long"]
+    n_lengths = text_stats["n_lengths"]
 
     stats = {
-        "min": int(lengths.min()),
-        "max": int(lengths.max()),
-        "mean": round(float(lengths.mean()), 1),
-        "too_short": int(too_short),
-        "too_long": int(too_long),
+        "min": text_stats["length_min"],
+        "max": text_stats["length_max"],
+        "mean": round(text_stats["length_sum"] / n_lengths, 1) if n_lengths else 0.0,
+        "too_short": too_short,
+        "too_long": too_long,
     }
 
     if too_short > 0 or too_long > 0:
@@ -194,18 +570,15 @@ def check_review_lengths(
     return result
 
 
-def check_empty_reviews(
-    df: pd.DataFrame, column: str = "Review"
+def _empty_reviews_result(
+    text_stats: Optional[Dict[str, Any]], column: str
 ) -> Dict[str, Any]:
-    """Check for empty or whitespace-only reviews."""
     result = {"check": "empty_reviews", "passed": False, "details": ""}
-    if column not in df.columns:
+    if text_stats is None:
         result["details"] = f"Column '{column}' not found"
         return result
 
-    empty_mask = df[column].astype(str).str.strip().eq("")
-    n_empty = empty_mask.sum()
-
+    n_empty = text_stats["n_empty"]
     if n_empty > 0:
         result["details"] = f"Found {n_empty} empty/whitespace-only review(s)"
     else:
@@ -214,17 +587,200 @@ def check_empty_reviews(
     return result
 
 
+def _near_duplicates_result(
+    signatures: Optional[np.ndarray],
+    n_rows: int,
+    column: str,
+    threshold: float,
+    bands: int,
+    max_ratio: float,
+) -> Dict[str, Any]:
+    result = {"check": "near_duplicates", "passed": False, "details": "", "clusters": []}
+    if signatures is None:
+        result["details"] = f"Column '{column}' not found for near-duplicate check"
+        return result
+
+    clusters = lsh_clusters(signatures, threshold=threshold, bands=bands)
+    # Every cluster keeps one representative; the rest are redundant rows
+    n_near = sum(len(members) - 1 for members in clusters)
+    near_ratio = n_near / n_rows if n_rows > 0 else 0
+    result["clusters"] = clusters
+
+    summary = (
+        f"{n_near} near-duplicate(s) ({near_ratio:.1%}) in {len(clusters)} "
+        f"cluster(s) at similarity >= {threshold:.2f}"
+    )
+    if near_ratio > max_ratio:
+        result["details"] = (
+            f"High near-duplicate rate: {summary} exceeds threshold ({max_ratio:.0%})"
+        )
+    else:
+        result["passed"] = True
+        result["details"] = summary
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Standalone checks (each computes only the statistics it needs)
+# ---------------------------------------------------------------------------
+
+
+def check_null_values(df: pd.DataFrame) -> Dict[str, Any]:
+    """Check for null/NaN values in the dataset."""
+    return _null_values_result(_null_stats(df))
+
+
+def check_duplicates(
+    df: pd.DataFrame,
+    column: str = "Review",
+    threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+) -> Dict[str, Any]:
+    """Check for duplicate reviews."""
+    text_stats = _text_stats(df[column]) if column in df.columns else None
+    return _duplicates_result(text_stats, len(df), column, threshold)
+
+
+def check_class_balance(
+    df: pd.DataFrame,
+    label_column: str = "Liked",
+    max_ratio: float = DEFAULT_MAX_IMBALANCE_RATIO,
+) -> Dict[str, Any]:
+    """Check class distribution for severe imbalance."""
+    label_stats = _label_stats(df[label_column]) if label_column in df.columns else None
+    return _class_balance_result(label_stats, label_column, max_ratio)
+
+
+def check_label_values(
+    df: pd.DataFrame, label_column: str = "Liked"
+) -> Dict[str, Any]:
+    """Ensure labels contain only expected values (0 and 1)."""
+    label_stats = _label_stats(df[label_column]) if label_column in df.columns else None
+    return _label_values_result(label_stats, label_column)
+
+
+def check_review_lengths(
+    df: pd.DataFrame,
+    column: str = "Review",
+    min_length: int = DEFAULT_MIN_REVIEW_LENGTH,
+    max_length: int = DEFAULT_MAX_REVIEW_LENGTH,
+) -> Dict[str, Any]:
+    """Check for extremely short or long reviews."""
+    text_stats = (
+        _text_stats(df[column], min_length, max_length) if column in df.columns else None
+    )
+    return _review_lengths_result(text_stats, column)
+
+
+def check_empty_reviews(
+    df: pd.DataFrame, column: str = "Review"
+) -> Dict[str, Any]:
+    """Check for empty or whitespace-only reviews."""
+    text_stats = _text_stats(df[column]) if column in df.columns else None
+    return _empty_reviews_result(text_stats, column)
+
+
+def check_near_duplicates(
+    df: pd.DataFrame,
+    column: str = "Review",
+    threshold: float = DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+    *,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int = DEFAULT_LSH_BANDS,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    max_ratio: float = DEFAULT_DUPLICATE_THRESHOLD,
+) -> Dict[str, Any]:
+    """Find clusters of near-identical reviews with MinHash + LSH.
+
+    ``result["clusters"]`` lists the row positions of each cluster.
+    """
+    signatures = None
+    if column in df.columns:
+        signatures = minhash_signatures(
+            df[column].tolist(), num_perm=num_perm, shingle_size=shingle_size
+        )
+    return _near_duplicates_result(signatures, len(df), column, threshold, bands, max_ratio)
+
+
+def run_checks(
+    stats: Dict[str, Any],
+    *,
+    required_columns: Optional[set] = None,
+    max_imbalance_ratio: float = DEFAULT_MAX_IMBALANCE_RATIO,
+    column: str = "Review",
+    label_column: str = "Liked",
+    near_duplicate_threshold: float = DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+    lsh_bands: int = DEFAULT_LSH_BANDS,
+) -> List[Dict[str, Any]]:
+    """Build every check result from ``compute_statistics`` output.
+
+    The near-duplicate check runs when the statistics carry signatures.
+    """
+    text_stats = stats.get("text")
+    label_stats = stats.get("labels")
+    checks = [
+        _required_columns_result(stats["columns"], required_columns),
+        _null_values_result(stats),
+        _duplicates_result(text_stats, stats["n_rows"], column, DEFAULT_DUPLICATE_THRESHOLD),
+        _class_balance_result(label_stats, label_column, max_imbalance_ratio),
+        _label_values_result(label_stats, label_column),
+        _review_lengths_result(text_stats, column),
+        _empty_reviews_result(text_stats, column),
+    ]
+    if text_stats is not None and "signatures" in text_stats:
+        checks.append(_near_duplicates_result(
+            text_stats["signatures"], stats["n_rows"], column,
+            near_duplicate_threshold, lsh_bands, DEFAULT_DUPLICATE_THRESHOLD,
+        ))
+    return checks
+
+
 # ---------------------------------------------------------------------------
 # Main validation orchestrator
 # ---------------------------------------------------------------------------
 
 
+def new_report() -> Dict[str, Any]:
+    """Empty report in the shape returned by ``validate_dataset``."""
+    return {
+        "is_valid": True,
+        "checks": [],
+        "errors": [],
+        "warnings": [],
+        "summary": {},
+    }
+
+
+def finish_report(report: Dict[str, Any], stats: Dict[str, Any], **check_kwargs) -> Dict[str, Any]:
+    """Add the dataset summary and every check built from ``stats``.
+
+    ``check_kwargs`` are forwarded to ``run_checks``.
+    """
+    report["summary"]["total_rows"] = stats["n_rows"]
+    report["summary"]["total_columns"] = len(stats["columns"])
+    report["summary"]["columns"] = list(stats["columns"])
+
+    for check in run_checks(stats, **check_kwargs):
+        report["checks"].append(check)
+        if not check["passed"]:
+            # Distinguish errors (critical) from warnings (non-critical)
+            if check["check"] in ("required_columns", "label_values"):
+                report["is_valid"] = False
+                report["errors"].append(check["details"])
+            else:
+                report["warnings"].append(check["details"])
+    return report
+
+
 def validate_dataset(
     filepath: str,
     *,
     required_columns: Optional[set] = None,
     delimiter: str = "\t",
     max_imbalance_ratio: float = DEFAULT_MAX_IMBALANCE_RATIO,
+    near_duplicates: bool = False,
+    near_duplicate_threshold: float = DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    lsh_bands: int = DEFAULT_LSH_BANDS,
     verbose: bool = True,
 ) -> Dict[str, Any]:
     """Run all validation checks on the dataset file.
@@ -234,18 +790,17 @@ def validate_dataset(
         required_columns: Set of column names that must be present.
         delimiter: Column delimiter (default: tab for TSV).
         max_imbalance_ratio: Maximum allowed majority/minority class ratio.
+        near_duplicates: Also run the MinHash/LSH near-duplicate check
+            (keeps a signature per row and costs far more than the rest).
+        near_duplicate_threshold: Minimum estimated Jaccard similarity.
+        num_perm: MinHash signature length.
+        lsh_bands: Number of LSH bands (must divide ``num_perm``).
         verbose: Whether to print a formatted report.
 
     Returns:
         Dictionary with "is_valid", "checks" list, "errors" list, and "warnings".
     """
-    report: Dict[str, Any] = {
-        "is_valid": True,
-        "checks": [],
-        "errors": [],
-        "warnings": [],
-        "summary": {},
-    }
+    report = new_report()
 
     # --- File existence ---
     file_check = check_file_exists(filepath)
@@ -271,30 +826,16 @@ def validate_dataset(
             _print_report(report)
         return report
 
-    report["summary"]["total_rows"] = len(df)
-    report["summary"]["total_columns"] = len(df.columns)
-    report["summary"]["columns"] = list(df.columns)
-
-    # --- Run all checks ---
-    checks = [
-        check_required_columns(df, required_columns),
-        check_null_values(df),
-        check_duplicates(df),
-        check_class_balance(df, max_ratio=max_imbalance_ratio),
-        check_label_values(df),
-        check_review_lengths(df),
-        check_empty_reviews(df),
-    ]
-
-    for check in checks:
-        report["checks"].append(check)
-        if not check["passed"]:
-            # Distinguish errors (critical) from warnings (non-critical)
-            if check["check"] in ("required_columns", "label_values"):
-                report["is_valid"] = False
-                report["errors"].append(check["details"])
-            else:
-                report["warnings"].append(check["details"])
+    # --- Run all checks from one set of statistics ---
+    stats = compute_statistics(df, minhash=near_duplicates, num_perm=num_perm)
+    finish_report(
+        report,
+        stats,
+        required_columns=required_columns,
+        max_imbalance_ratio=max_imbalance_ratio,
+        near_duplicate_threshold=near_duplicate_threshold,
+        lsh_bands=lsh_bands,
+    )
 
     if verbose:
         _print_report(report)
@@ -309,6 +850,7 @@ def validate_dataset(
 _PASS = "[PASS]"
 _FAIL = "[FAIL]"
 _WARN = "[WARN]"
+_MAX_CLUSTERS_SHOWN = 10
 
 
 def _print_report(report: Dict[str, Any]) -> None:
@@ -327,6 +869,8 @@ def _print_report(report: Dict[str, Any]) -> None:
     for check in report["checks"]:
         status = _PASS if check["passed"] else _FAIL
         print(f"  {status}  {check['check']}: {check['details']}")
+        for members in check.get("clusters", [])[:_MAX_CLUSTERS_SHOWN]:
+            print(f"           rows {members}")
 
     print()
     if report["is_valid"]:
@@ -351,12 +895,28 @@ def _print_report(report: Dict[str, Any]) -> None:
 
 if __name__ == "__main__":
     import sys
+    import argparse
 
     script_dir = os.path.dirname(os.path.abspath(__file__))
     default_path = os.path.join(script_dir, "Restaurant_Reviews.tsv")
-    filepath = sys.argv[1] if len(sys.argv) > 1 else default_path
 
-    report = validate_dataset(filepath)
+    parser = argparse.ArgumentParser(description="Validate the reviews dataset.")
+    parser.add_argument("filepath", nargs="?", default=default_path)
+    parser.add_argument("--near-duplicate-threshold", type=float,
+                        default=DEFAULT_NEAR_DUPLICATE_THRESHOLD)
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM)
+    parser.add_argument("--lsh-bands", type=int, default=DEFAULT_LSH_BANDS)
+    parser.add_argument("--near-duplicates", action="store_true",
+                        help="Also run the MinHash/LSH near-duplicate check")
+    args = parser.parse_args()
+
+    report = validate_dataset(
+        args.filepath,
+        near_duplicates=args.near_duplicates,
+        near_duplicate_threshold=args.near_duplicate_threshold,
+        num_perm=args.num_perm,
+        lsh_bands=args.lsh_bands,
+    )
 
     # Exit with non-zero status if validation failed
     sys.exit(0 if report["is_valid"] else 1)
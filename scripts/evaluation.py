@@ -0,0 +1,181 @@
+"""
+evaluation.py - Fit-Once Model Evaluation
+==========================================
+Cross-validated reports used to call ``cross_val_score`` once per metric,
+refitting the pipeline on every fold for each of them. Here each fold is
+fitted exactly once; its test predictions and positive-class
+probabilities are cached, and every metric is derived from that cache:
+
+    - confusion matrix (one ``np.bincount``), and from it accuracy,
+      weighted F1 and per-class precision/recall/F1/support
+    - ROC-AUC from the cached probabilities
+    - per-fold values plus mean/std/min/max across folds, and the same
+      metrics on the pooled out-of-fold predictions
+
+``compute_metrics`` also serves single hold-out evaluations (training
+script), so both reports share one implementation.
+
+Usage:
+    from evaluation import CrossValidationReport, compute_metrics
+
+    report = CrossValidationReport.run(pipeline, corpus, y, cv=5)
+    report.summary()["f1_weighted"]["mean"]
+    report.pooled_metrics()["confusion_matrix"]
+
+    metrics = compute_metrics(y_test, y_pred, y_proba)
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import check_cv
+
+# Metrics summarised across folds
+FOLD_METRICS = ("accuracy", "f1_weighted", "roc_auc")
+
+
+def confusion_counts(y_true, y_pred, labels: Sequence) -> np.ndarray:
+    """Confusion matrix (rows = true, columns = predicted) in one bincount."""
+    labels = np.asarray(labels)
+    k = len(labels)
+    true_idx = np.searchsorted(labels, y_true)
+    pred_idx = np.searchsorted(labels, y_pred)
+    return np.bincount(true_idx * k + pred_idx, minlength=k * k).reshape(k, k)
+
+
+def compute_metrics(
+    y_true,
+    y_pred,
+    y_score: Optional[np.ndarray] = None,
+    *,
+    labels: Sequence = (0, 1),
+) -> Dict[str, Any]:
+    """Every evaluation metric from one set of predictions.
+
+    Args:
+        y_true: True labels.
+        y_pred: Predicted labels.
+        y_score: Positive-class probabilities (enables ROC-AUC).
+        labels: Sorted class labels; the last one is the positive class.
+
+    Returns:
+        Dict with ``accuracy``, ``f1_weighted``, ``roc_auc`` (NaN when
+        undefined), ``confusion_matrix`` (nested lists), ``per_class`` and
+        ``n_samples``. Values match the corresponding sklearn metrics.
+    """
+    y_true = np.asarray(y_true)
+    cm = confusion_counts(y_true, np.asarray(y_pred), labels)
+    tp = np.diag(cm).astype(np.float64)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    n = int(cm.sum())
+
+    def ratio(num, den):
+        return np.divide(num, den, out=np.zeros(len(num)), where=den > 0)
+
+    precision = ratio(tp, predicted)
+    recall = ratio(tp, support)
+    f1 = ratio(2 * tp, support + predicted)
+
+    roc_auc = float("nan")
+    if y_score is not None and len(np.unique(y_true)) == 2:
+        roc_auc = float(roc_auc_score(y_true, y_score))
+
+    return {
+        "n_samples": n,
+        "accuracy": float(tp.sum() / n) if n else 0.0,
+        "f1_weighted": float((f1 * support).sum() / n) if n else 0.0,
+        "roc_auc": roc_auc,
+        "confusion_matrix": cm.tolist(),
+        "per_class": {
+            str(label): {
+                "precision": float(precision[i]),
+                "recall": float(recall[i]),
+                "f1": float(f1[i]),
+                "support": int(support[i]),
+            }
+            for i, label in enumerate(labels)
+        },
+    }
+
+
+def _take(X, idx: np.ndarray):
+    if isinstance(X, list):
+        return [X[i] for i in idx]
+    return X[idx]
+
+
+class CrossValidationReport:
+    """Cached out-of-fold predictions of one fit per fold.
+
+    Args:
+        folds: One dict per fold with ``test_idx``, ``y_true``, ``y_pred``
+            and ``y_score`` arrays.
+        labels: Sorted class labels.
+    """
+
+    def __init__(self, folds: List[Dict[str, np.ndarray]], labels: Sequence = (0, 1)):
+        self.folds = folds
+        self.labels = tuple(labels)
+        self._fold_metrics: Optional[List[Dict[str, Any]]] = None
+
+    @classmethod
+    def run(cls, estimator, X, y, cv=5) -> "CrossValidationReport":
+        """Fit a clone of ``estimator`` once per fold and cache its predictions.
+
+        Args:
+            estimator: Unfitted or fitted classifier/pipeline with
+                ``predict_proba`` (it is cloned, never modified).
+            X: Samples (list of texts, array or sparse matrix).
+            y: Labels.
+            cv: Number of stratified folds or a CV splitter.
+        """
+        y = np.asarray(y)
+        labels = np.unique(y)
+        cv = check_cv(cv, y, classifier=True)
+        folds = []
+        for train_idx, test_idx in cv.split(np.zeros(len(y)), y):
+            model = clone(estimator).fit(_take(X, train_idx), y[train_idx])
+            X_test = _take(X, test_idx)
+            positive = list(model.classes_).index(labels[-1])
+            folds.append({
+                "test_idx": test_idx,
+                "y_true": y[test_idx],
+                "y_pred": model.predict(X_test),
+                "y_score": model.predict_proba(X_test)[:, positive],
+            })
+        return cls(folds, labels)
+
+    def fold_metrics(self) -> List[Dict[str, Any]]:
+        """Metrics of each fold (computed once, then cached)."""
+        if self._fold_metrics is None:
+            self._fold_metrics = [
+                compute_metrics(f["y_true"], f["y_pred"], f["y_score"], labels=self.labels)
+                for f in self.folds
+            ]
+        return self._fold_metrics
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-fold values and mean/std/min/max for each of ``FOLD_METRICS``."""
+        summary = {}
+        for name in FOLD_METRICS:
+            values = np.array([m[name] for m in self.fold_metrics()])
+            summary[name] = {
+                "folds": values.tolist(),
+                "mean": float(np.mean(values)),
+                "std": float(np.std(values)),
+                "min": float(np.min(values)),
+                "max": float(np.max(values)),
+            }
+        return summary
+
+    def pooled_metrics(self) -> Dict[str, Any]:
+        """Metrics over all out-of-fold predictions together."""
+        return compute_metrics(
+            np.concatenate([f["y_true"] for f in self.folds]),
+            np.concatenate([f["y_pred"] for f in self.folds]),
+            np.concatenate([f["y_score"] for f in self.folds]),
+            labels=self.labels,
+        )
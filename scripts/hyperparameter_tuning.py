@@ -1,42 +1,45 @@
 """
 hyperparameter_tuning.py - Model Optimisation Script
 =====================================================
-Uses GridSearchCV and cross-validation to find optimal hyperparameters
-for the Multinomial Naive Bayes sentiment classifier.
+Uses cross-validation to find optimal hyperparameters for the
+Multinomial Naive Bayes sentiment classifier. The search runs on
+NaiveBayesSearchCV (see nb_search.py), which caches TF-IDF features per
+fold and scores all alpha values in closed form instead of refitting the
+pipeline for every combination. Tasks run on a process pool over a
+memory-mapped copy of the corpus, and every finished task is written to
+a checkpoint so an interrupted search resumes where it stopped (see
+parallel_search.py).
 
 Usage:
     python hyperparameter_tuning.py
+    python hyperparameter_tuning.py --halving       # successive halving
+    python hyperparameter_tuning.py --n-jobs 4 --save   # unattended
 
 The script will:
     1. Load and preprocess the dataset
-    2. Run GridSearchCV over alpha values and max_features
+    2. Search over alpha values and max_features
     3. Report cross-validation results
-    4. Optionally save the best model
+    4. Optionally save the best model (``--save``/``--no-save``; asks
+       only when run interactively)
 """
 
 import os
-import pickle
+import sys
 import logging
+import argparse
+from typing import Optional
 
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.model_selection import (
-    GridSearchCV,
-    StratifiedKFold,
-    cross_val_score,
-)
-from sklearn.pipeline import Pipeline
-from sklearn.metrics import (
-    classification_report,
-    confusion_matrix,
-    make_scorer,
-    f1_score,
-    roc_auc_score,
-)
-
-from preprocess import preprocess_corpus
+from sklearn.model_selection import StratifiedKFold
+
+from corpus_cache import load_corpus
+from compiled_scorer import CompiledScorer
+from evaluation import CrossValidationReport
+from model_artefact import MODELS_DIR, save_artefact
+from nb_search import NaiveBayesSearchCV
+from parallel_search import ParallelNaiveBayesSearchCV
+from preprocess import applied_clean_kwargs
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
@@ -46,8 +49,7 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATASET_PATH = os.path.join(SCRIPT_DIR, "Restaurant_Reviews.tsv")
-MODEL_PATH = os.path.join(SCRIPT_DIR, "restaurant-sentiment-mnb-model.pkl")
-VECTORIZER_PATH = os.path.join(SCRIPT_DIR, "cv-transform.pkl")
+CHECKPOINT_PATH = os.path.join(SCRIPT_DIR, "tuning-checkpoint.jsonl")
 
 # Hyperparameter search space
 PARAM_GRID = {
@@ -75,66 +77,77 @@ def load_and_preprocess() -> tuple:
     print(f"       Positive: {(df['Liked'] == 1).sum()} | "
           f"Negative: {(df['Liked'] == 0).sum()}")
 
-    corpus = preprocess_corpus(df["Review"])
-    y = df["Liked"].values
+    # Cleaned corpora are cached on disk, keyed by dataset + options
+    corpus, y = load_corpus(DATASET_PATH)
 
     print(f"[OK] Preprocessing complete ({len(corpus)} reviews)")
     return corpus, y, df
 
 
-def run_grid_search(corpus: list, y: np.ndarray) -> GridSearchCV:
-    """Run GridSearchCV to find optimal hyperparameters.
+def run_grid_search(
+    corpus: list,
+    y: np.ndarray,
+    *,
+    halving: bool = False,
+    n_jobs: Optional[int] = None,
+    checkpoint: Optional[str] = None,
+    replace_stale_checkpoint: bool = False,
+) -> NaiveBayesSearchCV:
+    """Search alpha and max_features with fold-cached cross-validation.
 
     Args:
         corpus: List of preprocessed review strings.
         y: Binary label array.
+        halving: Use successive halving over folds for larger grids.
+        n_jobs: Worker processes (``None`` = all cores, 1 = in-process).
+        checkpoint: JSONL file to record and resume finished tasks.
+        replace_stale_checkpoint: Start afresh, with a warning, when the
+            checkpoint is from a different search instead of raising.
 
     Returns:
-        Fitted GridSearchCV object.
+        Fitted NaiveBayesSearchCV object (GridSearchCV-compatible results).
     """
     print("\n" + "-" * 70)
     print("GRID SEARCH WITH CROSS-VALIDATION")
     print("-" * 70)
     print(f"  Folds: {CV_FOLDS}")
     print(f"  Scoring: F1 (weighted)")
+    print(f"  Strategy: {'successive halving' if halving else 'exhaustive'}")
+    print(f"  Workers: {n_jobs or os.cpu_count()}")
+    if checkpoint:
+        print(f"  Checkpoint: {checkpoint}")
     print(f"  Parameter grid:")
     for k, v in PARAM_GRID.items():
         print(f"    {k}: {v}")
 
-    # Build sklearn pipeline
-    pipeline = Pipeline([
-        ("tfidf", TfidfVectorizer()),
-        ("clf", MultinomialNB()),
-    ])
-
     # Stratified K-Fold ensures class balance in each fold
     cv = StratifiedKFold(n_splits=CV_FOLDS, shuffle=True, random_state=RANDOM_STATE)
 
-    scorer = make_scorer(f1_score, average="weighted")
-
-    grid_search = GridSearchCV(
-        pipeline,
-        PARAM_GRID,
-        cv=cv,
-        scoring=scorer,
-        n_jobs=-1,  # Use all CPU cores
-        verbose=1,
-        return_train_score=True,
+    grid_search = ParallelNaiveBayesSearchCV(
+        PARAM_GRID, cv=cv, halving=halving, n_jobs=n_jobs, checkpoint=checkpoint,
+        replace_stale_checkpoint=replace_stale_checkpoint,
     )
 
-    print("\n  Running search (this may take a moment)...\n")
+    print("\n  Running search...\n")
     grid_search.fit(corpus, y)
+    if grid_search.resumed_tasks_:
+        print(f"  Resumed {grid_search.resumed_tasks_} finished task(s) from the checkpoint")
 
     return grid_search
 
 
-def report_results(grid_search: GridSearchCV, corpus: list, y: np.ndarray) -> None:
-    """Print detailed results from GridSearchCV.
+def report_results(
+    grid_search: NaiveBayesSearchCV, corpus: list, y: np.ndarray
+) -> CrossValidationReport:
+    """Print detailed results from the hyperparameter search.
 
     Args:
-        grid_search: Fitted GridSearchCV object.
+        grid_search: Fitted search object.
         corpus: Preprocessed review strings.
         y: Labels.
+
+    Returns:
+        Cross-validated evaluation of the best pipeline.
     """
     print("\n" + "-" * 70)
     print("GRID SEARCH RESULTS")
@@ -166,47 +179,66 @@ def report_results(grid_search: GridSearchCV, corpus: list, y: np.ndarray) -> No
             f"{row['std_test_score']:.4f}"
         )
 
-    # Cross-validation scores for the best model
+    # Cross-validation scores for the best model: one fit per fold, every
+    # metric computed from the cached predictions
     print("\n" + "-" * 70)
     print("CROSS-VALIDATION DETAIL (BEST MODEL)")
     print("-" * 70)
 
     best_pipeline = grid_search.best_estimator_
     cv = StratifiedKFold(n_splits=CV_FOLDS, shuffle=True, random_state=RANDOM_STATE)
+    evaluation = CrossValidationReport.run(best_pipeline, corpus, y, cv=cv)
+    summary = evaluation.summary()
 
-    # Multiple metrics
-    for metric_name, scorer_fn in [
-        ("F1 (weighted)", make_scorer(f1_score, average="weighted")),
+    for metric_name, key in [
+        ("F1 (weighted)", "f1_weighted"),
         ("Accuracy", "accuracy"),
+        ("ROC-AUC", "roc_auc"),
     ]:
-        scores = cross_val_score(best_pipeline, corpus, y, cv=cv, scoring=scorer_fn)
+        stats = summary[key]
         print(f"\n  {metric_name}:")
-        for i, s in enumerate(scores, 1):
+        for i, s in enumerate(stats["folds"], 1):
             print(f"    Fold {i}: {s:.4f}")
-        print(f"    Mean:   {scores.mean():.4f} (+/- {scores.std() * 2:.4f})")
+        print(f"    Mean:   {stats['mean']:.4f} (+/- {stats['std'] * 2:.4f})")
+
+    cm = evaluation.pooled_metrics()["confusion_matrix"]
+    print("\n  Confusion Matrix (all folds):")
+    print(f"    TN={cm[0][0]:>4d}  FP={cm[0][1]:>4d}")
+    print(f"    FN={cm[1][0]:>4d}  TP={cm[1][1]:>4d}")
+    return evaluation
 
 
-def save_best_model(grid_search: GridSearchCV) -> None:
-    """Save the best model and vectoriser from GridSearchCV.
+def save_best_model(
+    grid_search: NaiveBayesSearchCV,
+    evaluation: Optional[CrossValidationReport] = None,
+) -> None:
+    """Save the best model and vectoriser from the hyperparameter search.
 
     Args:
-        grid_search: Fitted GridSearchCV object.
+        grid_search: Fitted search object.
+        evaluation: Cross-validated metrics recorded in the artefact metadata.
     """
     print("\n" + "-" * 70)
     print("SAVING BEST MODEL")
     print("-" * 70)
 
     best = grid_search.best_estimator_
-    vectoriser = best.named_steps["tfidf"]
-    classifier = best.named_steps["clf"]
-
-    with open(VECTORIZER_PATH, "wb") as f:
-        pickle.dump(vectoriser, f)
-    print(f"  [OK] Vectoriser saved -> {VECTORIZER_PATH}")
-
-    with open(MODEL_PATH, "wb") as f:
-        pickle.dump(classifier, f)
-    print(f"  [OK] Classifier saved -> {MODEL_PATH}")
+    scorer = CompiledScorer.from_sklearn(
+        best.named_steps["tfidf"], best.named_steps["clf"]
+    )
+    metadata = {
+        "source": "hyperparameter_tuning",
+        "preprocess": applied_clean_kwargs(),
+        "params": grid_search.best_params_,
+        "cv_f1_weighted": round(grid_search.best_score_, 4),
+        "cv_folds": CV_FOLDS,
+    }
+    if evaluation is not None:
+        summary = evaluation.summary()
+        metadata["cv_accuracy"] = round(summary["accuracy"]["mean"], 4)
+        metadata["cv_roc_auc"] = round(summary["roc_auc"]["mean"], 4)
+    path = save_artefact(MODELS_DIR, scorer, metadata=metadata)
+    print(f"  [OK] Model artefact saved -> {path}")
 
 
 # ---------------------------------------------------------------------------
@@ -214,15 +246,38 @@ def save_best_model(grid_search: GridSearchCV) -> None:
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune the TF-IDF + MNB model.")
+    parser.add_argument("--halving", action="store_true", help="Use successive halving")
+    parser.add_argument("--n-jobs", type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Task checkpoint to resume from ('' disables; default "
+                             "tuning-checkpoint.jsonl, replaced when the search changes)")
+    save_group = parser.add_mutually_exclusive_group()
+    save_group.add_argument("--save", dest="save", action="store_true", default=None,
+                            help="Save the best model without asking")
+    save_group.add_argument("--no-save", dest="save", action="store_false",
+                            help="Do not save the best model")
+    args = parser.parse_args()
+
     corpus, y, df = load_and_preprocess()
-    grid = run_grid_search(corpus, y)
-    report_results(grid, corpus, y)
-
-    # Ask before overwriting existing model files
-    print()
-    answer = input("Save the best model? This will overwrite existing .pkl files [y/N]: ")
-    if answer.strip().lower() in ("y", "yes"):
-        save_best_model(grid)
+    # Only an explicit --checkpoint is precious enough to stop on a mismatch
+    default_checkpoint = args.checkpoint is None
+    grid = run_grid_search(
+        corpus, y, halving=args.halving, n_jobs=args.n_jobs,
+        checkpoint=CHECKPOINT_PATH if default_checkpoint else args.checkpoint or None,
+        replace_stale_checkpoint=default_checkpoint,
+    )
+    evaluation = report_results(grid, corpus, y)
+
+    # Only prompt when a person is there to answer
+    save = args.save
+    if save is None and sys.stdin.isatty():
+        print()
+        answer = input("Save the best model as a new artefact version? [y/N]: ")
+        save = answer.strip().lower() in ("y", "yes")
+    if save:
+        save_best_model(grid, evaluation)
     else:
         print("  Model NOT saved.")
 
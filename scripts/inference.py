@@ -0,0 +1,230 @@
+"""
+inference.py - Sentiment Inference Backends
+============================================
+Common prediction interface shared by the API (main.py) and offline
+tools. Every backend exposes:
+
+    backend.name                      short identifier
+    backend.predict(texts)            -> [(label, confidence), ...]
+
+where ``label`` is 1 (positive) / 0 (negative) and ``confidence`` is the
+probability of the predicted label in [0, 1]. Backends accept raw review
+text and apply their own preprocessing/truncation.
+
+``predict`` is ``postprocess(forward(tokenize(texts)))``: the three stages
+are separate methods so profiles (see request_profiling.py) show where a
+request's time goes.
+
+Available backends:
+    TransformerBackend   DistilBERT (SST-2); the tokenizer and model of a
+                         ``transformers.pipeline``, called stage by stage
+    CompiledBackend      TF-IDF (or hashed) + MultinomialNB artefact (NumPy only)
+    FastTextBackend      hashed n-gram embedding-bag artefact (NumPy only)
+
+``backend_from_artefact`` picks the backend matching an artefact's
+``model_type``.
+
+Usage:
+    from inference import backend_from_artefact
+
+    backend = backend_from_artefact("models/20260101_120000")
+    backend.predict(["The pasta was wonderful"])  # [(1, 0.93)]
+"""
+
+import inspect
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from compiled_scorer import CompiledScorer, HashedScorer
+from fasttext_model import FastTextModel
+from model_artefact import load_artefact, read_manifest
+from preprocess import check_lemmatizer, clean_text
+
+logger = logging.getLogger(__name__)
+
+Prediction = Tuple[int, float]
+
+DISTILBERT_MODEL = "distilbert/distilbert-base-uncased-finetuned-sst-2-english"
+
+# Representative inputs used to warm a backend before it takes traffic
+WARMUP_TEXTS = [
+    "The food was absolutely delicious and the service was outstanding!",
+    "Terrible experience. Cold food, rude staff, waited 2 hours.",
+]
+
+
+class TransformerBackend:
+    """DistilBERT sentiment pipeline on CPU.
+
+    Args:
+        model_name: Hugging Face model id.
+        device: ``-1`` for CPU (keeps free-tier containers within memory).
+        max_chars: Input truncation applied before tokenisation.
+        max_batch_size: Texts padded into one forward pass.
+    """
+
+    name = "distilbert"
+
+    def __init__(
+        self,
+        model_name: str = DISTILBERT_MODEL,
+        *,
+        device: int = -1,
+        max_chars: int = 512,
+        max_batch_size: int = 32,
+        pipeline_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        from transformers import pipeline
+
+        self.model_name = model_name
+        self.max_chars = max_chars
+        self.max_batch_size = max_batch_size
+        self.pipeline = pipeline(
+            "sentiment-analysis",
+            model=model_name,
+            device=device,
+            **(pipeline_kwargs or {}),
+        )
+        self._forward_args = set(inspect.signature(self.pipeline.model.forward).parameters)
+
+    def tokenize(self, texts: Sequence[str]):
+        """Padded token id tensors for one batch.
+
+        Same encoding as the pipeline; ``truncation`` only matters for
+        inputs over the model's 512 tokens, which the pipeline rejects.
+        """
+        return self.pipeline.tokenizer(
+            [text[: self.max_chars] for text in texts],
+            padding=True,
+            truncation=True,
+            return_tensors="pt",
+        )
+
+    def forward(self, inputs):
+        """Class logits for one batch."""
+        import torch
+
+        # Like the pipeline, pass only what the model's forward() accepts
+        inputs = {key: value for key, value in inputs.items() if key in self._forward_args}
+        with torch.inference_mode():
+            return self.pipeline.model(**inputs).logits
+
+    def postprocess(self, logits) -> List[Prediction]:
+        scores, indices = logits.float().softmax(dim=-1).max(dim=-1)
+        id2label = self.pipeline.model.config.id2label
+        return [
+            (1 if id2label[index] == "POSITIVE" else 0, score)
+            for score, index in zip(scores.tolist(), indices.tolist())
+        ]
+
+    def predict(self, texts: Sequence[str]) -> List[Prediction]:
+        # One padded forward pass per batch instead of one per text
+        predictions: List[Prediction] = []
+        for start in range(0, len(texts), self.max_batch_size):
+            batch = texts[start:start + self.max_batch_size]
+            predictions.extend(self.postprocess(self.forward(self.tokenize(batch))))
+        return predictions
+
+
+class CompiledBackend:
+    """TF-IDF + MultinomialNB scored by ``CompiledScorer``.
+
+    Args:
+        scorer: Compiled model.
+        clean_kwargs: ``clean_text`` options used when the model was trained.
+        name: Identifier reported by the API (e.g. the artefact version).
+    """
+
+    def __init__(
+        self,
+        scorer: CompiledScorer,
+        clean_kwargs: Optional[Dict[str, Any]] = None,
+        name: str = "mnb",
+    ):
+        self.scorer = scorer
+        self.clean_kwargs = dict(clean_kwargs or {})
+        self.name = name
+        self._positive = list(scorer.classes.tolist()).index(1)
+
+    @classmethod
+    def from_artefact(cls, path: str, *, verify: bool = True) -> "CompiledBackend":
+        """Load a versioned artefact directory (see model_artefact.py).
+
+        Raises:
+            RuntimeError: The artefact was trained with lemmatisation and
+                WordNet is not available here.
+        """
+        manifest = read_manifest(path)
+        clean_kwargs = manifest["metadata"].get("preprocess")
+        check_lemmatizer(clean_kwargs)
+        return cls(
+            load_artefact(path, verify=verify),
+            clean_kwargs=clean_kwargs,
+            name=f"mnb:{manifest['version']}",
+        )
+
+    def tokenize(self, texts: Sequence[str]) -> List[List[int]]:
+        cleaned = [clean_text(text, **self.clean_kwargs) for text in texts]
+        return self.scorer.tokenize(cleaned)
+
+    def forward(self, token_ids: List[List[int]]):
+        return self.scorer.predict_proba_tokens(token_ids)[:, self._positive]
+
+    def postprocess(self, proba_positive) -> List[Prediction]:
+        return _label_confidence(proba_positive)
+
+    def predict(self, texts: Sequence[str]) -> List[Prediction]:
+        return self.postprocess(self.forward(self.tokenize(texts)))
+
+
+def _label_confidence(proba_positive) -> List[Prediction]:
+    return [
+        (1, float(p)) if p > 0.5 else (0, float(1.0 - p))
+        for p in proba_positive
+    ]
+
+
+class FastTextBackend:
+    """Hashed word/char n-gram embedding bag scored by ``FastTextModel``.
+
+    Takes raw review text: the model does its own tokenisation.
+
+    Args:
+        model: Trained model.
+        name: Identifier reported by the API (e.g. the artefact version).
+    """
+
+    def __init__(self, model: FastTextModel, name: str = "fasttext"):
+        self.model = model
+        self.name = name
+        self._positive = list(model.classes.tolist()).index(1)
+
+    @classmethod
+    def from_artefact(cls, path: str, *, verify: bool = True) -> "FastTextBackend":
+        manifest = read_manifest(path)
+        return cls(load_artefact(path, verify=verify), name=f"fasttext:{manifest['version']}")
+
+    def tokenize(self, texts: Sequence[str]):
+        return self.model.bag(texts)
+
+    def forward(self, bag):
+        return self.model.predict_proba_bag(*bag)[:, self._positive]
+
+    def postprocess(self, proba_positive) -> List[Prediction]:
+        return _label_confidence(proba_positive)
+
+    def predict(self, texts: Sequence[str]) -> List[Prediction]:
+        return self.postprocess(self.forward(self.tokenize(texts)))
+
+
+_ARTEFACT_BACKENDS = {
+    CompiledScorer.model_type: CompiledBackend,
+    HashedScorer.model_type: CompiledBackend,
+    FastTextModel.model_type: FastTextBackend,
+}
+
+
+def backend_from_artefact(path: str, *, verify: bool = True):
+    """Backend for an artefact directory, chosen by its ``model_type``."""
+    backend_class = _ARTEFACT_BACKENDS[read_manifest(path)["model_type"]]
+    return backend_class.from_artefact(path, verify=verify)
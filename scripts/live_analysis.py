@@ -0,0 +1,126 @@
+"""
+live_analysis.py - Debounced Live Analysis over a WebSocket
+============================================================
+Sentiment that updates while the user types, at a cost of a few
+inferences per session rather than one per keystroke.
+
+Each connection gets a ``LiveAnalysisSession``:
+
+    - ``update(revision, text)`` only records the latest revision and wakes
+      the session's worker; older revisions that were never scored are
+      simply superseded (no inference is spent on them).
+    - The worker waits until updates pause for ``debounce`` seconds (or
+      ``max_delay`` has passed since the first unscored update, so
+      continuous typing still gets periodic results), then scores the
+      latest text in the threadpool.
+    - At most one inference per session is in flight. If a newer revision
+      arrives while it runs, the now-stale result is discarded and the
+      newer text is scored next. Only results for the latest revision are
+      sent back.
+    - An optional ``throttle`` (e.g. a per-client budget shared by all of
+      that client's sessions) is asked before every inference. While it
+      says to wait, nothing is scored; newer revisions keep superseding
+      the pending one, and the latest is scored once the budget allows.
+
+Usage:
+    session = LiveAnalysisSession(score_text, websocket.send_json)
+    worker = asyncio.create_task(session.run())
+    session.update(3, "The pasta was gre")
+"""
+
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE = 0.3   # seconds of quiet before scoring
+DEFAULT_MAX_DELAY = 1.5  # longest an update waits while typing continues
+
+
+class LiveAnalysisSession:
+    """Debounces text revisions and scores only the newest one.
+
+    Args:
+        score: Blocking ``text -> result dict`` (run in the threadpool).
+        send: Coroutine delivering a result dict to the client.
+        debounce: Quiet period before scoring.
+        max_delay: Upper bound on how long an update waits for quiet.
+        throttle: Called before each inference; returns the seconds to wait
+            before asking again, or 0 to score now (and spend the budget).
+    """
+
+    def __init__(
+        self,
+        score: Callable[[str], Dict[str, Any]],
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+        *,
+        debounce: float = DEFAULT_DEBOUNCE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        throttle: Optional[Callable[[], float]] = None,
+    ):
+        self.score = score
+        self.send = send
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.throttle = throttle
+        self._latest: Optional[Tuple[int, str]] = None
+        self._pending_since: Optional[float] = None
+        self._wakeup = asyncio.Event()
+        self.stats = {
+            "updates": 0, "inferences": 0, "superseded": 0, "stale_results": 0, "throttled": 0,
+        }
+
+    def update(self, revision: int, text: str) -> None:
+        """Record a new revision (older unscored ones are superseded)."""
+        if self._latest is not None and revision <= self._latest[0]:
+            return  # out-of-order or duplicate revision
+        self.stats["updates"] += 1
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        else:
+            self.stats["superseded"] += 1
+        self._latest = (revision, text)
+        self._wakeup.set()
+
+    async def _settle(self) -> None:
+        """Return once updates pause for ``debounce`` or ``max_delay`` passes."""
+        while True:
+            self._wakeup.clear()
+            remaining = self._pending_since + self.max_delay - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), min(self.debounce, remaining))
+            except asyncio.TimeoutError:
+                return
+
+    async def run(self) -> None:
+        """Worker loop; cancel the task to end the session."""
+        while True:
+            await self._wakeup.wait()
+            await self._settle()
+            while self.throttle is not None:
+                wait = self.throttle()
+                if wait <= 0:
+                    break
+                self.stats["throttled"] += 1
+                await asyncio.sleep(wait)
+            # Updates that arrived while throttled are covered by this inference
+            self._wakeup.clear()
+            revision, text = self._latest
+            self._pending_since = None
+            self.stats["inferences"] += 1
+            try:
+                result = await run_in_threadpool(self.score, text)
+            except Exception as exc:
+                logger.warning("Live analysis of revision %d failed: %s", revision, exc)
+                result = {"error": str(exc) or "Analysis failed."}
+            if self._latest[0] != revision:
+                # A newer revision arrived meanwhile; it is already queued
+                self.stats["stale_results"] += 1
+                continue
+            await self.send({"revision": revision, **result})
@@ -0,0 +1,159 @@
+"""
+memory_profile.py - Low-Memory Serving Profile
+===============================================
+Measures and bounds the server's resident memory on small instances
+(e.g. the Render free plan).
+
+    - ``rss_bytes``            current resident set size (/proc, else peak)
+    - ``cap_torch_threads``    fixed intra-/inter-op pools (every torch
+                               thread keeps its own scratch buffers)
+    - ``limit_malloc_arenas``  glibc ``M_ARENA_MAX``: fewer per-thread heaps
+                               that each hold on to freed memory
+    - ``malloc_trim``          hand freed heap pages back to the OS
+    - ``transformer_low_memory_kwargs``
+                               DistilBERT weights in bfloat16, loaded from
+                               memory-mapped safetensors
+    - ``BurstTrimmer``         trims once traffic has been idle for a while,
+                               so memory grown by a burst is returned
+
+The allocator helpers use glibc through ctypes and are no-ops elsewhere.
+
+Usage:
+    from memory_profile import BurstTrimmer, rss_bytes
+
+    before = rss_bytes()
+    ...load the model...
+    trimmer = BurstTrimmer(idle_seconds=5)
+    trimmer.start()
+    trimmer.note_activity()   # once per request
+"""
+
+import os
+import time
+import ctypes
+import ctypes.util
+import inspect
+import logging
+import resource
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_M_ARENA_MAX = -8  # mallopt() parameter from <malloc.h>
+MIB = 1024 * 1024
+
+
+def _libc() -> Optional[ctypes.CDLL]:
+    name = ctypes.util.find_library("c")
+    if name is None:
+        return None
+    try:
+        libc = ctypes.CDLL(name)
+    except OSError:
+        return None
+    return libc if hasattr(libc, "malloc_trim") else None  # glibc only
+
+
+_LIBC = _libc()
+
+
+def rss_bytes() -> int:
+    """Current resident set size; falls back to the peak where /proc is missing."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def rss_mb() -> float:
+    return round(rss_bytes() / MIB, 1)
+
+
+def malloc_trim() -> bool:
+    """Release free heap memory to the OS; False when unsupported."""
+    if _LIBC is None:
+        return False
+    return bool(_LIBC.malloc_trim(0))
+
+
+def limit_malloc_arenas(arenas: int) -> bool:
+    """Cap glibc malloc arenas for threads created from now on."""
+    if _LIBC is None:
+        return False
+    return bool(_LIBC.mallopt(_M_ARENA_MAX, int(arenas)))
+
+
+def cap_torch_threads(intra_op: int, inter_op: int) -> Dict[str, int]:
+    """Fix torch's thread pools; call before the first forward pass.
+
+    The inter-op pool can only be sized once per process, so a later call
+    keeps the existing value.
+    """
+    import torch
+
+    if intra_op > 0:
+        torch.set_num_threads(intra_op)
+    if inter_op > 0:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError:
+            logger.warning(
+                "torch inter-op threads already fixed at %d", torch.get_num_interop_threads()
+            )
+    return {"intra_op": torch.get_num_threads(), "inter_op": torch.get_num_interop_threads()}
+
+
+def transformer_low_memory_kwargs() -> Dict[str, Any]:
+    """``pipeline()`` options for bfloat16 weights from mmapped safetensors."""
+    import torch
+    from transformers import pipeline
+
+    # transformers 5 renamed ``torch_dtype`` to ``dtype``
+    dtype_key = "dtype" if "dtype" in inspect.signature(pipeline).parameters else "torch_dtype"
+    return {dtype_key: torch.bfloat16, "model_kwargs": {"use_safetensors": True}}
+
+
+class BurstTrimmer:
+    """Calls ``malloc_trim`` after traffic has been idle for ``idle_seconds``.
+
+    Args:
+        idle_seconds: Quiet period after the last request before trimming.
+        check_interval: How often the background thread looks.
+    """
+
+    def __init__(self, idle_seconds: float = 5.0, check_interval: float = 1.0):
+        self.idle_seconds = idle_seconds
+        self.check_interval = check_interval
+        self._last_activity = 0.0
+        self._dirty = False
+        self._thread: Optional[threading.Thread] = None
+        self.stats: Dict[str, Any] = {"trims": 0, "released_mb": 0.0}
+
+    def note_activity(self) -> None:
+        self._last_activity = time.monotonic()
+        self._dirty = True
+
+    def trim_if_idle(self) -> bool:
+        """Trim once per burst, after it has gone quiet."""
+        if not self._dirty or time.monotonic() - self._last_activity < self.idle_seconds:
+            return False
+        self._dirty = False
+        before = rss_bytes()
+        malloc_trim()
+        self.stats["trims"] += 1
+        released = max(0, before - rss_bytes()) / MIB
+        self.stats["released_mb"] = round(self.stats["released_mb"] + released, 1)
+        return True
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.check_interval)
+            self.trim_if_idle()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="malloc-trim", daemon=True)
+            self._thread.start()
@@ -0,0 +1,189 @@
+"""
+model_artefact.py - Versioned, Memory-Mappable Model Artefacts
+===============================================================
+Replaces the pickled ``TfidfVectorizer`` / ``MultinomialNB`` files with a
+directory holding a JSON manifest and one raw ``.npy`` file per array of
+the compiled model (see compiled_scorer.py):
+
+    models/20260101_120000/
+        manifest.json           format version, metadata, per-array sha256
+        terms.npy
+        idf.npy
+        feature_log_prob.npy
+        class_log_prior.npy
+        classes.npy
+
+Arrays are opened with ``np.load(mmap_mode="r")``, so every worker process
+maps the same page-cache copy instead of unpickling a private one, and
+loading never executes code from the file. Only NumPy is required.
+
+The manifest's ``model_type`` selects the model class: ``tfidf-mnb``
+(``CompiledScorer``), ``hashed-mnb`` (``HashedScorer``, exported by
+online_training.py) or ``fasttext`` (``FastTextModel``, see
+fasttext_model.py).
+
+Usage:
+    from model_artefact import save_artefact, load_artefact
+
+    path = save_artefact(MODELS_DIR, scorer, metadata={"f1": 0.78})
+    scorer = load_artefact(path)              # memory-mapped
+    scorer = load_artefact(path, verify=True) # also check hashes
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from compiled_scorer import CompiledScorer, HashedScorer
+from fasttext_model import FastTextModel
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "models")
+
+ARTEFACT_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+MODEL_TYPE = "tfidf-mnb"
+
+# model_type -> class rebuilt from ``config`` and the arrays
+MODEL_CLASSES = {
+    MODEL_TYPE: CompiledScorer,
+    HashedScorer.model_type: HashedScorer,
+    FastTextModel.model_type: FastTextModel,
+}
+
+Model = Union[CompiledScorer, HashedScorer, FastTextModel]
+
+
+class ArtefactError(ValueError):
+    """Raised when an artefact is missing, corrupt or of an unknown version."""
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def new_version_name() -> str:
+    """Timestamped version name, following the models/README.md convention."""
+    return datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+
+
+def save_artefact(
+    models_dir: str,
+    scorer: Model,
+    *,
+    version: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Write ``scorer`` as a new versioned artefact under ``models_dir``.
+
+    The directory is assembled under a temporary name and renamed into
+    place, so readers never observe a half-written artefact.
+
+    Returns:
+        Path of the new artefact directory.
+    """
+    version = version or new_version_name()
+    final_path = os.path.join(models_dir, version)
+    if os.path.exists(final_path):
+        raise ArtefactError(f"Artefact version already exists: {final_path}")
+    os.makedirs(models_dir, exist_ok=True)
+
+    tmp_path = tempfile.mkdtemp(prefix=f".{version}-", dir=models_dir)
+    try:
+        arrays = {}
+        for name, array in scorer.arrays().items():
+            filename = f"{name}.npy"
+            file_path = os.path.join(tmp_path, filename)
+            np.save(file_path, np.ascontiguousarray(array), allow_pickle=False)
+            arrays[name] = {
+                "file": filename,
+                "dtype": str(array.dtype),
+                "shape": list(array.shape),
+                "sha256": _sha256(file_path),
+            }
+
+        manifest = {
+            "format_version": ARTEFACT_FORMAT_VERSION,
+            "model_type": scorer.model_type,
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "config": scorer.config,
+            "metadata": metadata or {},
+            "arrays": arrays,
+        }
+        with open(os.path.join(tmp_path, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+        os.rename(tmp_path, final_path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    return final_path
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """Read and validate an artefact manifest."""
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.isfile(manifest_path):
+        raise ArtefactError(f"No manifest found in {path}")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != ARTEFACT_FORMAT_VERSION:
+        raise ArtefactError(
+            f"Unsupported artefact format {manifest.get('format_version')!r} in {path}"
+        )
+    if manifest.get("model_type") not in MODEL_CLASSES:
+        raise ArtefactError(f"Unsupported model type {manifest.get('model_type')!r}")
+    return manifest
+
+
+def load_artefact(path: str, *, mmap: bool = True, verify: bool = False) -> Model:
+    """Open an artefact directory as its model class (see ``MODEL_CLASSES``).
+
+    Args:
+        path: Artefact directory written by ``save_artefact``.
+        mmap: Memory-map the arrays read-only (shared across processes).
+        verify: Check every array file against its manifest hash first.
+
+    Raises:
+        ArtefactError: If the manifest is missing/invalid or a hash mismatches.
+    """
+    manifest = read_manifest(path)
+    arrays = {}
+    for name, spec in manifest["arrays"].items():
+        file_path = os.path.join(path, spec["file"])
+        if verify and _sha256(file_path) != spec["sha256"]:
+            raise ArtefactError(f"Hash mismatch for {file_path}")
+        array = np.load(file_path, mmap_mode="r" if mmap else None, allow_pickle=False)
+        if list(array.shape) != spec["shape"] or str(array.dtype) != spec["dtype"]:
+            raise ArtefactError(f"Array {name} does not match its manifest entry")
+        # Plain ndarray view over the mapping: no copy, no memmap overhead
+        arrays[name] = np.asarray(array)
+    model_class = MODEL_CLASSES[manifest["model_type"]]
+    return model_class(config=manifest["config"], **arrays)
+
+
+def latest_artefact(models_dir: str = MODELS_DIR) -> Optional[str]:
+    """Return the newest artefact directory under ``models_dir``, if any."""
+    if not os.path.isdir(models_dir):
+        return None
+    versions = sorted(
+        name
+        for name in os.listdir(models_dir)
+        if not name.startswith(".")
+        and os.path.isfile(os.path.join(models_dir, name, MANIFEST_NAME))
+    )
+    return os.path.join(models_dir, versions[-1]) if versions else None
@@ -0,0 +1,276 @@
+"""
+model_registry.py - Local Model Registry and Zero-Downtime Hot-Swap
+====================================================================
+Ships new model versions without rebuilding or restarting the API.
+
+``ModelRegistry`` is a directory of versioned artefacts (see
+model_artefact.py) plus an ``ACTIVE`` pointer file naming the version that
+should serve traffic. Without a pointer the newest version is used. A
+registry may be restricted to some manifest ``model_type`` values (say
+``tfidf-mnb`` and ``hashed-mnb``); artefacts of other types are then
+invisible to it.
+
+``HotSwapModel`` holds the serving backend. Activating a version loads and
+warms it *beside* the current one, then replaces a single reference:
+
+    - requests read ``model.current`` once and keep that backend for their
+      whole lifetime, so in-flight requests finish on the old model;
+    - new requests see the new model as soon as the reference is swapped;
+    - the previous backend stays resident, so ``rollback()`` is instant.
+
+A background watcher polls the registry and activates whatever the
+``ACTIVE`` pointer names, which is how activations made through one worker
+propagate to every worker process. It never follows the newest-version
+fallback, so artefacts written later (tuning runs, online-training
+exports) only serve once someone activates them.
+
+Usage:
+    from model_registry import HotSwapModel, ModelRegistry
+
+    model = HotSwapModel(ModelRegistry("models"))
+    model.load()                    # pointer or newest version
+    backend = model.current         # use for one request
+    model.activate("20260201_120000")
+    model.rollback()
+    model.start_watcher(interval=10)
+"""
+
+import os
+import logging
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from inference import WARMUP_TEXTS, backend_from_artefact
+from model_artefact import MANIFEST_NAME, MODELS_DIR, read_manifest
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_POINTER = "ACTIVE"
+
+
+class ModelRegistry:
+    """Versioned artefacts under ``models_dir`` with an ``ACTIVE`` pointer.
+
+    Args:
+        models_dir: Directory holding ``<version>/manifest.json`` artefacts.
+        loader: Callable turning an artefact path into a backend.
+        model_types: Only serve artefacts with one of these manifest
+            ``model_type`` values (None = any).
+    """
+
+    def __init__(
+        self,
+        models_dir: str = MODELS_DIR,
+        loader: Callable[[str], Any] = backend_from_artefact,
+        model_types: Optional[Sequence[str]] = None,
+    ):
+        self.models_dir = models_dir
+        self.loader = loader
+        self.model_types = tuple(model_types) if model_types is not None else None
+
+    def path(self, version: str) -> str:
+        return os.path.join(self.models_dir, version)
+
+    def _all_versions(self) -> List[str]:
+        if not os.path.isdir(self.models_dir):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.models_dir)
+            if not name.startswith(".")
+            and os.path.isfile(os.path.join(self.models_dir, name, MANIFEST_NAME))
+        )
+
+    def versions(self) -> List[str]:
+        """Complete artefact versions of the registry's type, oldest first."""
+        versions = self._all_versions()
+        if self.model_types is None:
+            return versions
+        return [
+            v for v in versions if read_manifest(self.path(v))["model_type"] in self.model_types
+        ]
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Version names with their manifest metadata."""
+        described = []
+        for version in self.versions():
+            manifest = read_manifest(self.path(version))
+            described.append({
+                "version": version,
+                "created_at": manifest.get("created_at"),
+                "metadata": manifest.get("metadata", {}),
+            })
+        return described
+
+    def pinned_version(self) -> Optional[str]:
+        """Version named by the ``ACTIVE`` pointer, if any."""
+        pointer = os.path.join(self.models_dir, ACTIVE_POINTER)
+        try:
+            with open(pointer, encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def active_version(self) -> Optional[str]:
+        """Pinned version, falling back to the newest one."""
+        pinned = self.pinned_version()
+        if pinned:
+            return pinned
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def set_active(self, version: str) -> None:
+        """Atomically point ``ACTIVE`` at ``version``."""
+        if version not in self.versions():
+            raise KeyError(f"Unknown model version: {version}")
+        fd, tmp_path = tempfile.mkstemp(dir=self.models_dir, prefix=".ACTIVE-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(version + "\n")
+        os.replace(tmp_path, os.path.join(self.models_dir, ACTIVE_POINTER))
+
+    def load(self, version: str) -> Any:
+        if version not in self.versions():
+            if version in self._all_versions():
+                other = read_manifest(self.path(version))["model_type"]
+                wanted = " or ".join(self.model_types)
+                raise KeyError(f"Model version {version} is a {other} artefact, not {wanted}")
+            raise KeyError(f"Unknown model version: {version}")
+        return self.loader(self.path(version))
+
+
+class StaticModel:
+    """A fixed backend exposing the same reading interface as HotSwapModel."""
+
+    def __init__(self, backend: Any, version: Optional[str] = None):
+        self._backend = backend
+        self.version = version or backend.name
+        self.previous_version = None
+
+    @property
+    def current(self) -> Any:
+        return self._backend
+
+
+class HotSwapModel:
+    """Double-buffered serving slot for registry versions.
+
+    Args:
+        registry: Source of versions.
+        warmup_texts: Inputs scored on a new backend before it takes traffic.
+    """
+
+    def __init__(self, registry: ModelRegistry, warmup_texts: Sequence[str] = WARMUP_TEXTS):
+        self.registry = registry
+        self.warmup_texts = list(warmup_texts)
+        # (version, backend) tuples; reassigning the attribute is atomic
+        self._active: Optional[Tuple[str, Any]] = None
+        self._previous: Optional[Tuple[str, Any]] = None
+        self._swap_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    # -- reading ---------------------------------------------------------------
+
+    @property
+    def current(self) -> Any:
+        """Backend serving new requests. Read it once per request."""
+        active = self._active
+        if active is None:
+            raise RuntimeError("No model version is loaded.")
+        return active[1]
+
+    @property
+    def version(self) -> Optional[str]:
+        active = self._active
+        return active[0] if active else None
+
+    @property
+    def previous_version(self) -> Optional[str]:
+        previous = self._previous
+        return previous[0] if previous else None
+
+    # -- switching ---------------------------------------------------------------
+
+    def _prepare(self, version: str) -> Any:
+        """Load and warm a version without touching the serving slot."""
+        backend = self.registry.load(version)
+        if self.warmup_texts:
+            backend.predict(self.warmup_texts)
+        return backend
+
+    def load(self, version: Optional[str] = None) -> str:
+        """Load the initial version (pointer or newest when omitted)."""
+        version = version or self.registry.active_version()
+        if version is None:
+            raise RuntimeError(f"No model artefacts found in {self.registry.models_dir}")
+        return self.activate(version, persist=False)
+
+    def activate(self, version: str, *, persist: bool = True) -> str:
+        """Load, warm and atomically switch to ``version``.
+
+        If loading or warm-up fails the current model keeps serving and the
+        error propagates.
+
+        Args:
+            version: Registry version to serve.
+            persist: Also move the ``ACTIVE`` pointer so other workers follow.
+        """
+        with self._swap_lock:
+            if self._active is not None and self._active[0] == version:
+                if persist:
+                    self.registry.set_active(version)
+                return version
+            backend = self._prepare(version)
+            self._previous, self._active = self._active, (version, backend)
+            if persist:
+                self.registry.set_active(version)
+        logger.info("Model version %s is now serving (previous: %s)",
+                    version, self.previous_version)
+        return version
+
+    def rollback(self, *, persist: bool = True) -> str:
+        """Swap back to the previously served version (kept in memory)."""
+        with self._swap_lock:
+            if self._previous is None:
+                raise RuntimeError("No previous model version to roll back to.")
+            self._previous, self._active = self._active, self._previous
+            version = self._active[0]
+            if persist:
+                self.registry.set_active(version)
+        logger.info("Rolled back to model version %s", version)
+        return version
+
+    # -- watching ----------------------------------------------------------------
+
+    def sync(self) -> Optional[str]:
+        """Activate the version the ``ACTIVE`` pointer names if it differs from ours."""
+        target = self.registry.pinned_version()
+        if target is None or target == self.version:
+            return None
+        if self.previous_version == target:
+            return self.rollback(persist=False)
+        return self.activate(target, persist=False)
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop_watching.wait(interval):
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Model watcher failed to sync; keeping %s", self.version)
+
+    def start_watcher(self, interval: float) -> None:
+        """Poll the registry every ``interval`` seconds in a daemon thread."""
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="model-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        if self._watcher is not None:
+            self._stop_watching.set()
+            self._watcher.join()
+            self._watcher = None
@@ -0,0 +1,318 @@
+"""
+nb_search.py - Fold-Cached Search Engine for TF-IDF + Naive Bayes
+==================================================================
+``GridSearchCV`` refits the whole ``TfidfVectorizer -> MultinomialNB``
+pipeline for every (fold, max_features, alpha) combination, although the
+smoothing parameter only enters MultinomialNB's closed-form estimate:
+
+    feature_log_prob = log(fc + alpha) - log(sum(fc + alpha))
+
+where ``fc`` are the per-class feature sums. This engine therefore counts
+each fold's training text once, builds the TF-IDF matrix and class sums
+once per (fold, max_features), and scores every alpha with a single
+vectorised NumPy pass. Scores are identical to the equivalent
+``GridSearchCV`` run.
+
+For larger grids, ``halving=True`` runs successive halving over folds:
+all candidates are scored on the first fold(s), the best ``1/factor``
+survive to be scored on more folds, until the survivors see every fold.
+
+Usage:
+    from nb_search import NaiveBayesSearchCV
+
+    search = NaiveBayesSearchCV(PARAM_GRID, cv=5).fit(corpus, y)
+    print(search.best_params_, search.best_score_)
+    search.best_estimator_  # refitted sklearn Pipeline
+"""
+
+import logging
+import math
+from itertools import product
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import (
+    CountVectorizer,
+    TfidfTransformer,
+    TfidfVectorizer,
+)
+from sklearn.model_selection import check_cv
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from sparse_features import term_frequency_order, top_k_columns
+
+logger = logging.getLogger(__name__)
+
+MAX_FEATURES_PARAM = "tfidf__max_features"
+ALPHA_PARAM = "clf__alpha"
+
+
+# ---------------------------------------------------------------------------
+# Closed-form scoring
+# ---------------------------------------------------------------------------
+
+
+def weighted_f1(y_true: np.ndarray, y_pred: np.ndarray, classes: np.ndarray) -> np.ndarray:
+    """Weighted F1 for several prediction vectors at once.
+
+    Matches ``f1_score(y_true, row, average="weighted")`` for every row of
+    ``y_pred`` (shape ``(n_candidates, n_samples)``), with undefined
+    per-class scores counted as 0.
+    """
+    scores = np.zeros(y_pred.shape[0])
+    for cls in classes:
+        is_true = y_true == cls
+        support = is_true.sum()
+        if support == 0:
+            continue
+        is_pred = y_pred == cls
+        tp = (is_pred & is_true).sum(axis=1)
+        fp = is_pred.sum(axis=1) - tp
+        fn = support - tp
+        denom = 2 * tp + fp + fn
+        f1 = np.divide(2 * tp, denom, out=np.zeros(len(tp)), where=denom > 0)
+        scores += f1 * support
+    return scores / len(y_true)
+
+
+def predict_for_alphas(
+    feature_counts: np.ndarray,
+    class_counts: np.ndarray,
+    X,
+    alphas: np.ndarray,
+    classes: np.ndarray,
+) -> np.ndarray:
+    """Predict ``X`` under MultinomialNB for every smoothing value at once.
+
+    Args:
+        feature_counts: Per-class feature sums, shape ``(n_classes, n_features)``.
+        class_counts: Training samples per class.
+        X: Sparse or dense TF-IDF matrix to predict.
+        alphas: Smoothing values to evaluate.
+        classes: Class labels in ``feature_counts`` row order.
+
+    Returns:
+        Predicted labels, shape ``(len(alphas), n_samples)``.
+    """
+    n_classes, n_features = feature_counts.shape
+    alphas = np.asarray(alphas, dtype=np.float64).reshape(-1, 1, 1)
+    smoothed = feature_counts[np.newaxis] + alphas
+    log_prob = np.log(smoothed) - np.log(smoothed.sum(axis=2, keepdims=True))
+    with np.errstate(divide="ignore"):
+        log_prior = np.log(class_counts) - np.log(class_counts.sum())
+
+    jll = X @ log_prob.reshape(-1, n_features).T
+    jll = np.asarray(jll).reshape(X.shape[0], len(alphas), n_classes) + log_prior
+    return classes[jll.argmax(axis=2)].T
+
+
+def fold_features(
+    train_counts,
+    test_counts,
+    order: np.ndarray,
+    y_train: np.ndarray,
+    classes: np.ndarray,
+    max_features: Optional[int],
+) -> Tuple:
+    """TF-IDF features of one fold restricted to ``max_features`` terms.
+
+    Args:
+        train_counts: Fold training counts over the fold's own vocabulary.
+        test_counts: Fold test counts over the same columns.
+        order: ``term_frequency_order(train_counts)``.
+        y_train: Training labels.
+        classes: Class labels.
+        max_features: Vocabulary size, or None for all terms.
+
+    Returns:
+        ``(feature_counts, class_counts, X_test)`` for ``predict_for_alphas``.
+    """
+    cols = top_k_columns(train_counts, max_features, order)
+    transformer = TfidfTransformer().fit(train_counts[:, cols])
+    X_train = transformer.transform(train_counts[:, cols])
+    X_test = transformer.transform(test_counts[:, cols])
+
+    onehot = (y_train[:, np.newaxis] == classes).astype(np.float64)
+    feature_counts = np.asarray(X_train.T @ onehot).T
+    return feature_counts, onehot.sum(axis=0), X_test
+
+
+# ---------------------------------------------------------------------------
+# Search engine
+# ---------------------------------------------------------------------------
+
+
+class NaiveBayesSearchCV:
+    """Cross-validated search over ``max_features`` x ``alpha``.
+
+    Exposes the same result attributes as ``GridSearchCV`` (``cv_results_``,
+    ``best_params_``, ``best_score_``, ``best_estimator_``) so reporting code
+    can use either.
+
+    Args:
+        param_grid: Dict with ``tfidf__max_features`` and ``clf__alpha`` lists.
+        cv: Number of stratified folds or a CV splitter.
+        halving: Use successive halving over folds instead of the full grid.
+        factor: Fraction of candidates kept per halving round is ``1/factor``.
+        min_folds: Folds used in the first halving round.
+        refit: Fit ``best_estimator_`` on the full data after the search.
+    """
+
+    def __init__(
+        self,
+        param_grid: Dict[str, List[Any]],
+        *,
+        cv=5,
+        halving: bool = False,
+        factor: int = 3,
+        min_folds: int = 1,
+        refit: bool = True,
+    ):
+        unknown = set(param_grid) - {MAX_FEATURES_PARAM, ALPHA_PARAM}
+        if unknown:
+            raise ValueError(f"Unsupported parameters for NaiveBayesSearchCV: {unknown}")
+        if factor < 2:
+            raise ValueError("factor must be at least 2")
+        self.param_grid = param_grid
+        self.cv = cv
+        self.halving = halving
+        self.factor = factor
+        self.min_folds = min_folds
+        self.refit = refit
+
+    # -- fold caches ---------------------------------------------------------
+
+    def _fold_counts(self, fold: int) -> Tuple:
+        """Count one fold's train/test text once (cached)."""
+        if fold not in self._counts_cache:
+            train_idx, test_idx = self._splits[fold]
+            counter = CountVectorizer()
+            train_counts = counter.fit_transform([self._corpus[i] for i in train_idx]).tocsr()
+            test_counts = counter.transform([self._corpus[i] for i in test_idx]).tocsr()
+            self._counts_cache[fold] = (
+                train_counts,
+                test_counts,
+                term_frequency_order(train_counts),
+            )
+        return self._counts_cache[fold]
+
+    def _fold_features(self, fold: int, max_features: Optional[int]) -> Tuple:
+        """TF-IDF test matrix and class sums for one (fold, max_features)."""
+        key = (fold, max_features)
+        if key not in self._features_cache:
+            train_counts, test_counts, order = self._fold_counts(fold)
+            y_train = self._y[self._splits[fold][0]]
+            self._features_cache[key] = fold_features(
+                train_counts, test_counts, order, y_train, self.classes_, max_features
+            )
+        return self._features_cache[key]
+
+    def _score(self, candidates: List[Tuple], folds: range) -> None:
+        """Score candidates on the given folds, batching alphas per feature set."""
+        for fold in folds:
+            y_test = self._y[self._splits[fold][1]]
+            by_features: Dict[Any, List[Tuple]] = {}
+            for cand in candidates:
+                if fold not in self._scores[cand]:
+                    by_features.setdefault(cand[0], []).append(cand)
+            for max_features, group in by_features.items():
+                feature_counts, class_counts, X_test = self._fold_features(fold, max_features)
+                alphas = np.array([alpha for _, alpha in group])
+                preds = predict_for_alphas(
+                    feature_counts, class_counts, X_test, alphas, self.classes_
+                )
+                for cand, score in zip(group, weighted_f1(y_test, preds, self.classes_)):
+                    self._scores[cand][fold] = float(score)
+
+    # -- public API ------------------------------------------------------------
+
+    def fit(self, corpus: List[str], y) -> "NaiveBayesSearchCV":
+        """Run the search on preprocessed ``corpus`` and labels ``y``."""
+        self._corpus = list(corpus)
+        self._y = np.asarray(y)
+        self.classes_ = np.unique(self._y)
+        cv = check_cv(self.cv, self._y, classifier=True)
+        self._splits = list(cv.split(self._corpus, self._y))
+        self.n_splits_ = len(self._splits)
+        self._counts_cache: Dict[int, Tuple] = {}
+        self._features_cache: Dict[Tuple, Tuple] = {}
+
+        grid = [
+            (max_features, alpha)
+            for max_features, alpha in product(
+                self.param_grid.get(MAX_FEATURES_PARAM, [None]),
+                self.param_grid.get(ALPHA_PARAM, [1.0]),
+            )
+        ]
+        self._scores: Dict[Tuple, Dict[int, float]] = {cand: {} for cand in grid}
+
+        self._run_search(grid)
+        self._build_results(grid)
+
+        if self.refit:
+            self.best_estimator_ = Pipeline([
+                ("tfidf", TfidfVectorizer(max_features=self.best_params_[MAX_FEATURES_PARAM])),
+                ("clf", MultinomialNB(alpha=self.best_params_[ALPHA_PARAM])),
+            ]).fit(self._corpus, self._y)
+
+        # Drop the caches; they can be large and are not needed after fitting
+        del self._counts_cache, self._features_cache, self._corpus
+        return self
+
+    def _run_search(self, grid: List[Tuple]) -> None:
+        """Fill ``self._scores`` for the grid (exhaustive or halving)."""
+        if self.halving:
+            survivors = grid
+            n_folds = min(self.min_folds, self.n_splits_)
+            while True:
+                self._score(survivors, range(n_folds))
+                if n_folds >= self.n_splits_:
+                    break
+                survivors = sorted(survivors, key=self._mean_score, reverse=True)
+                survivors = survivors[: max(1, math.ceil(len(survivors) / self.factor))]
+                n_folds = min(n_folds * self.factor, self.n_splits_)
+                logger.info(
+                    "Halving: %d candidate(s) advance to %d fold(s)", len(survivors), n_folds
+                )
+        else:
+            self._score(grid, range(self.n_splits_))
+
+    def _mean_score(self, cand: Tuple) -> float:
+        return float(np.mean(list(self._scores[cand].values())))
+
+    def _build_results(self, grid: List[Tuple]) -> None:
+        """Populate GridSearchCV-style ``cv_results_`` and best_* attributes."""
+        split_scores = np.full((len(grid), self.n_splits_), np.nan)
+        for i, cand in enumerate(grid):
+            for fold, score in self._scores[cand].items():
+                split_scores[i, fold] = score
+
+        n_folds = (~np.isnan(split_scores)).sum(axis=1)
+        mean = np.nanmean(split_scores, axis=1)
+        std = np.nanstd(split_scores, axis=1)
+
+        # Candidates that survived more halving rounds rank first
+        order = np.lexsort((-mean, -n_folds))
+        rank = np.empty(len(grid), dtype=np.int32)
+        rank[order] = np.arange(1, len(grid) + 1)
+
+        self.cv_results_ = {
+            "params": [
+                {MAX_FEATURES_PARAM: mf, ALPHA_PARAM: alpha} for mf, alpha in grid
+            ],
+            # Object arrays keep ``None`` intact, as in GridSearchCV
+            f"param_{MAX_FEATURES_PARAM}": np.array([mf for mf, _ in grid], dtype=object),
+            f"param_{ALPHA_PARAM}": np.array([alpha for _, alpha in grid], dtype=object),
+            "mean_test_score": mean,
+            "std_test_score": std,
+            "rank_test_score": rank,
+            "n_folds": n_folds,
+        }
+        for fold in range(self.n_splits_):
+            self.cv_results_[f"split{fold}_test_score"] = split_scores[:, fold]
+
+        best = int(order[0])
+        self.best_index_ = best
+        self.best_params_ = self.cv_results_["params"][best]
+        self.best_score_ = float(mean[best])
@@ -0,0 +1,338 @@
+"""
+online_training.py - Incremental Naive Bayes Training
+======================================================
+Trains the sentiment classifier incrementally instead of refitting on the
+whole dataset. Features come from a fixed-size ``HashingVectorizer`` (no
+vocabulary to refit), and ``MultinomialNB.partial_fit`` folds each
+mini-batch into the class/feature counts, so an update costs time
+proportional to the new reviews only.
+
+A checkpoint is written atomically after every batch. It also records how
+many rows of each input file have been consumed, so re-running the CLI on
+a growing or partially processed file resumes where it stopped.
+
+Mini-batches come from files (the CLI) or the API (``POST /admin/training``
+in main.py, via ``train_batch``). Every batch is applied under an exclusive
+lock on the checkpoint, to the latest saved state, and saved before the
+lock is released; so several server workers and the CLI can share one
+checkpoint without losing updates.
+
+The trained model is served by exporting it as a ``hashed-mnb`` artefact
+(``HashedScorer`` in compiled_scorer.py, NumPy only) into the model
+registry, where it can be activated like any other version.
+
+Usage:
+    # Python API
+    from online_training import OnlineTrainer
+
+    trainer = OnlineTrainer.load_or_create("online-mnb.pkl")
+    trainer.update(["Loved the pasta", "Cold soup"], [1, 0])
+    trainer.save_checkpoint()
+
+    # CLI: stream one or more labelled TSV/CSV files in mini-batches,
+    # then publish the model to the registry
+    python online_training.py new_reviews.tsv --batch-size 1000 --export-to ../models
+"""
+
+import os
+import fcntl
+import pickle
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from compiled_scorer import HashedScorer
+from model_artefact import save_artefact
+from preprocess import applied_clean_kwargs, preprocess_corpus
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CHECKPOINT_PATH = os.path.join(SCRIPT_DIR, "online-mnb-checkpoint.pkl")
+
+DEFAULT_N_FEATURES = 2 ** 18
+DEFAULT_ALPHA = 0.2
+DEFAULT_BATCH_SIZE = 1000
+CLASSES = np.array([0, 1])
+
+
+def build_hashing_vectorizer(n_features: int = DEFAULT_N_FEATURES) -> HashingVectorizer:
+    """Stateless feature extractor shared by training and inference.
+
+    ``alternate_sign`` is disabled because MultinomialNB needs non-negative
+    features; rows are L2-normalised like the TF-IDF pipeline.
+    """
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm="l2")
+
+
+class OnlineTrainer:
+    """Hashing features + ``MultinomialNB.partial_fit`` with checkpoints.
+
+    Args:
+        checkpoint_path: Where ``save_checkpoint`` writes by default.
+        n_features: Size of the hashed feature space (fixed for the model's life).
+        alpha: Additive smoothing for MultinomialNB.
+        clean_kwargs: Options forwarded to ``preprocess_corpus``.
+    """
+
+    def __init__(
+        self,
+        checkpoint_path: str = CHECKPOINT_PATH,
+        *,
+        n_features: int = DEFAULT_N_FEATURES,
+        alpha: float = DEFAULT_ALPHA,
+        clean_kwargs: Optional[Dict] = None,
+    ):
+        self.checkpoint_path = checkpoint_path
+        self.n_features = n_features
+        self.clean_kwargs = dict(clean_kwargs or {})
+        self.vectorizer = build_hashing_vectorizer(n_features)
+        self.classifier = MultinomialNB(alpha=alpha)
+        self.n_samples_seen = 0
+        self.n_batches = 0
+        # Rows consumed per input file, used to resume interrupted CLI runs
+        self.sources: Dict[str, int] = {}
+
+    # -- training --------------------------------------------------------------
+
+    def update(self, texts: Sequence[str], labels: Sequence[int]) -> None:
+        """Fold one mini-batch of raw reviews and 0/1 labels into the model."""
+        if len(texts) != len(labels):
+            raise ValueError(
+                f"Got {len(texts)} review(s) but {len(labels)} label(s)."
+            )
+        if len(texts) == 0:
+            return
+        X = self.vectorizer.transform(preprocess_corpus(texts, **self.clean_kwargs))
+        self.classifier.partial_fit(X, np.asarray(labels), classes=CLASSES)
+        self.n_samples_seen += len(texts)
+        self.n_batches += 1
+
+    def predict_proba(self, texts: Iterable[str]) -> np.ndarray:
+        """Class probabilities for raw reviews."""
+        corpus = preprocess_corpus(list(texts), **self.clean_kwargs)
+        return self.classifier.predict_proba(self.vectorizer.transform(corpus))
+
+    def predict(self, texts: Iterable[str]) -> np.ndarray:
+        """Predicted 0/1 labels for raw reviews."""
+        return CLASSES[self.predict_proba(texts).argmax(axis=1)]
+
+    def to_scorer(self) -> HashedScorer:
+        """NumPy-only copy of the current model for serving."""
+        if not hasattr(self.classifier, "feature_log_prob_"):
+            raise ValueError("The model has not been trained on any reviews yet.")
+        return HashedScorer.from_sklearn(self.vectorizer, self.classifier)
+
+    # -- persistence -----------------------------------------------------------
+
+    def save_checkpoint(self, path: Optional[str] = None) -> str:
+        """Atomically write the trainer state and return the path written."""
+        path = path or self.checkpoint_path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        state = {
+            "n_features": self.n_features,
+            "clean_kwargs": self.clean_kwargs,
+            "classifier": self.classifier,
+            "n_samples_seen": self.n_samples_seen,
+            "n_batches": self.n_batches,
+            "sources": self.sources,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(state, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    @classmethod
+    def load_checkpoint(cls, path: str) -> "OnlineTrainer":
+        """Restore a trainer saved with ``save_checkpoint``."""
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        trainer = cls(
+            path,
+            n_features=state["n_features"],
+            alpha=state["classifier"].alpha,
+            clean_kwargs=state["clean_kwargs"],
+        )
+        trainer.classifier = state["classifier"]
+        trainer.n_samples_seen = state["n_samples_seen"]
+        trainer.n_batches = state["n_batches"]
+        trainer.sources = state["sources"]
+        return trainer
+
+    def _refresh(self) -> None:
+        """Adopt the state saved at ``checkpoint_path``, if any."""
+        if os.path.isfile(self.checkpoint_path):
+            self.__dict__.update(self.load_checkpoint(self.checkpoint_path).__dict__)
+
+    @classmethod
+    def load_or_create(cls, path: str = CHECKPOINT_PATH, **kwargs) -> "OnlineTrainer":
+        """Resume from ``path`` if it exists, otherwise start a new model."""
+        if os.path.isfile(path):
+            trainer = cls.load_checkpoint(path)
+            logger.info(
+                "Resumed checkpoint %s (%d samples, %d batches)",
+                path, trainer.n_samples_seen, trainer.n_batches,
+            )
+            return trainer
+        return cls(path, **kwargs)
+
+    # -- file streaming ----------------------------------------------------------
+
+    def train_file(
+        self,
+        filepath: str,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        text_column: str = "Review",
+        label_column: str = "Liked",
+        delimiter: Optional[str] = None,
+    ) -> int:
+        """Stream a labelled TSV/CSV in mini-batches, checkpointing each one.
+
+        Rows already consumed by an earlier run (per the checkpoint) are
+        skipped.
+
+        Returns:
+            Number of new rows trained on.
+        """
+        if delimiter is None:
+            delimiter = "," if filepath.lower().endswith(".csv") else "\t"
+        key = os.path.abspath(filepath)
+        with _checkpoint_lock(self.checkpoint_path):
+            self._refresh()
+            done = self.sources.get(key, 0)
+        trained = 0
+
+        reader = pd.read_csv(
+            filepath,
+            delimiter=delimiter,
+            quoting=3 if delimiter == "\t" else 0,
+            chunksize=batch_size,
+            skiprows=range(1, done + 1),
+        )
+        for chunk in reader:
+            n_rows = len(chunk)
+            chunk = chunk.dropna(subset=[text_column, label_column])
+            with _checkpoint_lock(self.checkpoint_path):
+                # Build on batches other processes saved since the last one
+                self._refresh()
+                self.update(
+                    chunk[text_column].astype(str).tolist(),
+                    chunk[label_column].astype(int).tolist(),
+                )
+                done += n_rows
+                self.sources[key] = done
+                self.save_checkpoint()
+            trained += len(chunk)
+            logger.info("Batch %d: %d rows from %s", self.n_batches, done, filepath)
+        return trained
+
+
+# ---------------------------------------------------------------------------
+# Shared checkpoint (API and CLI)
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def _checkpoint_lock(path: str) -> Iterator[None]:
+    """Exclusive lock shared by every process writing ``path``."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+@contextmanager
+def locked_checkpoint(path: str = CHECKPOINT_PATH, **kwargs) -> Iterator[OnlineTrainer]:
+    """Trainer loaded from ``path`` while holding an exclusive file lock.
+
+    Processes that update the same checkpoint take turns, and each one
+    starts from the latest saved state.
+    """
+    with _checkpoint_lock(path):
+        yield OnlineTrainer.load_or_create(path, **kwargs)
+
+
+def train_batch(
+    texts: Sequence[str],
+    labels: Sequence[int],
+    checkpoint_path: str = CHECKPOINT_PATH,
+) -> Dict[str, int]:
+    """Fold one labelled mini-batch into the shared checkpoint."""
+    if any(label not in (0, 1) for label in labels):
+        raise ValueError("Labels must be 0 (negative) or 1 (positive).")
+    with locked_checkpoint(checkpoint_path) as trainer:
+        trainer.update(texts, labels)
+        trainer.save_checkpoint()
+        return {"n_samples_seen": trainer.n_samples_seen, "n_batches": trainer.n_batches}
+
+
+def export_artefact(
+    models_dir: str,
+    checkpoint_path: str = CHECKPOINT_PATH,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Write the checkpoint's model as a registry artefact; returns its path."""
+    with locked_checkpoint(checkpoint_path) as trainer:
+        return save_artefact(
+            models_dir,
+            trainer.to_scorer(),
+            metadata={
+                "source": "online_training",
+                # clean_text options the serving backend must reproduce
+                "preprocess": applied_clean_kwargs(trainer.clean_kwargs),
+                "n_samples_seen": trainer.n_samples_seen,
+                "n_batches": trainer.n_batches,
+                **(metadata or {}),
+            },
+        )
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    parser = argparse.ArgumentParser(description="Incrementally train the MNB model.")
+    parser.add_argument("inputs", nargs="+", help="Labelled TSV/CSV file(s)")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--n-features", type=int, default=DEFAULT_N_FEATURES)
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA)
+    parser.add_argument("--export-to", metavar="MODELS_DIR",
+                        help="Afterwards, publish the model as an artefact in this registry")
+    args = parser.parse_args()
+
+    trainer = OnlineTrainer.load_or_create(
+        args.checkpoint, n_features=args.n_features, alpha=args.alpha
+    )
+    for path in args.inputs:
+        n_new = trainer.train_file(path, batch_size=args.batch_size)
+        print(f"  [OK] {path}: {n_new} new review(s)")
+    print(f"  Total samples seen: {trainer.n_samples_seen} -> {trainer.checkpoint_path}")
+    if args.export_to:
+        path = export_artefact(args.export_to, args.checkpoint)
+        print(f"  [OK] Exported -> artefact {path}")
@@ -0,0 +1,316 @@
+"""
+parallel_search.py - Parallel, Checkpointed Naive Bayes Search
+===============================================================
+Runs the fold-cached, closed-form search of nb_search.py on a process
+pool and survives restarts:
+
+    - The corpus is tokenised and counted once. The CSR count matrix, the
+      labels and the fold indices are written as ``.npy`` files (under
+      ``/dev/shm`` when available) and opened with ``mmap_mode="r"`` by
+      every worker, so all tasks share one copy of the data instead of
+      receiving a pickled corpus each.
+    - A task is one (fold, max_features) pair. It slices the fold's
+      vocabulary out of the shared counts -- identical to fitting a
+      CountVectorizer on the fold's training text -- and scores all of its
+      alpha values in one pass.
+    - Every finished task is appended to a JSONL checkpoint and fsync'd.
+      Running again with the same checkpoint skips finished tasks. A
+      fingerprint of the data, folds and grid prevents resuming a
+      different search.
+
+Scores are identical to NaiveBayesSearchCV (and therefore GridSearchCV).
+
+Usage:
+    from parallel_search import ParallelNaiveBayesSearchCV
+
+    search = ParallelNaiveBayesSearchCV(
+        PARAM_GRID, cv=5, n_jobs=4, checkpoint="tuning-checkpoint.jsonl"
+    ).fit(corpus, y)
+    print(search.best_params_, search.resumed_tasks_)
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from nb_search import NaiveBayesSearchCV, fold_features, predict_for_alphas, weighted_f1
+from sparse_features import count_corpus, term_frequency_order
+
+logger = logging.getLogger(__name__)
+
+# Bump when task semantics change so old checkpoints are not reused
+CHECKPOINT_FORMAT_VERSION = 1
+
+# RAM-backed directory for the shared arrays, when the platform has one
+SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# (fold, max_features, alphas)
+Task = Tuple[int, Optional[int], Tuple[float, ...]]
+
+
+# ---------------------------------------------------------------------------
+# Shared data (parent writes, workers memory-map)
+# ---------------------------------------------------------------------------
+
+
+def write_shared_arrays(
+    workdir: str,
+    counts: sp.csr_matrix,
+    y: np.ndarray,
+    classes: np.ndarray,
+    splits: Sequence[Tuple[np.ndarray, np.ndarray]],
+) -> None:
+    """Write the data every task needs as ``.npy`` files in ``workdir``."""
+    arrays = {
+        "data": counts.data,
+        "indices": counts.indices,
+        "indptr": counts.indptr,
+        "shape": np.asarray(counts.shape, dtype=np.int64),
+        "y": y,
+        "classes": classes,
+    }
+    for fold, (train_idx, test_idx) in enumerate(splits):
+        arrays[f"train{fold}"] = train_idx
+        arrays[f"test{fold}"] = test_idx
+    for name, array in arrays.items():
+        np.save(
+            os.path.join(workdir, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False
+        )
+
+
+# Per-process state set by ``init_worker``
+_WORKER: Dict[str, Any] = {}
+
+
+def init_worker(workdir: str) -> None:
+    """Memory-map the shared arrays (pool initializer)."""
+    def load(name: str) -> np.ndarray:
+        return np.load(os.path.join(workdir, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+
+    shape = tuple(int(n) for n in load("shape"))
+    _WORKER.clear()
+    _WORKER.update(
+        workdir=workdir,
+        counts=sp.csr_matrix(
+            (load("data"), load("indices"), load("indptr")), shape=shape, copy=False
+        ),
+        y=np.asarray(load("y")),
+        classes=np.asarray(load("classes")),
+        load=load,
+        fold=None,
+    )
+
+
+def _fold_counts(fold: int) -> Tuple:
+    """Fold train/test counts over the fold's own vocabulary (cached per process)."""
+    if _WORKER["fold"] is None or _WORKER["fold"][0] != fold:
+        counts = _WORKER["counts"]
+        train_idx = np.asarray(_WORKER["load"](f"train{fold}"))
+        test_idx = np.asarray(_WORKER["load"](f"test{fold}"))
+        train = counts[train_idx]
+        # Terms seen in the fold's training rows, in the same alphabetical
+        # order a CountVectorizer fitted on that text would use
+        vocab = np.flatnonzero(train.getnnz(axis=0))
+        train_counts = train[:, vocab].tocsr()
+        test_counts = counts[test_idx][:, vocab].tocsr()
+        _WORKER["fold"] = (
+            fold,
+            train_counts,
+            test_counts,
+            term_frequency_order(train_counts),
+            _WORKER["y"][train_idx],
+            _WORKER["y"][test_idx],
+        )
+    return _WORKER["fold"][1:]
+
+
+def score_task(task: Task) -> Tuple[Task, List[float]]:
+    """Weighted F1 of every alpha of one (fold, max_features) task."""
+    fold, max_features, alphas = task
+    classes = _WORKER["classes"]
+    train_counts, test_counts, order, y_train, y_test = _fold_counts(fold)
+    feature_counts, class_counts, X_test = fold_features(
+        train_counts, test_counts, order, y_train, classes, max_features
+    )
+    preds = predict_for_alphas(feature_counts, class_counts, X_test, np.array(alphas), classes)
+    return task, [float(s) for s in weighted_f1(y_test, preds, classes)]
+
+
+# ---------------------------------------------------------------------------
+# Search runner
+# ---------------------------------------------------------------------------
+
+
+class ParallelNaiveBayesSearchCV(NaiveBayesSearchCV):
+    """``NaiveBayesSearchCV`` on a process pool with a resumable checkpoint.
+
+    Args:
+        param_grid, cv, halving, factor, min_folds, refit: As for
+            ``NaiveBayesSearchCV``.
+        n_jobs: Worker processes (``None`` = all cores, 1 = in-process).
+        checkpoint: JSONL file recording finished tasks (optional).
+        replace_stale_checkpoint: If the checkpoint belongs to another
+            search, warn and start a fresh one instead of raising.
+        workdir: Parent directory for the shared arrays (default
+            ``/dev/shm`` when present, else the system temp dir).
+    """
+
+    def __init__(
+        self,
+        param_grid: Dict[str, List[Any]],
+        *,
+        cv=5,
+        halving: bool = False,
+        factor: int = 3,
+        min_folds: int = 1,
+        refit: bool = True,
+        n_jobs: Optional[int] = None,
+        checkpoint: Optional[str] = None,
+        replace_stale_checkpoint: bool = False,
+        workdir: Optional[str] = SHARED_DIR,
+    ):
+        super().__init__(
+            param_grid, cv=cv, halving=halving, factor=factor,
+            min_folds=min_folds, refit=refit,
+        )
+        self.n_jobs = n_jobs
+        self.checkpoint = checkpoint
+        self.replace_stale_checkpoint = replace_stale_checkpoint
+        self.workdir = workdir
+
+    # -- checkpoint ------------------------------------------------------------
+
+    def _fingerprint(
+        self, counts: sp.csr_matrix, feature_names: np.ndarray, grid: List[Tuple]
+    ) -> str:
+        digest = hashlib.sha256()
+        digest.update(str(CHECKPOINT_FORMAT_VERSION).encode())
+        for array in (counts.data, counts.indices, counts.indptr, self._y):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update("\n".join(feature_names.tolist()).encode("utf-8"))
+        for train_idx, test_idx in self._splits:
+            digest.update(np.asarray(train_idx).tobytes())
+            digest.update(np.asarray(test_idx).tobytes())
+        digest.update(json.dumps(grid).encode())
+        return digest.hexdigest()
+
+    def _restore(self, fingerprint: str) -> int:
+        """Load finished tasks from the checkpoint; return how many."""
+        if not self.checkpoint or not os.path.isfile(self.checkpoint):
+            return 0
+        restored = 0
+        with open(self.checkpoint, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if not lines or json.loads(lines[0]).get("fingerprint") != fingerprint:
+            if self.replace_stale_checkpoint:
+                logger.warning(
+                    "Checkpoint %s belongs to a different search; starting a fresh one",
+                    self.checkpoint,
+                )
+                os.remove(self.checkpoint)
+                return 0
+            raise ValueError(
+                f"Checkpoint {self.checkpoint} belongs to a different search "
+                "(data, folds or grid changed); remove it or choose another path."
+            )
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A write interrupted by a crash leaves at most one torn line
+                logger.warning("Ignoring incomplete checkpoint line")
+                continue
+            for alpha, score in entry["scores"]:
+                cand = (entry["max_features"], alpha)
+                if cand in self._scores:
+                    self._scores[cand][entry["fold"]] = score
+            restored += 1
+        return restored
+
+    def _record(self, task: Task, scores: List[float]) -> None:
+        fold, max_features, alphas = task
+        for alpha, score in zip(alphas, scores):
+            self._scores[(max_features, alpha)][fold] = score
+        if self._checkpoint_file is not None:
+            entry = {
+                "fold": fold, "max_features": max_features, "scores": list(zip(alphas, scores)),
+            }
+            self._checkpoint_file.write(json.dumps(entry) + "\n")
+            self._checkpoint_file.flush()
+            os.fsync(self._checkpoint_file.fileno())
+
+    def _open_checkpoint(self, fingerprint: str):
+        if not self.checkpoint:
+            return None
+        directory = os.path.dirname(os.path.abspath(self.checkpoint))
+        os.makedirs(directory, exist_ok=True)
+        is_new = not os.path.isfile(self.checkpoint)
+        f = open(self.checkpoint, "a", encoding="utf-8")
+        if is_new:
+            f.write(json.dumps({"fingerprint": fingerprint}) + "\n")
+            f.flush()
+        return f
+
+    # -- execution -------------------------------------------------------------
+
+    def _score(self, candidates: List[Tuple], folds: range) -> None:
+        """Run every unfinished (fold, max_features) task, checkpointing each."""
+        pending: Dict[Tuple, List[float]] = {}
+        for fold in folds:
+            for max_features, alpha in candidates:
+                if fold not in self._scores[(max_features, alpha)]:
+                    pending.setdefault((fold, max_features), []).append(alpha)
+        # Fold-major order lets each worker reuse its cached fold counts
+        tasks = [(fold, mf, tuple(alphas)) for (fold, mf), alphas in pending.items()]
+        if not tasks:
+            return
+
+        if self._pool is None:
+            results = map(score_task, tasks)
+        else:
+            results = (
+                future.result()
+                for future in as_completed([self._pool.submit(score_task, t) for t in tasks])
+            )
+        for done, (task, scores) in enumerate(results, start=1):
+            self._record(task, scores)
+            logger.info("Task %d/%d done: fold %d, max_features %s",
+                        done, len(tasks), task[0], task[1])
+
+    def _run_search(self, grid: List[Tuple]) -> None:
+        """Share the data, restore the checkpoint, then search on the pool."""
+        counter, counts = count_corpus(self._corpus)
+        fingerprint = self._fingerprint(counts, counter.get_feature_names_out(), grid)
+        self.resumed_tasks_ = self._restore(fingerprint)
+        if self.resumed_tasks_:
+            logger.info("Resumed %d finished task(s) from %s", self.resumed_tasks_, self.checkpoint)
+
+        workdir = tempfile.mkdtemp(prefix="nb-search-", dir=self.workdir)
+        self._pool = None
+        self._checkpoint_file = self._open_checkpoint(fingerprint)
+        try:
+            write_shared_arrays(workdir, counts, self._y, self.classes_, self._splits)
+            del counts
+            if self.n_jobs == 1:
+                init_worker(workdir)
+            else:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.n_jobs, initializer=init_worker, initargs=(workdir,)
+                )
+            super()._run_search(grid)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+            if self._checkpoint_file is not None:
+                self._checkpoint_file.close()
+            _WORKER.clear()
+            shutil.rmtree(workdir, ignore_errors=True)
+            self._pool = self._checkpoint_file = None
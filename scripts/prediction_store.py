@@ -0,0 +1,260 @@
+"""
+prediction_store.py - Asynchronous Prediction Store (SQLite, WAL)
+==================================================================
+Keeps every served prediction for analytics without slowing requests:
+
+    - ``submit`` hands a record to a bounded in-memory queue. With the
+      ``drop`` policy a full queue drops the record (and counts it); with
+      ``block`` the caller waits up to ``block_timeout`` for space (then
+      drops), so it must not be called on the event loop.
+    - One writer thread owns the SQLite connection. It collects records
+      until ``batch_size`` are pending or ``flush_interval`` seconds have
+      passed since the oldest one, then writes them with ``executemany``
+      in a single transaction.
+    - The database runs in WAL mode with ``synchronous=NORMAL``: readers
+      (dashboards, ad-hoc queries) never block the writer, and a batch
+      costs one sequential log append rather than a page rewrite per row.
+    - If the writer thread dies (e.g. the database becomes unreachable),
+      it says so in the log and ``stats()``; queued and later records are
+      dropped instead of blocking their producers.
+
+Usage:
+    from prediction_store import PredictionStore
+
+    store = PredictionStore("data/predictions.db", batch_size=100, flush_interval=1.0)
+    store.start()
+    store.submit({"model": "distilbert", "prediction": 1, "confidence": 0.97})
+    store.close()   # flushes what is queued
+"""
+
+import os
+import json
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_BLOCK_TIMEOUT = 1.0  # seconds a "block" submit waits before dropping
+POLICIES = ("drop", "block")
+
+COLUMNS = (
+    "created_at", "model", "prediction", "confidence", "latency_ms", "text_length", "text",
+    "aspects",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id          INTEGER PRIMARY KEY,
+    created_at  REAL    NOT NULL,
+    model       TEXT,
+    prediction  INTEGER NOT NULL,
+    confidence  REAL    NOT NULL,
+    latency_ms  REAL,
+    text_length INTEGER,
+    text        TEXT,
+    aspects     TEXT
+);
+CREATE INDEX IF NOT EXISTS predictions_created_at ON predictions (created_at);
+"""
+
+_STOP = object()
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open ``path`` in WAL mode with the predictions schema."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _row(record: Dict[str, Any]) -> tuple:
+    aspects = record.get("aspects")
+    return (
+        record.get("created_at") or time.time(),
+        record.get("model"),
+        int(record["prediction"]),
+        float(record["confidence"]),
+        record.get("latency_ms"),
+        record.get("text_length"),
+        record.get("text"),
+        json.dumps(aspects) if aspects is not None else None,
+    )
+
+
+class PredictionStore:
+    """Bounded queue plus a batching SQLite writer thread.
+
+    Args:
+        path: SQLite database file (created if missing).
+        batch_size: Records per transaction (flush when reached).
+        flush_interval: Longest a queued record waits before being written.
+        queue_size: Records that may wait in memory.
+        policy: ``"drop"`` (never wait) or ``"block"`` when the queue is full.
+        block_timeout: Longest ``submit`` waits under ``block`` before the
+            record is dropped (None = forever).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        policy: str = "drop",
+        block_timeout: Optional[float] = DEFAULT_BLOCK_TIMEOUT,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, got {policy!r}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._counters = {"submitted": 0, "dropped": 0, "written": 0, "batches": 0, "errors": 0}
+        self._writer: Optional[threading.Thread] = None
+        self._writer_failed = threading.Event()
+
+    @property
+    def blocking(self) -> bool:
+        return self.policy == "block"
+
+    # -- producer side -------------------------------------------------------------
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """Queue one prediction record; returns False if it was dropped.
+
+        ``record`` needs ``prediction`` and ``confidence``; ``created_at``,
+        ``model``, ``latency_ms``, ``text_length``, ``text`` and ``aspects``
+        are optional.
+        """
+        self._counters["submitted"] += 1
+        if self._writer_failed.is_set():
+            # Nobody drains the queue; waiting for space would never end
+            self._counters["dropped"] += 1
+            return False
+        try:
+            if self.blocking:
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._counters["dropped"] += 1
+            return False
+        return True
+
+    # -- writer side -----------------------------------------------------------------
+
+    def _flush(self, conn: sqlite3.Connection, batch: List[Dict[str, Any]]) -> None:
+        try:
+            with conn:  # one transaction per batch
+                conn.executemany(
+                    f"INSERT INTO predictions ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                    [_row(record) for record in batch],
+                )
+            self._counters["written"] += len(batch)
+            self._counters["batches"] += 1
+        except Exception:
+            self._counters["errors"] += 1
+            logger.exception("Could not write %d prediction record(s)", len(batch))
+
+    def _fail(self) -> None:
+        """Writer is gone: drop what is queued and refuse new records."""
+        self._counters["errors"] += 1
+        logger.exception("Prediction writer stopped; further predictions are not stored")
+        self._writer_failed.set()
+        while True:
+            try:
+                if self._queue.get_nowait() is not _STOP:
+                    self._counters["dropped"] += 1
+            except queue.Empty:
+                break
+
+    def _run(self) -> None:
+        try:
+            # sqlite3 connections belong to the thread that opened them
+            conn = connect(self.path)
+        except Exception:
+            self._fail()
+            return
+        batch: List[Dict[str, Any]] = []
+        deadline = 0.0
+        try:
+            while True:
+                timeout = max(0.0, deadline - time.monotonic()) if batch else None
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    break
+                if item is not None:
+                    if not batch:
+                        deadline = time.monotonic() + self.flush_interval
+                    batch.append(item)
+                if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                    self._flush(conn, batch)
+                    batch = []
+            # Drain on shutdown
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    batch.append(item)
+            if batch:
+                self._flush(conn, batch)
+        except Exception:
+            self._fail()
+        finally:
+            conn.close()
+
+    def start(self) -> None:
+        """Create the database and start the writer thread."""
+        if self._writer is not None:
+            return
+        # Fail at startup, not in the thread, if the database is unusable
+        connect(self.path).close()
+        self._writer = threading.Thread(target=self._run, name="prediction-store", daemon=True)
+        self._writer.start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write everything queued, then stop the writer (waits up to ``timeout``)."""
+        if self._writer is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if self._writer.is_alive():
+            try:
+                # A full queue must not hang shutdown if the writer is stuck
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                logger.warning("Prediction queue still full after %ss; %d record(s) not stored",
+                               timeout, self._queue.qsize())
+            else:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                self._writer.join(remaining)
+        self._writer = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "queued": self._queue.qsize(),
+            "writer_alive": self._writer is not None and self._writer.is_alive(),
+            **self._counters,
+        }
@@ -13,29 +13,40 @@ Usage:
 
     # Full DataFrame column
     corpus = preprocess_corpus(df["Review"])
+
+NLTK resources are resolved lazily: importing this module never touches
+the network. Pre-fetch WordNet for offline hosts with:
+    python preprocess.py --download
 """
 
+import os
 import re
 import logging
-from typing import List, Optional
+import threading
+from typing import Any, Callable, Dict, List, Optional
 
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
-# Ensure NLTK resources are available
+# NLTK resources (resolved lazily, never at import time)
 # ---------------------------------------------------------------------------
-nltk.download("stopwords", quiet=True)
-nltk.download("wordnet", quiet=True)
+# ``nltk`` itself takes ~2 s to import and ``nltk.download`` blocks on network
+# timeouts on isolated hosts, so nothing NLTK-related happens until a caller
+# actually needs it. Stop-words ship with the repo in NLTK's on-disk layout;
+# WordNet is looked up in the local cache and only downloaded when allowed.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLED_NLTK_DATA = os.path.join(SCRIPT_DIR, "nltk_data")
+NLTK_CACHE_DIR = os.environ.get(
+    "NLTK_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "restaurant-sentiment", "nltk_data"),
+)
+NLTK_OFFLINE = os.environ.get("NLTK_OFFLINE", "false").lower() == "true"
 
-logger = logging.getLogger(__name__)
+_STOPWORDS_PATH = os.path.join(BUNDLED_NLTK_DATA, "corpora", "stopwords", "english")
 
-# ---------------------------------------------------------------------------
-# Module-level singletons (initialised once)
-# ---------------------------------------------------------------------------
-_lemmatizer = WordNetLemmatizer()
-_stop_words: set = set(stopwords.words("english"))
+_resource_lock = threading.Lock()
+_stop_words: Optional[frozenset] = None
+_lemmatize_fn: Optional[Callable[[str], str]] = None
 
 # Characters to preserve: only alphabetic; everything else becomes a space
 _NON_ALPHA_RE = re.compile(r"[^a-zA-Z]")
@@ -58,6 +69,128 @@ _CONTRACTION_RE = re.compile(
 )
 
 
+# ---------------------------------------------------------------------------
+# Lazy resource loaders
+# ---------------------------------------------------------------------------
+
+
+def _register_nltk_paths(nltk_module) -> None:
+    """Make the bundled data and the local cache visible to NLTK."""
+    for path in (BUNDLED_NLTK_DATA, NLTK_CACHE_DIR):
+        if path not in nltk_module.data.path:
+            nltk_module.data.path.append(path)
+
+
+def get_stop_words() -> frozenset:
+    """Return the English stop-word set, reading the bundled list on first use.
+
+    The list is NLTK's English stop-word corpus shipped with the repo, so no
+    NLTK import or network access is needed.
+    """
+    global _stop_words
+    if _stop_words is None:
+        with _resource_lock:
+            if _stop_words is None:
+                with open(_STOPWORDS_PATH, encoding="utf-8") as f:
+                    _stop_words = frozenset(line.strip() for line in f if line.strip())
+    return _stop_words
+
+
+def _identity_lemma(word: str) -> str:
+    """Fallback used when WordNet is unavailable."""
+    return word
+
+
+def _load_lemmatizer(download: bool) -> Callable[[str], str]:
+    """Build the WordNet lemmatise function, falling back to identity."""
+    import nltk
+
+    _register_nltk_paths(nltk)
+    try:
+        nltk.data.find("corpora/wordnet")
+    except LookupError:
+        if not download:
+            logger.warning(
+                "WordNet not found in %s and downloads are disabled; "
+                "lemmatisation will be skipped.", NLTK_CACHE_DIR,
+            )
+            return _identity_lemma
+        logger.info("Downloading WordNet into %s", NLTK_CACHE_DIR)
+        os.makedirs(NLTK_CACHE_DIR, exist_ok=True)
+        if not nltk.download("wordnet", download_dir=NLTK_CACHE_DIR, quiet=True):
+            logger.warning("WordNet download failed; lemmatisation will be skipped.")
+            return _identity_lemma
+
+    from nltk.stem import WordNetLemmatizer
+
+    return WordNetLemmatizer().lemmatize
+
+
+def get_lemmatizer() -> Callable[[str], str]:
+    """Return a ``word -> lemma`` function, initialising WordNet on first use.
+
+    WordNet is read from the local NLTK paths (including ``NLTK_CACHE_DIR``).
+    If it is missing it is downloaded once into the cache, unless
+    ``NLTK_OFFLINE=true``, in which case tokens are returned unchanged.
+    """
+    global _lemmatize_fn
+    if _lemmatize_fn is None:
+        with _resource_lock:
+            if _lemmatize_fn is None:
+                _lemmatize_fn = _load_lemmatizer(download=not NLTK_OFFLINE)
+    return _lemmatize_fn
+
+
+def lemmatizer_available() -> bool:
+    """Return True if lemmatisation is backed by WordNet (not the fallback)."""
+    return get_lemmatizer() is not _identity_lemma
+
+
+def applied_clean_kwargs(clean_kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Return ``clean_text`` options as this process really applies them.
+
+    ``lemmatize`` is always present and is False under the WordNet fallback.
+    Artefacts record this, so serving reproduces what the model was trained
+    on instead of guessing.
+    """
+    applied = dict(clean_kwargs or {})
+    applied["lemmatize"] = bool(applied.get("lemmatize", True)) and lemmatizer_available()
+    return applied
+
+
+def check_lemmatizer(clean_kwargs: Optional[Dict[str, Any]] = None) -> None:
+    """Raise ``RuntimeError`` if ``clean_kwargs`` needs WordNet and it is missing.
+
+    Scoring a lemmatised model with unlemmatised tokens silently skews every
+    prediction, so callers should refuse to serve it instead.
+    """
+    if (clean_kwargs or {}).get("lemmatize", True) and not lemmatizer_available():
+        raise RuntimeError(
+            "This model was trained with WordNet lemmatisation, but WordNet is not "
+            f"available in {NLTK_CACHE_DIR}; run `python preprocess.py --download`."
+        )
+
+
+def ensure_nltk_resources() -> bool:
+    """Download WordNet into ``NLTK_CACHE_DIR`` ahead of time.
+
+    Intended for image builds and provisioning so that runtime processes never
+    touch the network.
+
+    Returns:
+        True if WordNet is available locally afterwards.
+    """
+    import nltk
+
+    _register_nltk_paths(nltk)
+    try:
+        nltk.data.find("corpora/wordnet")
+        return True
+    except LookupError:
+        os.makedirs(NLTK_CACHE_DIR, exist_ok=True)
+        return bool(nltk.download("wordnet", download_dir=NLTK_CACHE_DIR, quiet=True))
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -120,7 +253,7 @@ def clean_text(
 
     # 5. Stop-word removal
     if remove_stopwords:
-        sw = _stop_words | (custom_stopwords or set())
+        sw = get_stop_words() | (custom_stopwords or set())
         tokens = [w for w in tokens if w not in sw]
 
     # 6. Minimum word length filter
@@ -129,7 +262,8 @@ def clean_text(
 
     # 7. Lemmatise
     if lemmatize:
-        tokens = [_lemmatizer.lemmatize(w) for w in tokens]
+        lemmatize_word = get_lemmatizer()
+        tokens = [lemmatize_word(w) for w in tokens]
 
     return " ".join(tokens)
 
@@ -173,6 +307,13 @@ def preprocess_corpus(
 # CLI entry point for quick testing
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
+    import sys
+
+    if "--download" in sys.argv:
+        ok = ensure_nltk_resources()
+        print(f"WordNet available in {NLTK_CACHE_DIR}: {ok}")
+        sys.exit(0 if ok else 1)
+
     demo_reviews = [
         "The food was AMAZING!!! Best pasta ever :)",
         "Terrible service. Had to wait 2 hours for cold soup.",
@@ -0,0 +1,105 @@
+"""
+request_profiling.py - Opt-In Profiling of Single Requests
+===========================================================
+Runs one call under a deterministic profiler and saves the result where
+flame graph tools can read it:
+
+    pstats     cProfile output (``snakeviz``, ``python -m pstats``,
+               ``flameprof``, ``gprof2dot``)
+    collapsed  one ``frame;frame;frame <microseconds>`` line per distinct
+               stack (``flamegraph.pl``, speedscope, inferno)
+
+The collapsed profiler hooks ``sys.setprofile`` in the calling thread
+only, so concurrent requests are not slowed down or mixed in, and calls
+shorter than a sampling interval still appear. Backends expose
+``tokenize``, ``forward`` and ``postprocess`` as separate methods, so
+those stages show up as separate frames.
+
+Nothing here runs unless a request asks for it: the server checks one
+header and otherwise takes its normal path.
+
+Usage:
+    from request_profiling import profile_call
+
+    result, path = profile_call("collapsed", "profiles", backend.predict, ["Great pasta"])
+"""
+
+import os
+import sys
+import time
+import uuid
+import cProfile
+from collections import Counter
+from typing import Any, Callable, Tuple
+
+PROFILE_FORMATS = {"pstats": ".pstats", "collapsed": ".collapsed"}
+
+
+def _label(code) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{name}"
+
+
+def _c_label(func) -> str:
+    module = getattr(func, "__module__", None) or type(getattr(func, "__self__", None)).__name__
+    return f"{module}.{getattr(func, '__qualname__', repr(func))}"
+
+
+class CollapsedStackProfiler:
+    """Wall time per exact call stack, recorded with ``sys.setprofile``."""
+
+    def __init__(self):
+        self.stacks: Counter = Counter()
+        self._stack = []
+        self._last = 0
+
+    def _charge(self, now: int) -> None:
+        if self._stack:
+            self.stacks[";".join(self._stack)] += now - self._last
+        self._last = now
+
+    def _hook(self, frame, event: str, arg: Any) -> None:
+        self._charge(time.perf_counter_ns())
+        if event == "call":
+            self._stack.append(_label(frame.f_code))
+        elif event == "c_call":
+            self._stack.append(_c_label(arg))
+        elif self._stack:  # return, c_return, c_exception
+            self._stack.pop()
+
+    def runcall(self, func: Callable[..., Any], *args: Any) -> Any:
+        previous = sys.getprofile()
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._hook)
+        try:
+            return func(*args)
+        finally:
+            sys.setprofile(previous)
+            self._charge(time.perf_counter_ns())
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, ns in sorted(self.stacks.items()):
+                if ns >= 1000:
+                    f.write(f"{stack} {ns // 1000}\n")
+
+
+def profile_call(fmt: str, directory: str, func: Callable[..., Any], *args: Any) -> Tuple[Any, str]:
+    """Run ``func(*args)`` under the ``fmt`` profiler; returns (result, file path).
+
+    The profile is saved even if ``func`` raises.
+    """
+    if fmt not in PROFILE_FORMATS:
+        raise ValueError(f"Unknown profile format {fmt!r}; use one of {sorted(PROFILE_FORMATS)}")
+    os.makedirs(directory, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:8]}{PROFILE_FORMATS[fmt]}"
+    path = os.path.join(directory, name)
+    profiler = cProfile.Profile() if fmt == "pstats" else CollapsedStackProfiler()
+    try:
+        result = profiler.runcall(func, *args)
+    finally:
+        if fmt == "pstats":
+            profiler.dump_stats(path)
+        else:
+            profiler.dump(path)
+    return result, path
@@ -0,0 +1,372 @@
+"""
+rolling_analytics.py - Incremental Rolling Sentiment Analytics
+===============================================================
+Live dashboard numbers -- positive share, mean confidence and the
+aspects negative reviews complain about -- over the last 5 minutes, hour
+or day, without rescanning stored predictions.
+
+Time is cut into fixed buckets (default one minute) kept in a ring that
+spans the horizon (default one day). Each slot stores the *cumulative*
+totals up to the end of its bucket, so:
+
+    - ``record`` adds one prediction to the head slot: O(1)
+    - moving to a new bucket copies the head's totals forward: O(1) per
+      elapsed bucket, independent of traffic
+    - any window of k buckets is ``cum[head] - cum[head - k]``: O(1)
+
+Totals are plain counts and sums, so trackers merge by adding their
+per-bucket deltas (``merge``), and a window over several trackers is the
+sum of their windows. Each worker process can ``save`` its state to a
+shared directory. ``SharedAnalytics`` answers the analytics endpoint from
+its own live tracker plus the other workers' files, which it re-reads
+only when they change and at most once per refresh interval;
+``load_merged`` builds one merged tracker from the directory.
+
+Usage:
+    from rolling_analytics import RollingAnalytics
+
+    analytics = RollingAnalytics()
+    analytics.record(prediction=0, confidence=0.91, aspects=["wait_time"])
+    analytics.summary(parse_window("1h"))
+
+    shared = SharedAnalytics("analytics", own=analytics, own_path="analytics/worker-1.npz")
+    shared.summary(parse_window("1h"))
+"""
+
+import os
+import re
+import glob
+import math
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from aspects import ASPECT_KEYWORDS, GENERAL
+
+DEFAULT_BUCKET_SECONDS = 60
+DEFAULT_HORIZON_SECONDS = 24 * 3600
+DEFAULT_WINDOWS = ("5m", "1h", "1d")
+TOP_ASPECTS = 3
+
+ASPECTS = tuple(ASPECT_KEYWORDS) + (GENERAL,)
+# count, positives, confidence sum, then one negative count per aspect
+_COUNT, _POSITIVE, _CONFIDENCE = 0, 1, 2
+_FIRST_ASPECT = 3
+
+_WINDOW_RE = re.compile(r"^(\d+)\s*([smhd])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_window(window: str) -> int:
+    """Seconds in a window such as ``"5m"``, ``"1h"`` or ``"1d"``."""
+    match = _WINDOW_RE.match(window.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid window {window!r}; use e.g. 5m, 1h or 1d")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+class RollingAnalytics:
+    """Cumulative per-bucket totals in a ring covering ``horizon_seconds``.
+
+    Args:
+        bucket_seconds: Bucket width (window resolution).
+        horizon_seconds: Longest answerable window.
+        aspects: Aspect names counted for negative predictions.
+        clock: Time source (seconds since the epoch).
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+        horizon_seconds: int = DEFAULT_HORIZON_SECONDS,
+        aspects: Sequence[str] = ASPECTS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.bucket_seconds = int(bucket_seconds)
+        self.horizon_seconds = int(horizon_seconds)
+        self.aspects = tuple(aspects)
+        self.clock = clock
+        self._aspect_index = {a: _FIRST_ASPECT + i for i, a in enumerate(self.aspects)}
+        # One extra slot holds the base subtracted for the longest window
+        self._n = -(-self.horizon_seconds // self.bucket_seconds) + 1
+        self._cum = np.zeros((self._n, _FIRST_ASPECT + len(self.aspects)))
+        self._ids = np.full(self._n, -1, dtype=np.int64)
+        self._head: Optional[int] = None
+        self._lock = threading.Lock()
+
+    # -- updates ---------------------------------------------------------------
+
+    def _advance(self, bucket: int) -> int:
+        """Move the head to ``bucket`` (carrying totals); return its slot."""
+        if self._head is None:
+            self._head = bucket
+            self._ids[bucket % self._n] = bucket
+        elif bucket > self._head:
+            carried = self._cum[self._head % self._n].copy()
+            for b in range(max(self._head + 1, bucket - self._n + 1), bucket + 1):
+                self._cum[b % self._n] = carried
+                self._ids[b % self._n] = b
+            self._head = bucket
+        # Late events (bucket < head) count in the current bucket
+        return self._head % self._n
+
+    def record(
+        self,
+        prediction: int,
+        confidence: float,
+        aspects: Iterable[str] = (),
+        now: Optional[float] = None,
+    ) -> None:
+        """Add one prediction.
+
+        Args:
+            prediction: 1 (positive) or 0 (negative).
+            confidence: Confidence in ``prediction`` (0-1).
+            aspects: Aspects the prediction is negative about.
+            now: Event time (defaults to the clock).
+        """
+        bucket = int((self.clock() if now is None else now) // self.bucket_seconds)
+        with self._lock:
+            row = self._cum[self._advance(bucket)]
+            row[_COUNT] += 1
+            row[_POSITIVE] += prediction == 1
+            row[_CONFIDENCE] += confidence
+            for aspect in aspects:
+                index = self._aspect_index.get(aspect)
+                if index is not None:
+                    row[index] += 1
+
+    # -- queries ---------------------------------------------------------------
+
+    def window(self, seconds: float, now: Optional[float] = None) -> np.ndarray:
+        """Totals over the last ``seconds`` (rounded up to whole buckets)."""
+        k = min(max(1, math.ceil(seconds / self.bucket_seconds)), self._n - 1)
+        bucket = int((self.clock() if now is None else now) // self.bucket_seconds)
+        with self._lock:
+            head_slot = self._advance(bucket)
+            base = self._head - k
+            base_slot = base % self._n
+            if self._ids[base_slot] == base:
+                return self._cum[head_slot] - self._cum[base_slot]
+            # Window reaches back before the first recorded bucket
+            return self._cum[head_slot].copy()
+
+    def summarise(self, totals: np.ndarray) -> Dict[str, Any]:
+        """Dashboard view of a totals vector from ``window``."""
+        count = int(totals[_COUNT])
+        negatives = {
+            aspect: int(totals[index])
+            for aspect, index in self._aspect_index.items()
+            if totals[index] > 0
+        }
+        top = sorted(negatives.items(), key=lambda item: (-item[1], item[0]))[:TOP_ASPECTS]
+        return {
+            "count": count,
+            "positive_share": float(totals[_POSITIVE] / count) if count else None,
+            "mean_confidence": float(totals[_CONFIDENCE] / count) if count else None,
+            "top_negative_aspects": [{"aspect": a, "count": c} for a, c in top],
+        }
+
+    def summary(self, seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        return self.summarise(self.window(seconds, now))
+
+    # -- merging & persistence -------------------------------------------------
+
+    def _deltas(self, head: int) -> Dict[int, np.ndarray]:
+        """Per-bucket (not cumulative) totals for buckets after the base slot."""
+        with self._lock:
+            if self._head is None:
+                return {}
+            self._advance(head)
+            deltas = {}
+            for b in range(head - self._n + 2, head + 1):
+                slot, prev = b % self._n, (b - 1) % self._n
+                if self._ids[slot] != b:
+                    continue
+                before = self._cum[prev] if self._ids[prev] == b - 1 else 0.0
+                deltas[b] = self._cum[slot] - before
+            return deltas
+
+    def merge(self, other: "RollingAnalytics") -> "RollingAnalytics":
+        """New tracker holding the combined totals of ``self`` and ``other``."""
+        if (other.bucket_seconds, other.horizon_seconds, other.aspects) != (
+            self.bucket_seconds, self.horizon_seconds, self.aspects
+        ):
+            raise ValueError("Cannot merge trackers with different buckets, horizons or aspects")
+        heads = [h for h in (self._head, other._head) if h is not None]
+        merged = RollingAnalytics(
+            self.bucket_seconds, self.horizon_seconds, self.aspects, self.clock
+        )
+        if not heads:
+            return merged
+        head = max(heads)
+        combined: Dict[int, np.ndarray] = {}
+        for tracker in (self, other):
+            for b, delta in tracker._deltas(head).items():
+                combined[b] = combined[b] + delta if b in combined else delta
+        # The oldest slot stays at zero: it is the base of the longest window
+        base = head - self._n + 1
+        merged._ids[base % self._n] = base
+        running = np.zeros_like(merged._cum[0])
+        for b in range(base + 1, head + 1):
+            running = running + combined.get(b, 0.0)
+            merged._cum[b % self._n] = running
+            merged._ids[b % self._n] = b
+        merged._head = head
+        return merged
+
+    def state(self) -> Dict[str, np.ndarray]:
+        with self._lock:
+            return {
+                "config": np.array([self.bucket_seconds, self.horizon_seconds], dtype=np.int64),
+                "aspects": np.array(self.aspects),
+                "head": np.array(-1 if self._head is None else self._head, dtype=np.int64),
+                "ids": self._ids.copy(),
+                "cum": self._cum.copy(),
+            }
+
+    @classmethod
+    def from_state(
+        cls, state: Dict[str, np.ndarray], clock: Callable[[], float] = time.time
+    ) -> "RollingAnalytics":
+        bucket_seconds, horizon_seconds = (int(v) for v in state["config"])
+        tracker = cls(bucket_seconds, horizon_seconds, [str(a) for a in state["aspects"]], clock)
+        head = int(state["head"])
+        tracker._head = None if head < 0 else head
+        tracker._ids[:] = state["ids"]
+        tracker._cum[:] = state["cum"]
+        return tracker
+
+    def save(self, path: str) -> None:
+        """Atomically write the state (``.npz``) for other workers to merge."""
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **self.state())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, clock: Callable[[], float] = time.time) -> "RollingAnalytics":
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_state({name: data[name] for name in data.files}, clock)
+
+
+def _worker_files(directory: str, own_path: Optional[str], max_age: float, now: float):
+    """(path, mtime_ns) of other workers' states written within ``max_age``."""
+    own = os.path.abspath(own_path) if own_path is not None else None
+    for path in sorted(glob.glob(os.path.join(directory, "*.npz"))):
+        if os.path.abspath(path) == own:
+            continue
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            continue  # removed by a worker shutting down
+        if now - mtime_ns / 1e9 <= max_age:  # older files hold nothing in any window
+            yield path, mtime_ns
+
+
+def load_merged(
+    directory: str, own: Optional[RollingAnalytics] = None, own_path: Optional[str] = None
+):
+    """Merge every worker state in ``directory`` (plus ``own``, live).
+
+    Files last written longer ago than the horizon are skipped.
+
+    Returns:
+        (merged tracker, number of trackers merged)
+    """
+    trackers: List[RollingAnalytics] = [own] if own is not None else []
+    clock = own.clock if own else time.time
+    horizon = own.horizon_seconds if own else DEFAULT_HORIZON_SECONDS
+    for path, _ in _worker_files(directory, own_path, horizon, clock()):
+        try:
+            trackers.append(RollingAnalytics.load(path, clock))
+        except (OSError, ValueError, KeyError):
+            continue  # a worker is mid-write or the file is foreign
+    if not trackers:
+        return RollingAnalytics(), 0
+    merged = trackers[0]
+    for tracker in trackers[1:]:
+        merged = merged.merge(tracker)
+    return merged, len(trackers)
+
+
+class SharedAnalytics:
+    """A worker's live tracker plus the states other workers publish.
+
+    Queries sum per-tracker windows instead of merging, and other workers'
+    files are re-read only when their mtime changes, at most once every
+    ``refresh_seconds``. A query therefore costs O(workers), not a load and
+    merge of every file.
+
+    Args:
+        directory: Shared directory of ``*.npz`` worker states.
+        own: This worker's tracker (read live).
+        own_path: This worker's file in ``directory`` (excluded).
+        refresh_seconds: Shortest time between directory scans.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        own: RollingAnalytics,
+        own_path: Optional[str] = None,
+        refresh_seconds: float = 5.0,
+    ):
+        self.directory = directory
+        self.own = own
+        self.own_path = own_path
+        self.refresh_seconds = refresh_seconds
+        self._others: Dict[str, Tuple[int, RollingAnalytics]] = {}
+        self._next_refresh = -math.inf
+        self._lock = threading.Lock()
+
+    @property
+    def horizon_seconds(self) -> int:
+        return self.own.horizon_seconds
+
+    def _compatible(self, tracker: RollingAnalytics) -> bool:
+        own = self.own
+        return (tracker.bucket_seconds, tracker.horizon_seconds, tracker.aspects) == (
+            own.bucket_seconds, own.horizon_seconds, own.aspects
+        )
+
+    def refresh(self) -> None:
+        """Re-read the worker files that changed since the last scan."""
+        others = {}
+        for path, mtime_ns in _worker_files(
+            self.directory, self.own_path, self.own.horizon_seconds, self.own.clock()
+        ):
+            cached = self._others.get(path)
+            if cached is not None and cached[0] == mtime_ns:
+                others[path] = cached
+                continue
+            try:
+                tracker = RollingAnalytics.load(path, self.own.clock)
+            except (OSError, ValueError, KeyError):
+                if cached is not None:
+                    others[path] = cached  # mid-write: keep the previous state
+                continue
+            if self._compatible(tracker):
+                others[path] = (mtime_ns, tracker)
+        self._others = others
+
+    def _trackers(self) -> List[RollingAnalytics]:
+        with self._lock:
+            if time.monotonic() >= self._next_refresh:
+                self.refresh()
+                self._next_refresh = time.monotonic() + self.refresh_seconds
+            return [self.own] + [tracker for _, tracker in self._others.values()]
+
+    @property
+    def workers(self) -> int:
+        """Trackers answering queries (this worker included)."""
+        return len(self._trackers())
+
+    def window(self, seconds: float, now: Optional[float] = None) -> np.ndarray:
+        now = self.own.clock() if now is None else now
+        return sum(tracker.window(seconds, now) for tracker in self._trackers())
+
+    def summary(self, seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        return self.own.summarise(self.window(seconds, now))
@@ -0,0 +1,189 @@
+"""
+shadow_scoring.py - Sampled Shadow Scoring of a Candidate Model
+================================================================
+Compares a candidate backend with the serving one on live traffic before
+it is promoted, without touching the request path:
+
+    - ``submit`` is called after the primary response has been sent. It
+      samples a fraction of requests and hands them to a bounded queue
+      with a non-blocking put; when the queue is full the sample is dropped
+      and counted, never waited for.
+    - A daemon worker thread scores queued reviews with the shadow backend
+      and records agreement, the confidence delta (shadow - primary, in
+      probability of the positive class) and the shadow latency.
+    - Records live in a fixed-size ring buffer, so memory stays bounded;
+      ``summary`` aggregates the current window plus lifetime counters.
+
+Usage:
+    from shadow_scoring import ShadowScorer
+
+    shadow = ShadowScorer(candidate_backend, sample_rate=0.1)
+    shadow.start()
+    shadow.submit(text, primary_label, primary_confidence)   # after responding
+    shadow.summary()
+    shadow.stop()
+"""
+
+import time
+import queue
+import random
+import logging
+import threading
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 0.1
+DEFAULT_BUFFER_SIZE = 1000
+DEFAULT_QUEUE_SIZE = 256
+
+# (timestamp, agree, primary_label, shadow_label, delta, latency_ms)
+ShadowRecord = Tuple[float, bool, int, int, float, float]
+
+
+def _positive_probability(label: int, confidence: float) -> float:
+    return confidence if label == 1 else 1.0 - confidence
+
+
+class ShadowScorer:
+    """Background comparison of a shadow backend against the primary model.
+
+    Args:
+        backend: Candidate backend (``predict(texts) -> [(label, confidence)]``).
+        sample_rate: Fraction of submitted requests that are shadow-scored.
+        buffer_size: Records kept for ``summary`` (oldest are overwritten).
+        queue_size: Pending samples allowed before new ones are dropped.
+        seed: Seed for the sampling decision (tests).
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        *,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        seed: Optional[int] = None,
+    ):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be in [0, 1], got {sample_rate}")
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self._random = random.Random(seed)
+        self._queue: "queue.Queue[Optional[Tuple[str, int, float]]]" = queue.Queue(
+            maxsize=queue_size
+        )
+        # deque.append is atomic; summary() copies before aggregating
+        self._records: "deque[ShadowRecord]" = deque(maxlen=buffer_size)
+        self._counters = {"submitted": 0, "sampled": 0, "dropped": 0, "scored": 0, "errors": 0}
+        self._worker: Optional[threading.Thread] = None
+
+    # -- request side ------------------------------------------------------------
+
+    def submit(self, text: str, label: int, confidence: float) -> bool:
+        """Maybe queue one primary prediction for shadow scoring (never blocks).
+
+        Args:
+            text: Review text the primary model scored.
+            label: Primary predicted label.
+            confidence: Primary confidence in ``label`` (0-1).
+
+        Returns:
+            True if the request was queued.
+        """
+        self._counters["submitted"] += 1
+        if self._random.random() >= self.sample_rate:
+            return False
+        self._counters["sampled"] += 1
+        try:
+            self._queue.put_nowait((text, int(label), float(confidence)))
+        except queue.Full:
+            self._counters["dropped"] += 1
+            return False
+        return True
+
+    # -- worker side -------------------------------------------------------------
+
+    def score(self, text: str, label: int, confidence: float) -> ShadowRecord:
+        """Score one sample with the shadow backend and record the comparison."""
+        start = time.perf_counter()
+        shadow_label, shadow_confidence = self.backend.predict([text])[0]
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        record = (
+            time.time(),
+            int(shadow_label) == label,
+            label,
+            int(shadow_label),
+            _positive_probability(int(shadow_label), float(shadow_confidence))
+            - _positive_probability(label, confidence),
+            latency_ms,
+        )
+        self._records.append(record)
+        self._counters["scored"] += 1
+        return record
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self.score(*item)
+            except Exception:
+                self._counters["errors"] += 1
+                logger.exception("Shadow scoring failed")
+
+    def start(self) -> None:
+        """Start the background worker thread."""
+        if self._worker is not None:
+            return
+        self._worker = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Finish queued samples, then stop the worker."""
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._worker.join(timeout)
+        self._worker = None
+
+    # -- reporting ---------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """Agreement, confidence deltas and latency over the ring buffer."""
+        records = list(self._records)
+        summary: Dict[str, Any] = {
+            "shadow": getattr(self.backend, "name", type(self.backend).__name__),
+            "sample_rate": self.sample_rate,
+            "window": len(records),
+            "queued": self._queue.qsize(),
+            **self._counters,
+        }
+        if not records:
+            return summary
+
+        _, agree, primary, shadow, delta, latency = (np.array(column) for column in zip(*records))
+        summary.update(
+            window_start=float(records[0][0]),
+            agreement_rate=float(agree.mean()),
+            flips={
+                "negative_to_positive": int(((primary == 0) & (shadow == 1)).sum()),
+                "positive_to_negative": int(((primary == 1) & (shadow == 0)).sum()),
+            },
+            confidence_delta={
+                "mean": float(delta.mean()),
+                "mean_abs": float(np.abs(delta).mean()),
+                "max_abs": float(np.abs(delta).max()),
+            },
+            latency_ms={
+                "p50": float(np.percentile(latency, 50)),
+                "p90": float(np.percentile(latency, 90)),
+                "p99": float(np.percentile(latency, 99)),
+                "mean": float(latency.mean()),
+            },
+        )
+        return summary
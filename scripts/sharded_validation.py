@@ -0,0 +1,257 @@
+"""
+sharded_validation.py - Parallel, Streaming Dataset Validation
+===============================================================
+Validates review dumps that are too large to load with one
+``pd.read_csv``: many TSV shards, a single multi-gigabyte file, or both.
+
+Every file is cut into byte ranges of about ``chunk_bytes`` that end on a
+line boundary (rows never contain raw newlines, because validation reads
+with ``quoting=3``). A process pool computes the mergeable statistics of
+data_validation.py for each range, and the partial statistics are folded
+together with ``merge_statistics`` into the usual report. Memory stays
+bounded by roughly ``processes x chunk_bytes`` plus the duplicate sketch.
+
+The near-duplicate check is off by default here: it keeps a MinHash
+signature per row (512 bytes with the default 128 permutations).
+
+Usage:
+    # Python API
+    from sharded_validation import validate_shards
+
+    report = validate_shards(["part-0.tsv", "part-1.tsv"], processes=8)
+
+    # CLI
+    python sharded_validation.py dump/*.tsv --processes 8 --chunk-mb 64
+"""
+
+import io
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from data_validation import (
+    DEFAULT_DUPLICATE_SKETCH_SIZE,
+    DEFAULT_LSH_BANDS,
+    DEFAULT_MAX_IMBALANCE_RATIO,
+    DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+    DEFAULT_NUM_PERM,
+    _print_report,
+    check_file_exists,
+    compute_statistics,
+    finish_report,
+    merge_statistics,
+    new_report,
+)
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+DEFAULT_CHUNK_BYTES = 64 << 20
+
+# (path, start offset, end offset, column names, delimiter, statistics options)
+RangeTask = Tuple[str, int, int, List[str], str, Dict[str, Any]]
+
+
+def read_columns(filepath: str, delimiter: str = "\t") -> List[str]:
+    """Column names from the header line of ``filepath``."""
+    with open(filepath, "rb") as f:
+        header = f.readline()
+    return list(pd.read_csv(io.BytesIO(header), delimiter=delimiter, quoting=3, nrows=0).columns)
+
+
+def plan_ranges(filepath: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """Split the data rows of ``filepath`` into line-aligned byte ranges."""
+    if chunk_bytes <= 0:
+        raise ValueError("chunk_bytes must be positive")
+    ranges = []
+    with open(filepath, "rb") as f:
+        f.readline()  # header
+        start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()  # finish the row the cut landed in
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def range_statistics(task: RangeTask) -> Dict[str, Any]:
+    """Statistics of one byte range (runs in a worker process)."""
+    path, start, end, columns, delimiter, options = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    df = pd.read_csv(
+        io.BytesIO(data),
+        delimiter=delimiter,
+        quoting=3,
+        header=None,
+        names=columns,
+        index_col=False,
+    )
+    return compute_statistics(df, **options)
+
+
+def shard_statistics(
+    filepaths: Sequence[str],
+    *,
+    processes: Optional[int] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    delimiter: str = "\t",
+    **options,
+) -> Tuple[Dict[str, Any], int]:
+    """Merged statistics of every shard, computed range by range.
+
+    Args:
+        filepaths: Shards in row order (cluster positions follow it).
+        processes: Worker processes (``None`` = all cores, 1 = in-process).
+        chunk_bytes: Approximate size of the range each task reads.
+        delimiter: Column delimiter shared by all shards.
+        **options: Forwarded to ``compute_statistics``.
+
+    Returns:
+        ``(statistics, number of ranges)``.
+    """
+    # Bound the memory of the distinct-hash set; beyond it duplicates are estimated
+    options.setdefault("sketch_size", DEFAULT_DUPLICATE_SKETCH_SIZE)
+    tasks: List[RangeTask] = []
+    empty_stats = []
+    for path in filepaths:
+        columns = read_columns(path, delimiter)
+        ranges = plan_ranges(path, chunk_bytes)
+        if not ranges:
+            # Header-only shard: still contributes its columns
+            empty_stats.append(compute_statistics(pd.DataFrame(columns=columns), **options))
+        tasks.extend((path, start, end, columns, delimiter, options) for start, end in ranges)
+
+    def fold(partials) -> Optional[Dict[str, Any]]:
+        # Merge as results arrive so only one partial is held at a time
+        merged = None
+        for stats in partials:
+            merged = stats if merged is None else merge_statistics(merged, stats)
+        return merged
+
+    if processes == 1 or len(tasks) <= 1:
+        merged = fold(map(range_statistics, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            # map() yields in task order, so merged rows keep file order
+            merged = fold(pool.map(range_statistics, tasks))
+    for stats in empty_stats:
+        merged = stats if merged is None else merge_statistics(merged, stats)
+    return merged, len(tasks)
+
+
+def validate_shards(
+    filepaths: Sequence[str],
+    *,
+    processes: Optional[int] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    delimiter: str = "\t",
+    required_columns: Optional[set] = None,
+    max_imbalance_ratio: float = DEFAULT_MAX_IMBALANCE_RATIO,
+    near_duplicates: bool = False,
+    near_duplicate_threshold: float = DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    lsh_bands: int = DEFAULT_LSH_BANDS,
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """Validate one or more shards in parallel; same report as ``validate_dataset``.
+
+    Args:
+        filepaths: TSV/CSV shards sharing one header layout.
+        processes: Worker processes (``None`` = all cores, 1 = in-process).
+        chunk_bytes: Approximate bytes read per task.
+        near_duplicates: Also run the MinHash/LSH check (keeps one signature
+            per row in memory).
+
+    The remaining arguments match ``validate_dataset``.
+    """
+    report = new_report()
+
+    # --- File existence ---
+    for path in filepaths:
+        file_check = check_file_exists(path)
+        report["checks"].append(file_check)
+        if not file_check["passed"]:
+            report["is_valid"] = False
+            report["errors"].append(file_check["details"])
+    if not filepaths or not report["is_valid"]:
+        if not filepaths:
+            report["is_valid"] = False
+            report["errors"].append("No shards given")
+        if verbose:
+            _print_report(report)
+        return report
+
+    # --- Statistics per range, merged ---
+    try:
+        stats, n_ranges = shard_statistics(
+            filepaths,
+            processes=processes,
+            chunk_bytes=chunk_bytes,
+            delimiter=delimiter,
+            minhash=near_duplicates,
+            num_perm=num_perm,
+        )
+    except Exception as exc:
+        error_msg = f"Failed to load dataset: {exc}"
+        report["is_valid"] = False
+        report["errors"].append(error_msg)
+        report["checks"].append(
+            {"check": "load_dataset", "passed": False, "details": error_msg}
+        )
+        if verbose:
+            _print_report(report)
+        return report
+
+    report["summary"]["shards"] = len(filepaths)
+    report["summary"]["ranges"] = n_ranges
+    finish_report(
+        report,
+        stats,
+        required_columns=required_columns,
+        max_imbalance_ratio=max_imbalance_ratio,
+        near_duplicate_threshold=near_duplicate_threshold,
+        lsh_bands=lsh_bands,
+    )
+
+    if verbose:
+        _print_report(report)
+
+    return report
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate large or sharded review dumps.")
+    parser.add_argument("filepaths", nargs="+", help="TSV/CSV shard(s)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_BYTES / (1 << 20))
+    parser.add_argument("--delimiter", default="\t")
+    parser.add_argument("--near-duplicates", action="store_true",
+                        help="Also run the MinHash/LSH near-duplicate check")
+    args = parser.parse_args()
+
+    report = validate_shards(
+        args.filepaths,
+        processes=args.processes,
+        chunk_bytes=int(args.chunk_mb * (1 << 20)),
+        delimiter=args.delimiter,
+        near_duplicates=args.near_duplicates,
+    )
+
+    sys.exit(0 if report["is_valid"] else 1)
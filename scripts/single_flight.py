@@ -0,0 +1,52 @@
+"""
+single_flight.py - Collapse Concurrent Identical Inference Calls
+================================================================
+When the same review is submitted by many clients at once, every request
+would run the same forward pass. ``SingleFlight`` keys each call: the
+first caller for a key starts the work (in the threadpool) and every
+caller arriving while it is in flight awaits the same task and receives
+the same result (or exception).
+
+This is not a cache: once the call finishes its key is forgotten, so a
+later request recomputes (and sees a hot-swapped model).
+
+Usage:
+    flights = SingleFlight()
+    result = await flights.do(("mnb:v3", "great food"), backend.predict, ["great food"])
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, Hashable
+
+from starlette.concurrency import run_in_threadpool
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent blocking calls on one event loop."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.stats = {"calls": 0, "executions": 0, "collapsed": 0}
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every waiter went away
+
+    async def do(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """Return ``func(*args)``, sharing one execution per in-flight ``key``."""
+        self.stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["executions"] += 1
+            task = asyncio.ensure_future(run_in_threadpool(func, *args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.stats["collapsed"] += 1
+        # A caller that disconnects must not cancel the others' result
+        return await asyncio.shield(task)
+
+    def summary(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._inflight), **self.stats}
@@ -0,0 +1,99 @@
+"""
+sparse_features.py - Count-Once Sparse TF-IDF Features
+=======================================================
+Helpers for evaluating several vocabulary sizes without refitting a
+``TfidfVectorizer`` per candidate. The corpus is tokenised and counted
+once; each ``max_features`` candidate is then a column slice of the shared
+sparse count matrix followed by a cheap TF-IDF reweighting. Nothing is
+ever densified.
+
+The selected columns match ``TfidfVectorizer(max_features=k)`` exactly
+(same terms, same alphabetical column order, same IDF weights), so models
+trained on the slices are interchangeable with the ones the vectoriser
+would have produced.
+
+Usage:
+    from sparse_features import count_corpus, top_k_columns, tfidf_from_counts
+
+    counter, counts = count_corpus(corpus)
+    for k in (500, 1000, None):
+        cols = top_k_columns(counts, k)
+        X, idf = tfidf_from_counts(counts[:, cols])
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import (
+    CountVectorizer,
+    TfidfTransformer,
+    TfidfVectorizer,
+)
+
+
+def count_corpus(corpus: List[str]) -> Tuple[CountVectorizer, sp.csr_matrix]:
+    """Tokenise and count the corpus once with TfidfVectorizer's defaults.
+
+    Returns:
+        Tuple of (fitted CountVectorizer, CSR document-term count matrix).
+    """
+    counter = CountVectorizer()
+    counts = counter.fit_transform(corpus).tocsr()
+    return counter, counts
+
+
+def term_frequency_order(counts: sp.spmatrix) -> np.ndarray:
+    """Return column indices ordered the way ``max_features`` ranks them."""
+    tfs = np.asarray(counts.sum(axis=0)).ravel()
+    # Same expression as sklearn's CountVectorizer._limit_features so that
+    # ties between equally frequent terms are broken identically.
+    return (-tfs).argsort()
+
+
+def top_k_columns(
+    counts: sp.spmatrix,
+    k: Optional[int],
+    order: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Return the sorted column indices kept by ``max_features=k``.
+
+    Args:
+        counts: Document-term count matrix from ``count_corpus``.
+        k: Vocabulary size, or None to keep every term.
+        order: Precomputed ``term_frequency_order(counts)`` to reuse.
+
+    Returns:
+        Ascending column indices (alphabetical term order).
+    """
+    n_features = counts.shape[1]
+    if k is None or k >= n_features:
+        return np.arange(n_features)
+    if order is None:
+        order = term_frequency_order(counts)
+    return np.sort(order[:k])
+
+
+def tfidf_from_counts(counts: sp.spmatrix) -> Tuple[sp.csr_matrix, np.ndarray]:
+    """Apply TfidfVectorizer's default weighting to a count matrix.
+
+    Returns:
+        Tuple of (L2-normalised CSR TF-IDF matrix, IDF vector).
+    """
+    transformer = TfidfTransformer()
+    X = transformer.fit_transform(counts)
+    return X.tocsr(), transformer.idf_
+
+
+def build_vectorizer(feature_names: np.ndarray, idf: np.ndarray) -> TfidfVectorizer:
+    """Assemble a fitted TfidfVectorizer from a vocabulary slice and IDF weights.
+
+    The result transforms new text exactly like a vectoriser fitted with
+    ``max_features=len(feature_names)`` on the same corpus, without another
+    pass over the data.
+    """
+    vectorizer = TfidfVectorizer(
+        vocabulary={term: i for i, term in enumerate(feature_names)}
+    )
+    vectorizer.idf_ = np.asarray(idf, dtype=np.float64)
+    return vectorizer
@@ -13,6 +13,7 @@ Requires:
 
 import sys
 import os
+import json
 
 import pytest
 import pytest_asyncio
@@ -21,6 +22,7 @@ import pytest_asyncio
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from httpx import AsyncClient, ASGITransport
+import main
 from main import app
 
 
@@ -54,6 +56,10 @@ class TestHealthEndpoint:
         data = response.json()
         assert "debug" in data
 
+    async def test_health_reports_model_version(self, client):
+        response = await client.get("/health")
+        assert response.json()["model"]
+
 
 # ── Predict API ──────────────────────────────────────────────────────────
 
@@ -102,6 +108,16 @@ class TestPredictAPI:
         assert isinstance(data["confidence"], (int, float))
         assert 0 <= data["confidence"] <= 100
 
+    async def test_aspects_split_on_line_breaks(self, client):
+        """Line breaks separate sentences; they are not normalised away."""
+        response = await client.post(
+            "/api/predict",
+            json={"message": "The food was great\nThe waiter was rude and slow", "aspects": True},
+        )
+        assert response.status_code == 200
+        sentences = [s["text"] for s in response.json()["sentences"]]
+        assert sentences == ["The food was great", "The waiter was rude and slow"]
+
 
 # ── Error Handling ───────────────────────────────────────────────────────
 
@@ -167,6 +183,69 @@ class TestErrorHandling:
         assert response.status_code in (200, 422)
 
 
+# ── Admin Endpoints ──────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+class TestAdminEndpoints:
+    """Admin routes must not be reachable without the admin token."""
+
+    async def test_list_models_requires_token(self, client):
+        response = await client.get("/admin/models")
+        assert response.status_code == 403
+
+    async def test_activate_requires_token(self, client):
+        response = await client.post(
+            "/admin/models/activate",
+            json={"version": "20260101_000000"},
+            headers={"X-Admin-Token": "wrong"},
+        )
+        assert response.status_code == 403
+
+    async def test_training_requires_token(self, client):
+        response = await client.post(
+            "/admin/training", json={"reviews": ["Great pasta"], "labels": [1]}
+        )
+        assert response.status_code == 403
+
+
+# ── Live Analysis WebSocket ──────────────────────────────────────────────
+
+
+class TestLiveWebSocket:
+    """Origin checks and the per-IP live inference budget."""
+
+    @pytest.mark.parametrize("origin", [main.ALLOWED_ORIGINS[0], "http://testserver"])
+    def test_allowed_or_same_origin_gets_scored(self, origin):
+        from starlette.testclient import TestClient
+
+        with TestClient(app).websocket_connect("/api/ws/predict", headers={"origin": origin}) as ws:
+            ws.send_text(json.dumps({"revision": 1, "message": "The food was great"}))
+            reply = ws.receive_json()
+        assert reply["revision"] == 1
+        assert reply["prediction"] in (0, 1)
+
+    def test_foreign_origin_rejected(self):
+        from starlette.testclient import TestClient
+        from starlette.websockets import WebSocketDisconnect
+
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with TestClient(app).websocket_connect(
+                "/api/ws/predict", headers={"origin": "https://evil.example"}
+            ):
+                pass
+        assert exc_info.value.code == 1008
+
+    def test_budget_is_per_ip(self, monkeypatch):
+        from limits import parse
+
+        monkeypatch.setattr(main, "live_rate_limit", parse("2/minute"))
+        assert main.live_budget("203.0.113.7") == 0
+        assert main.live_budget("203.0.113.7") == 0
+        assert main.live_budget("203.0.113.7") > 0
+        assert main.live_budget("203.0.113.8") == 0
+
+
 # ── Root Endpoint ────────────────────────────────────────────────────────
 
 
@@ -0,0 +1,90 @@
+"""
+test_aspects.py - Tests for Aspect-Level Sentiment
+===================================================
+Tests for aspects.py covering sentence splitting, aspect tagging,
+per-aspect aggregation and the single batched backend call.
+
+Run:
+    pytest tests/test_aspects.py -v
+"""
+
+import sys
+import os
+
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from aspects import GENERAL, analyse_aspects, split_sentences, tag_aspects
+
+
+class KeywordBackend:
+    """Negative when a text mentions a complaint word; records every call."""
+
+    name = "keyword"
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, texts):
+        self.calls.append(list(texts))
+        return [
+            (0, 0.8) if any(w in t.lower() for w in ("waited", "rude", "pricey")) else (1, 0.9)
+            for t in texts
+        ]
+
+
+class TestSplitAndTag:
+    """Sentence boundaries and keyword aspects."""
+
+    def test_split_sentences(self):
+        text = "Great pasta! We waited an hour... Staff was rude;  never again\nCheap though."
+        assert split_sentences(text) == [
+            "Great pasta!", "We waited an hour...", "Staff was rude;", "never again",
+            "Cheap though.",
+        ]
+
+    def test_no_sentence_breaks(self):
+        assert split_sentences("  loved it  ") == ["loved it"]
+
+    @pytest.mark.parametrize("sentence, expected", [
+        ("We waited forever", ["wait_time"]),
+        ("So tasty and fresh", ["taste"]),
+        ("Way too expensive", ["price"]),
+        ("Our waitress was lovely", ["staff"]),
+        ("Loud music, cozy decor", ["atmosphere"]),
+        ("Rude staff and cold food", ["taste", "staff"]),
+        ("Would come back", [GENERAL]),
+    ])
+    def test_tag_aspects(self, sentence, expected):
+        assert tag_aspects(sentence) == expected
+
+
+class TestAnalyseAspects:
+    """One batched call yields the review verdict and every aspect."""
+
+    def test_single_batched_call(self):
+        backend = KeywordBackend()
+        review = "The food was delicious. We waited an hour. The waiter was rude. Great vibe."
+        result = analyse_aspects(backend, review)
+        assert len(backend.calls) == 1
+        assert backend.calls[0] == [review] + split_sentences(review)
+        assert result["prediction"] == 0
+
+        aspects = result["aspects"]
+        assert aspects["taste"]["sentiment"] == "positive"
+        assert aspects["wait_time"]["sentiment"] == "negative"
+        assert aspects["staff"]["sentiment"] == "negative"
+        assert aspects["atmosphere"]["sentiment"] == "positive"
+        assert len(result["sentences"]) == 4
+
+    def test_aspect_confidence_averages_sentences(self):
+        backend = KeywordBackend()
+        result = analyse_aspects(backend, "Food was great. Food was pricey.")
+        taste = result["aspects"]["taste"]
+        # P(positive) = (0.9 + 0.2) / 2 = 0.55
+        assert taste["prediction"] == 1
+        assert taste["confidence"] == pytest.approx(55.0)
+        assert taste["mentions"] == 2
@@ -0,0 +1,145 @@
+"""
+test_autotune.py - Tests for the Worker / Thread Autotuner
+===========================================================
+Tests for autotune.py covering the search grid, the serving recommendation
+under a latency target at serving call shapes, the separate offline batch
+size recommendation and an end-to-end run of a small artefact in two
+concurrent worker processes.
+
+Run:
+    pytest tests/test_autotune.py -v
+"""
+
+import sys
+import os
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from autotune import (
+    env_lines, offline_args, powers_of_two, recommend, recommend_offline, run_autotune, thread_grid,
+)
+from compiled_scorer import CompiledScorer
+from model_artefact import save_artefact
+
+REVIEWS = [
+    ("Wow... Loved this place.", 1),
+    ("Crust is not good.", 0),
+    ("Service was slow and the food was cold.", 0),
+    ("Great food and friendly staff.", 1),
+] * 5
+
+
+def _result(workers, intra, batch, calls_per_s, p99):
+    return {
+        "workers": workers, "intra_op": intra, "inter_op": 1, "batch_size": batch,
+        "calls_per_s": calls_per_s, "throughput_per_s": calls_per_s * batch,
+        "batch_latency_ms": {"p50": p99 / 2, "p99": p99},
+    }
+
+
+class TestGrid:
+    """Candidate combinations."""
+
+    def test_powers_of_two(self):
+        assert powers_of_two(1) == [1]
+        assert powers_of_two(8) == [1, 2, 4, 8]
+        assert powers_of_two(6) == [1, 2, 4, 6]
+
+    def test_skips_oversubscription(self):
+        grid = thread_grid([1, 2, 4], [1, 2, 4], [1], cores=4)
+        assert all(c["workers"] * c["intra_op"] <= 4 for c in grid)
+        assert len(grid) == 6
+        assert len(thread_grid([1, 2, 4], [1, 2, 4], [1], cores=4, oversubscribe=True)) == 9
+
+
+class TestRecommend:
+    """Serving: most requests/s under the latency target at serving shapes."""
+
+    def test_best_throughput_within_target(self):
+        results = [
+            _result(1, 4, 1, 900.0, 350.0),  # fastest but too slow per request
+            _result(2, 2, 1, 600.0, 120.0),
+            _result(4, 1, 1, 400.0, 20.0),
+            _result(1, 1, 32, 100.0, 90.0),  # offline batch: 3200 reviews/s, not serving
+            {"workers": 8, "intra_op": 1, "inter_op": 1, "batch_size": 1, "skipped": "OOM"},
+        ]
+        best = recommend(results, latency_target_ms=200.0, serving_shapes=[1])
+        assert (best["workers"], best["intra_op"]) == (2, 2)
+        assert best["requests_per_s"] == 600.0
+        assert env_lines(best) == [
+            "WEB_CONCURRENCY=2", "TORCH_NUM_THREADS=2", "TORCH_INTEROP_THREADS=1",
+        ]
+
+    def test_every_shape_must_meet_target(self):
+        results = [
+            _result(1, 1, 1, 500.0, 50.0), _result(1, 1, 5, 200.0, 300.0),  # aspects too slow
+            _result(2, 1, 1, 300.0, 60.0), _result(2, 1, 5, 100.0, 150.0),
+        ]
+        best = recommend(results, latency_target_ms=200.0, serving_shapes=[1, 5])
+        assert best["workers"] == 2
+        assert best["requests_per_s"] == 200.0  # mean over the shapes
+
+    def test_falls_back_to_lowest_latency(self):
+        results = [_result(1, 1, 1, 900.0, 350.0), _result(2, 1, 1, 500.0, 250.0)]
+        assert recommend(results, latency_target_ms=100.0)["workers"] == 2
+
+    def test_nothing_measured(self):
+        assert recommend([], 100.0) is None
+
+
+class TestRecommendOffline:
+    """Offline: batch size chosen for reviews/s alone."""
+
+    def test_largest_throughput(self):
+        results = [
+            _result(1, 4, 1, 900.0, 1.0),
+            _result(1, 4, 32, 100.0, 400.0),
+            _result(2, 2, 8, 150.0, 50.0),
+        ]
+        offline = recommend_offline(results, [8, 32])
+        assert offline == {
+            "processes": 1, "torch_threads": 4, "batch_size": 32, "reviews_per_s": 3200.0,
+        }
+        assert offline_args(offline) == "--processes 1 --torch-threads 4 --batch-size 32"
+        assert recommend_offline(results, []) is None
+
+
+class TestRunAutotune:
+    """End to end: concurrent workers scoring a small artefact."""
+
+    def test_artefact_backend(self, tmp_path):
+        dataset = tmp_path / "reviews.tsv"
+        dataset.write_text(
+            "Review\tLiked\n" + "".join(f"{text}\t{label}\n" for text, label in REVIEWS)
+        )
+        texts = [text.lower() for text, _ in REVIEWS]
+        labels = [label for _, label in REVIEWS]
+        vectorizer = TfidfVectorizer().fit(texts)
+        classifier = MultinomialNB().fit(vectorizer.transform(texts), labels)
+        path = save_artefact(
+            str(tmp_path / "models"),
+            CompiledScorer.from_sklearn(vectorizer, classifier),
+            version="v1",
+            metadata={"preprocess": {"lemmatize": False, "remove_stopwords": False}},
+        )
+
+        grid = thread_grid([1, 2], [1], [1], cores=1, oversubscribe=True)
+        report = run_autotune(
+            f"artefact:{path}", grid, [1], [4], dataset_path=str(dataset), duration=0.2
+        )
+        assert len(report["results"]) == 4
+        assert all(r["throughput_per_s"] > 0 for r in report["results"])
+        assert report["recommended"]["workers"] in (1, 2)
+        assert report["env"][0].startswith("WEB_CONCURRENCY=")
+        assert report["offline"]["batch_size"] == 4
+
+    def test_failed_backend_is_skipped(self, tmp_path):
+        grid = [{"workers": 1, "intra_op": 1, "inter_op": 1}]
+        report = run_autotune("nope", grid, [1], duration=0.1)
+        assert "Unknown backend" in report["results"][0]["skipped"]
+        assert report["recommended"] is None
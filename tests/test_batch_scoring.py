@@ -0,0 +1,173 @@
+"""
+test_batch_scoring.py - Tests for Resumable Offline Batch Scoring
+==================================================================
+Tests for batch_scoring.py covering chunked TSV/JSONL reading, scoring
+in-process and in a process pool, and resuming an interrupted job from
+its checkpoint with the same output as an uninterrupted run.
+
+Run:
+    pytest tests/test_batch_scoring.py -v
+"""
+
+import sys
+import os
+import json
+
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from batch_scoring import checkpoint_path, infer_format, read_chunks, score_file
+from compiled_scorer import CompiledScorer
+from model_artefact import save_artefact
+
+REVIEWS = [
+    ("Wow... Loved this place.", 1),
+    ("Crust is not good.", 0),
+    ("Service was slow and the food was cold.", 0),
+    ("Great food and friendly staff.", 1),
+    ('He said "meh" about the soup.', 0),
+] * 5
+
+
+@pytest.fixture(scope="module")
+def backend_spec(tmp_path_factory):
+    texts = [text.lower() for text, _ in REVIEWS]
+    labels = [label for _, label in REVIEWS]
+    vectorizer = TfidfVectorizer().fit(texts)
+    classifier = MultinomialNB().fit(vectorizer.transform(texts), labels)
+    path = save_artefact(
+        str(tmp_path_factory.mktemp("models")),
+        CompiledScorer.from_sklearn(vectorizer, classifier),
+        version="v1",
+        metadata={"preprocess": {"lemmatize": False, "remove_stopwords": False}},
+    )
+    return f"artefact:{path}"
+
+
+def _tsv(tmp_path):
+    path = tmp_path / "reviews.tsv"
+    path.write_text("Review\tLiked\n" + "".join(f"{t}\t{l}\n" for t, l in REVIEWS))
+    return str(path)
+
+
+def _lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestReading:
+    """Chunks, offsets and formats."""
+
+    def test_tsv_chunks_from_offset(self, tmp_path):
+        chunks = list(read_chunks(_tsv(tmp_path), "tsv", chunk_size=10, start_row=7))
+        assert [len(c) for c in chunks] == [10, 8]
+        assert chunks[0].index[0] == 7
+        assert chunks[0]["Review"].iloc[2] == 'He said "meh" about the soup.'
+
+    @pytest.mark.parametrize("fmt, sep", [("tsv", "\t"), ("csv", ",")])
+    def test_resume_offset_counts_rows_not_blank_lines(self, tmp_path, fmt, sep):
+        path = tmp_path / f"reviews.{fmt}"
+        path.write_text(f"Review{sep}Liked\nA{sep}1\n\nB{sep}0\nC{sep}1\nD{sep}0\n")
+        whole = next(read_chunks(str(path), fmt, chunk_size=10))
+        assert whole["Review"].tolist() == ["A", "B", "C", "D"]
+        resumed = next(read_chunks(str(path), fmt, chunk_size=10, start_row=2))
+        assert resumed["Review"].tolist() == ["C", "D"]
+        assert list(resumed.index) == [2, 3]
+
+    def test_jsonl_chunks_from_offset(self, tmp_path):
+        path = tmp_path / "reviews.jsonl"
+        path.write_text("".join(json.dumps({"text": t}) + "\n" for t, _ in REVIEWS))
+        chunks = list(read_chunks(str(path), "jsonl", chunk_size=4, start_row=22))
+        assert [list(c.index) for c in chunks] == [[22, 23, 24]]
+
+    def test_infer_format(self):
+        assert infer_format("a.ndjson", ("tsv", "csv", "jsonl")) == "jsonl"
+        with pytest.raises(ValueError):
+            infer_format("a.xlsx", ("tsv", "csv", "jsonl"))
+
+
+class TestScoring:
+    """Output rows, in input order, from one process or a pool."""
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_scores_every_row_in_order(self, tmp_path, backend_spec, processes):
+        output = str(tmp_path / "scores.jsonl")
+        state = score_file(_tsv(tmp_path), output, backend=backend_spec,
+                           chunk_size=4, processes=processes, verbose=False)
+        rows = _lines(output)
+        assert state["complete"] and state["rows_done"] == len(REVIEWS)
+        assert [r["id"] for r in rows] == list(range(len(REVIEWS)))
+        assert all(r["prediction"] in (0, 1) and 0.5 <= r["confidence"] <= 1.0 for r in rows)
+
+    def test_jsonl_input_with_ids_and_blank_text(self, tmp_path, backend_spec):
+        path = tmp_path / "reviews.jsonl"
+        path.write_text(
+            json.dumps({"review_id": "a", "text": "Great food"}) + "\n"
+            + json.dumps({"review_id": "b", "text": "  "}) + "\n"
+        )
+        output = str(tmp_path / "scores.jsonl")
+        score_file(str(path), output, backend=backend_spec, text_column="text",
+                   id_column="review_id", processes=1, verbose=False)
+        rows = _lines(output)
+        assert [r["id"] for r in rows] == ["a", "b"]
+        assert rows[1] == {"id": "b", "prediction": None, "confidence": None}
+
+    def test_missing_text_column(self, tmp_path, backend_spec):
+        with pytest.raises(KeyError, match="text"):
+            score_file(_tsv(tmp_path), str(tmp_path / "o.jsonl"), backend=backend_spec,
+                       text_column="text", processes=1, verbose=False)
+
+
+class TestResume:
+    """An interrupted job continues from its checkpoint."""
+
+    def test_resume_matches_uninterrupted_run(self, tmp_path, backend_spec):
+        tsv = _tsv(tmp_path)
+        full = str(tmp_path / "full.jsonl")
+        score_file(tsv, full, backend=backend_spec, chunk_size=4, processes=1, verbose=False)
+
+        output = str(tmp_path / "scores.jsonl")
+        paused = score_file(tsv, output, backend=backend_spec, chunk_size=4,
+                            processes=1, max_chunks=2, verbose=False)
+        assert not paused["complete"] and paused["rows_done"] == 8
+        # Simulate a kill after writing part of the next chunk
+        with open(output, "a") as f:
+            f.write('{"id": 8, "predic')
+
+        resumed = score_file(tsv, output, backend=backend_spec, chunk_size=4,
+                             processes=2, verbose=False)
+        assert resumed["complete"]
+        assert _lines(output) == _lines(full)
+
+    def test_resume_over_blank_lines(self, tmp_path, backend_spec):
+        tsv = tmp_path / "gappy.tsv"
+        tsv.write_text("Review\tLiked\n" + "".join(
+            f"{t}\t{l}\n" + ("\n" if i % 3 == 0 else "") for i, (t, l) in enumerate(REVIEWS)
+        ))
+        full = str(tmp_path / "full.jsonl")
+        score_file(str(tsv), full, backend=backend_spec, chunk_size=4, processes=1, verbose=False)
+
+        output = str(tmp_path / "scores.jsonl")
+        score_file(str(tsv), output, backend=backend_spec, chunk_size=4, processes=1,
+                   max_chunks=2, verbose=False)
+        score_file(str(tsv), output, backend=backend_spec, chunk_size=4, processes=1,
+                   verbose=False)
+        assert _lines(output) == _lines(full)
+        assert [row["id"] for row in _lines(output)] == list(range(len(REVIEWS)))
+
+    def test_checkpoint_of_other_job_rejected(self, tmp_path, backend_spec):
+        tsv = _tsv(tmp_path)
+        output = str(tmp_path / "scores.jsonl")
+        score_file(tsv, output, backend=backend_spec, chunk_size=4, processes=1,
+                   max_chunks=1, verbose=False)
+        with pytest.raises(ValueError, match="different job"):
+            score_file(tsv, output, backend=backend_spec, chunk_size=5, processes=1, verbose=False)
+        state = score_file(tsv, output, backend=backend_spec, chunk_size=5, processes=1,
+                           restart=True, verbose=False)
+        assert state["complete"] and len(_lines(output)) == len(REVIEWS)
+        assert os.path.exists(checkpoint_path(output))
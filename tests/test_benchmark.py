@@ -0,0 +1,92 @@
+"""
+test_benchmark.py - Tests for the Backend Benchmark
+====================================================
+Tests for benchmark.py covering latency summaries, the Pareto front and
+an end-to-end run of a small artefact in a worker process.
+
+Run:
+    pytest tests/test_benchmark.py -v
+"""
+
+import sys
+import os
+
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from benchmark import latency_summary, load_backend, pareto_front, run_benchmark
+from compiled_scorer import CompiledScorer
+from model_artefact import save_artefact
+
+REVIEWS = [
+    ("Wow... Loved this place.", 1),
+    ("Crust is not good.", 0),
+    ("The selection on the menu was great and so were the prices.", 1),
+    ("Service was slow and the food was cold.", 0),
+    ("Great food and friendly staff.", 1),
+    ("Terrible, rude waiter and bland soup.", 0),
+] * 5
+
+
+def _result(spec, f1, p50, rss):
+    return {"spec": spec, "f1_weighted": f1, "single_latency_ms": {"p50": p50}, "peak_rss_mb": rss}
+
+
+class TestHelpers:
+    """Latency summaries and Pareto dominance."""
+
+    def test_latency_summary_in_ms(self):
+        summary = latency_summary([1_000_000, 2_000_000, 3_000_000])
+        assert summary["p50"] == pytest.approx(2.0)
+        assert summary["mean"] == pytest.approx(2.0)
+        assert summary["p50"] <= summary["p90"] <= summary["p99"]
+
+    def test_pareto_front(self):
+        results = [
+            _result("accurate", 0.95, 10.0, 900.0),
+            _result("fast", 0.80, 0.1, 150.0),
+            _result("dominated", 0.79, 0.2, 160.0),
+            {"spec": "missing", "skipped": "not installed"},
+        ]
+        assert pareto_front(results) == ["accurate", "fast"]
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown backend"):
+            load_backend("nope")
+
+
+class TestRunBenchmark:
+    """End to end: one artefact measured in a fresh worker process."""
+
+    def test_artefact_backend(self, tmp_path):
+        dataset = tmp_path / "reviews.tsv"
+        dataset.write_text(
+            "Review\tLiked\n" + "".join(f"{text}\t{label}\n" for text, label in REVIEWS)
+        )
+        texts = [text.lower() for text, _ in REVIEWS]
+        labels = [label for _, label in REVIEWS]
+        vectorizer = TfidfVectorizer().fit(texts)
+        classifier = MultinomialNB().fit(vectorizer.transform(texts), labels)
+        path = save_artefact(
+            str(tmp_path / "models"),
+            CompiledScorer.from_sklearn(vectorizer, classifier),
+            version="v1",
+            metadata={"preprocess": {"lemmatize": False, "remove_stopwords": False}},
+        )
+
+        report = run_benchmark(
+            [f"artefact:{path}", "nope"], dataset_path=str(dataset), batch_size=4
+        )
+        measured, skipped = report["results"]
+        assert report["n_test"] == 6
+        assert 0.0 <= measured["accuracy"] <= 1.0
+        assert measured["single_latency_ms"]["p50"] > 0
+        assert measured["throughput_per_s"] > 0
+        assert measured["peak_rss_mb"] > 0
+        assert measured["pareto"] is True
+        assert "Unknown backend" in skipped["skipped"]
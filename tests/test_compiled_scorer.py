@@ -0,0 +1,156 @@
+"""
+test_compiled_scorer.py - Tests for the NumPy-Only Compiled Scorer
+===================================================================
+Tests for compiled_scorer.py checking that compiled models (vocabulary
+and hashed) reproduce scikit-learn's predictions and probabilities,
+survive a save/load round-trip, and import without scikit-learn.
+
+Run:
+    pytest tests/test_compiled_scorer.py -v
+"""
+
+import sys
+import os
+import subprocess
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.utils import murmurhash3_32 as sklearn_murmurhash3_32
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from compiled_scorer import CompiledScorer, HashedScorer, murmurhash3_32
+
+TRAIN = [
+    ("food delicious service outstanding", 1),
+    ("terrible experience cold food rude staff waited hours", 0),
+    ("okay nothing special average food", 0),
+    ("best restaurant town amazing pasta great ambiance", 1),
+    ("worst meal ever never coming back", 0),
+    ("great food great staff", 1),
+]
+TEST = [
+    "great pasta",
+    "rude staff cold soup",
+    "",
+    "completely unknown words",
+    "Food FOOD food delicious",
+]
+
+
+def _fit(**vectorizer_kwargs):
+    texts, labels = zip(*TRAIN)
+    vectorizer = TfidfVectorizer(**vectorizer_kwargs).fit(texts)
+    classifier = MultinomialNB(alpha=0.2).fit(vectorizer.transform(texts), labels)
+    return vectorizer, classifier
+
+
+@pytest.mark.parametrize(
+    "vectorizer_kwargs",
+    [{}, {"sublinear_tf": True}, {"norm": "l1", "use_idf": False}, {"max_features": 5}],
+)
+class TestMatchesSklearn:
+    """Compiled scoring must agree with the sklearn pipeline."""
+
+    def test_predict(self, vectorizer_kwargs):
+        vectorizer, classifier = _fit(**vectorizer_kwargs)
+        scorer = CompiledScorer.from_sklearn(vectorizer, classifier)
+        expected = classifier.predict(vectorizer.transform(TEST))
+        np.testing.assert_array_equal(scorer.predict(TEST), expected)
+
+    def test_predict_proba(self, vectorizer_kwargs):
+        vectorizer, classifier = _fit(**vectorizer_kwargs)
+        scorer = CompiledScorer.from_sklearn(vectorizer, classifier)
+        expected = classifier.predict_proba(vectorizer.transform(TEST))
+        np.testing.assert_allclose(scorer.predict_proba(TEST), expected, atol=1e-12)
+
+    def test_score_one(self, vectorizer_kwargs):
+        vectorizer, classifier = _fit(**vectorizer_kwargs)
+        scorer = CompiledScorer.from_sklearn(vectorizer, classifier)
+        expected = classifier.predict_proba(vectorizer.transform(TEST))
+        for text, row in zip(TEST, expected):
+            label, proba = scorer.score_one(text)
+            assert label == classifier.classes_[row.argmax()]
+            np.testing.assert_allclose(proba, row, atol=1e-12)
+
+
+class TestCompiledScorer:
+    """Persistence and compile-time validation."""
+
+    def test_save_load_round_trip(self, tmp_path):
+        vectorizer, classifier = _fit()
+        scorer = CompiledScorer.from_sklearn(vectorizer, classifier)
+        path = str(tmp_path / "model.npz")
+        scorer.save(path)
+        loaded = CompiledScorer.load(path)
+        np.testing.assert_allclose(loaded.predict_proba(TEST), scorer.predict_proba(TEST))
+
+    def test_rejects_unsupported_vectorizer(self):
+        vectorizer, classifier = _fit(ngram_range=(1, 2))
+        with pytest.raises(ValueError):
+            CompiledScorer.from_sklearn(vectorizer, classifier)
+
+    def test_count_vectorizer(self):
+        texts, labels = zip(*TRAIN)
+        vectorizer = CountVectorizer().fit(texts)
+        classifier = MultinomialNB().fit(vectorizer.transform(texts), labels)
+        scorer = CompiledScorer.from_sklearn(vectorizer, classifier)
+        expected = classifier.predict_proba(vectorizer.transform(TEST))
+        np.testing.assert_allclose(scorer.predict_proba(TEST), expected, atol=1e-12)
+
+    def test_empty_batch(self):
+        scorer = CompiledScorer.from_sklearn(*_fit())
+        assert scorer.predict_proba([]).shape == (0, 2)
+
+    def test_import_does_not_load_sklearn(self):
+        out = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; import compiled_scorer; print('sklearn' in sys.modules)",
+            ],
+            cwd=os.path.join(PROJECT_ROOT, "scripts"),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert out.stdout.strip() == "False"
+
+
+class TestHashedScorer:
+    """Hashed features must land in the columns sklearn uses."""
+
+    @pytest.mark.parametrize("token", ["food", "", "crème", "x" * 37, "日本"])
+    def test_murmurhash_matches_sklearn(self, token):
+        assert murmurhash3_32(token.encode("utf-8")) == sklearn_murmurhash3_32(token)
+
+    def test_predict_proba(self):
+        texts, labels = zip(*TRAIN)
+        vectorizer = HashingVectorizer(n_features=2 ** 12, alternate_sign=False)
+        classifier = MultinomialNB(alpha=0.2).fit(vectorizer.transform(texts), labels)
+        scorer = HashedScorer.from_sklearn(vectorizer, classifier)
+        expected = classifier.predict_proba(vectorizer.transform(TEST))
+        np.testing.assert_allclose(scorer.predict_proba(TEST), expected, atol=1e-12)
+
+    def test_rejects_alternate_sign(self):
+        texts, labels = zip(*TRAIN)
+        vectorizer = HashingVectorizer(n_features=2 ** 12, alternate_sign=True, norm=None)
+        classifier = MultinomialNB().fit(abs(vectorizer.transform(texts)), labels)
+        with pytest.raises(ValueError, match="alternate_sign"):
+            HashedScorer.from_sklearn(vectorizer, classifier)
+
+    def test_save_load_round_trip(self, tmp_path):
+        texts, labels = zip(*TRAIN)
+        vectorizer = HashingVectorizer(n_features=2 ** 12, alternate_sign=False)
+        classifier = MultinomialNB(alpha=0.2).fit(vectorizer.transform(texts), labels)
+        scorer = HashedScorer.from_sklearn(vectorizer, classifier)
+        path = str(tmp_path / "hashed.npz")
+        scorer.save(path)
+        loaded = HashedScorer.load(path)
+        np.testing.assert_allclose(loaded.predict_proba(TEST), scorer.predict_proba(TEST))
+        with pytest.raises(ValueError, match="hashed-mnb"):
+            CompiledScorer.load(path)
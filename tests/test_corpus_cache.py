@@ -0,0 +1,103 @@
+"""
+test_corpus_cache.py - Tests for the Preprocessed Corpus Cache
+===============================================================
+Tests for corpus_cache.py covering round-trips, cache hits, and
+invalidation when the dataset or preprocessing options change.
+
+Run:
+    pytest tests/test_corpus_cache.py -v
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+import corpus_cache
+from corpus_cache import load_corpus, load_entry, save_entry
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = tmp_path / "reviews.tsv"
+    path.write_text(
+        "Review\tLiked\n"
+        "The food was great!\t1\n"
+        "Terrible, cold soup.\t0\n"
+        "Café was lovely\t1\n"
+    )
+    return str(path)
+
+
+@pytest.fixture
+def count_calls(monkeypatch):
+    """Count how many times the corpus is actually cleaned."""
+    calls = []
+    original = corpus_cache.preprocess_corpus
+
+    def _counting(texts, **kwargs):
+        calls.append(kwargs)
+        return original(texts, **kwargs)
+
+    monkeypatch.setattr(corpus_cache, "preprocess_corpus", _counting)
+    return calls
+
+
+class TestEntryStorage:
+    """Tests for the npz entry format."""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "entry.npz")
+        corpus = ["food great", "", "café lovely"]
+        save_entry(path, corpus, np.array([1, 0, 1]))
+        loaded, labels = load_entry(path)
+        assert loaded == corpus
+        assert labels.tolist() == [1, 0, 1]
+
+    def test_empty_corpus(self, tmp_path):
+        path = str(tmp_path / "entry.npz")
+        save_entry(path, [], np.array([], dtype=np.int64))
+        loaded, labels = load_entry(path)
+        assert loaded == []
+        assert len(labels) == 0
+
+
+class TestLoadCorpus:
+    """Tests for load_corpus caching behaviour."""
+
+    def test_second_call_hits_cache(self, dataset, tmp_path, count_calls):
+        cache = str(tmp_path / "cache")
+        first = load_corpus(dataset, cache_dir=cache, lemmatize=False)
+        second = load_corpus(dataset, cache_dir=cache, lemmatize=False)
+        assert len(count_calls) == 1
+        assert first[0] == second[0]
+        assert first[1].tolist() == second[1].tolist() == [1, 0, 1]
+
+    def test_config_change_invalidates(self, dataset, tmp_path, count_calls):
+        cache = str(tmp_path / "cache")
+        load_corpus(dataset, cache_dir=cache, lemmatize=False)
+        load_corpus(dataset, cache_dir=cache, lemmatize=False, remove_stopwords=False)
+        assert len(count_calls) == 2
+
+    def test_data_change_invalidates(self, dataset, tmp_path, count_calls):
+        cache = str(tmp_path / "cache")
+        load_corpus(dataset, cache_dir=cache, lemmatize=False)
+        with open(dataset, "a") as f:
+            f.write("Loved it\t1\n")
+        corpus, y = load_corpus(dataset, cache_dir=cache, lemmatize=False)
+        assert len(count_calls) == 2
+        assert len(corpus) == 4
+
+    def test_corrupt_entry_is_rebuilt(self, dataset, tmp_path, count_calls):
+        cache = tmp_path / "cache"
+        load_corpus(dataset, cache_dir=str(cache), lemmatize=False)
+        for entry in cache.iterdir():
+            entry.write_bytes(b"not an npz")
+        corpus, _ = load_corpus(dataset, cache_dir=str(cache), lemmatize=False)
+        assert len(count_calls) == 2
+        assert len(corpus) == 3
@@ -27,6 +27,11 @@ from scripts.data_validation import (
     check_label_values,
     check_review_lengths,
     check_empty_reviews,
+    check_near_duplicates,
+    compute_statistics,
+    lsh_clusters,
+    minhash_signatures,
+    run_checks,
     validate_dataset,
 )
 
@@ -195,6 +200,105 @@ class TestCheckEmptyReviews:
         assert result["passed"] is False
 
 
+# ── Near Duplicates ──────────────────────────────────────────────────────
+
+
+class TestCheckNearDuplicates:
+    """Tests for MinHash/LSH near-duplicate detection."""
+
+    REVIEWS = [
+        "The pasta was wonderful and the staff were lovely",
+        "The pasta was wonderful, and the staff were lovely!",
+        "Cold soup and a very rude waiter",
+        "Terrible parking but a great wine list",
+        "the pasta was WONDERFUL and the staff were lovely",
+        "",
+    ]
+
+    def test_signatures_are_deterministic(self):
+        first = minhash_signatures(self.REVIEWS, num_perm=64)
+        second = minhash_signatures(self.REVIEWS[::-1], num_perm=64)[::-1]
+        assert first.shape == (6, 64)
+        assert (first == second).all()
+
+    def test_signatures_independent_of_block_size(self):
+        reviews = self.REVIEWS + ["x" * 500]
+        whole = minhash_signatures(reviews, num_perm=64)
+        blocked = minhash_signatures(reviews, num_perm=64, block_shingles=7)
+        assert (whole == blocked).all()
+
+    def test_finds_cluster(self):
+        df = pd.DataFrame({"Review": self.REVIEWS})
+        result = check_near_duplicates(df, max_ratio=0.5)
+        assert result["clusters"] == [[0, 1, 4]]
+        assert result["passed"] is True
+        assert "2 near-duplicate(s)" in result["details"]
+
+    def test_rate_above_threshold_fails(self):
+        df = pd.DataFrame({"Review": self.REVIEWS})
+        assert check_near_duplicates(df)["passed"] is False
+
+    def test_empty_reviews_not_clustered(self):
+        df = pd.DataFrame({"Review": ["", "  ", None, "Great food"]})
+        assert check_near_duplicates(df)["clusters"] == []
+
+    def test_bands_must_divide_signature(self):
+        signatures = minhash_signatures(self.REVIEWS, num_perm=64)
+        with pytest.raises(ValueError):
+            lsh_clusters(signatures, bands=10)
+
+    def test_missing_column(self):
+        df = pd.DataFrame({"Other": ["a"]})
+        assert check_near_duplicates(df)["passed"] is False
+
+
+# ── Single-Pass Statistics ───────────────────────────────────────────────
+
+
+class TestComputeStatistics:
+    """Tests for compute_statistics / run_checks."""
+
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({
+            "Review": ["Great food", "Great food", "  ", "ok", None, "x" * 20],
+            "Liked": [1, 1, 0, 0, 1, 2],
+        })
+
+    def test_statistics(self, df):
+        stats = compute_statistics(df)
+        assert stats["n_rows"] == 6
+        assert stats["null_counts"] == {"Review": 1, "Liked": 0}
+        assert stats["text"]["n_duplicates"] == 1
+        assert stats["text"]["n_empty"] == 1
+        assert stats["labels"]["label_counts"] == {1: 3, 0: 2, 2: 1}
+
+    def test_matches_standalone_checks(self, df):
+        checks = run_checks(compute_statistics(df))
+        standalone = [
+            check_required_columns(df),
+            check_null_values(df),
+            check_duplicates(df),
+            check_class_balance(df),
+            check_label_values(df),
+            check_review_lengths(df),
+            check_empty_reviews(df),
+        ]
+        assert checks == standalone
+
+    def test_missing_columns(self):
+        stats = compute_statistics(pd.DataFrame({"Other": [1]}))
+        assert "text" not in stats and "labels" not in stats
+        checks = {c["check"]: c for c in run_checks(stats)}
+        assert checks["required_columns"]["passed"] is False
+        assert checks["duplicates"]["passed"] is False
+
+    def test_near_duplicates_from_signatures(self, df):
+        checks = run_checks(compute_statistics(df, minhash=True))
+        assert checks[-1]["check"] == "near_duplicates"
+        assert checks[-1]["clusters"] == [[0, 1]]
+
+
 # ── Full Validation ──────────────────────────────────────────────────────
 
 
@@ -0,0 +1,105 @@
+"""
+test_evaluation.py - Tests for the Fit-Once Evaluation Module
+==============================================================
+Tests for evaluation.py checking metrics against sklearn and that
+cross-validated reports fit each fold exactly once.
+
+Run:
+    pytest tests/test_evaluation.py -v
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from evaluation import CrossValidationReport, compute_metrics
+
+FITS = []
+
+
+class CountingNB(MultinomialNB):
+    """MultinomialNB that records every fit."""
+
+    def fit(self, X, y, sample_weight=None):
+        FITS.append(len(y))
+        return super().fit(X, y, sample_weight=sample_weight)
+
+
+@pytest.fixture
+def labelled_corpus():
+    rng = np.random.default_rng(0)
+    positive = ["great", "tasty", "friendly", "amazing", "love", "fresh"]
+    negative = ["cold", "rude", "slow", "bland", "never", "dirty"]
+    neutral = ["food", "place", "service", "staff", "table", "menu"]
+    corpus, y = [], []
+    for i in range(60):
+        label = i % 2
+        words = list(rng.choice(positive if label else negative, 2))
+        words += list(rng.choice(neutral + positive + negative, 4))
+        corpus.append(" ".join(words))
+        y.append(label)
+    return corpus, np.array(y)
+
+
+class TestComputeMetrics:
+    """Metrics derived from the confusion matrix match sklearn."""
+
+    def test_matches_sklearn(self):
+        rng = np.random.default_rng(1)
+        y_true = rng.integers(0, 2, 80)
+        y_score = np.clip(y_true * 0.4 + rng.random(80) * 0.6, 0, 1)
+        y_pred = (y_score > 0.5).astype(int)
+
+        metrics = compute_metrics(y_true, y_pred, y_score)
+        assert metrics["accuracy"] == pytest.approx(accuracy_score(y_true, y_pred))
+        assert metrics["f1_weighted"] == pytest.approx(f1_score(y_true, y_pred, average="weighted"))
+        assert metrics["roc_auc"] == pytest.approx(roc_auc_score(y_true, y_score))
+        assert metrics["confusion_matrix"] == confusion_matrix(y_true, y_pred).tolist()
+        assert metrics["per_class"]["1"]["support"] == int(y_true.sum())
+
+    def test_roc_auc_undefined_for_one_class(self):
+        metrics = compute_metrics([1, 1], [1, 0], [0.9, 0.4])
+        assert np.isnan(metrics["roc_auc"])
+        assert metrics["accuracy"] == 0.5
+
+
+class TestCrossValidationReport:
+    """Each fold is fitted once and every metric reuses its predictions."""
+
+    def test_one_fit_per_fold(self, labelled_corpus):
+        corpus, y = labelled_corpus
+        pipeline = Pipeline([("tfidf", TfidfVectorizer()), ("clf", CountingNB())])
+        FITS.clear()
+        report = CrossValidationReport.run(pipeline, corpus, y, cv=4)
+        report.summary()
+        report.pooled_metrics()
+        assert len(FITS) == 4
+
+    def test_matches_cross_val_score(self, labelled_corpus):
+        corpus, y = labelled_corpus
+        pipeline = Pipeline([("tfidf", TfidfVectorizer()), ("clf", MultinomialNB(alpha=0.5))])
+        cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=0)
+        summary = CrossValidationReport.run(pipeline, corpus, y, cv=cv).summary()
+
+        expected_f1 = cross_val_score(pipeline, corpus, y, cv=cv, scoring="f1_weighted")
+        expected_auc = cross_val_score(pipeline, corpus, y, cv=cv, scoring="roc_auc")
+        np.testing.assert_allclose(summary["f1_weighted"]["folds"], expected_f1)
+        np.testing.assert_allclose(summary["roc_auc"]["folds"], expected_auc)
+        assert summary["f1_weighted"]["mean"] == pytest.approx(expected_f1.mean())
+
+    def test_pooled_confusion_matrix_counts_every_sample(self, labelled_corpus):
+        corpus, y = labelled_corpus
+        pipeline = Pipeline([("tfidf", TfidfVectorizer()), ("clf", MultinomialNB())])
+        pooled = CrossValidationReport.run(pipeline, corpus, y, cv=3).pooled_metrics()
+        assert np.sum(pooled["confusion_matrix"]) == len(y)
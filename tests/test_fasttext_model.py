@@ -0,0 +1,113 @@
+"""
+test_fasttext_model.py - Tests for the fastText-Style Model
+============================================================
+Tests for fasttext_model.py covering hashing, training on a separable
+corpus, artefact round-trips and serving through the common backend
+interface.
+
+Run:
+    pytest tests/test_fasttext_model.py -v
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from fasttext_model import FastTextModel
+from inference import FastTextBackend, backend_from_artefact
+from model_artefact import load_artefact, read_manifest, save_artefact
+from model_registry import HotSwapModel, ModelRegistry
+
+SMALL = {"dim": 8, "buckets": 1 << 12}
+
+
+@pytest.fixture(scope="module")
+def labelled_corpus():
+    rng = np.random.default_rng(0)
+    positive = ["great", "tasty", "friendly", "amazing", "loved", "fresh"]
+    negative = ["cold", "rude", "slow", "bland", "awful", "dirty"]
+    neutral = ["food", "place", "service", "staff", "table", "menu"]
+    texts, y = [], []
+    for i in range(120):
+        label = i % 2
+        words = list(rng.choice(positive if label else negative, 2))
+        words += list(rng.choice(neutral, 3))
+        texts.append(" ".join(rng.permutation(words)))
+        y.append(label)
+    return texts, np.array(y)
+
+
+@pytest.fixture(scope="module")
+def model(labelled_corpus):
+    return FastTextModel.train(*labelled_corpus, epochs=10, **SMALL)
+
+
+class TestHashing:
+    """Feature ids are stable and cover words, bigrams and char n-grams."""
+
+    def test_ids_are_deterministic_across_models(self, model):
+        other = FastTextModel.train(["a b"], [1], epochs=1, seed=5, **SMALL)
+        np.testing.assert_array_equal(
+            model.feature_ids("Great food!"), other.feature_ids("great food")
+        )
+
+    def test_feature_counts(self, model):
+        # "<ab>": the word plus its 2 trigrams (the whole "<ab>" is skipped)
+        assert len(model.feature_ids("ab")) == 3
+        # Two such words and one bigram
+        assert len(model.feature_ids("ab cd")) == 7
+
+    def test_empty_text(self, model):
+        assert model.feature_ids("...").size == 0
+        proba = model.predict_proba(["", "great food"])
+        np.testing.assert_allclose(proba.sum(axis=1), 1.0, rtol=1e-6)
+
+
+class TestTraining:
+    """SGD learns a separable corpus."""
+
+    def test_fits_training_data(self, model, labelled_corpus):
+        texts, y = labelled_corpus
+        assert (model.predict(texts) == y).mean() > 0.95
+
+    def test_generalises_to_unseen_combinations(self, model):
+        np.testing.assert_array_equal(
+            model.predict(["amazing fresh menu", "rude awful staff"]), [1, 0]
+        )
+
+    def test_seed_is_reproducible(self, labelled_corpus):
+        a = FastTextModel.train(*labelled_corpus, epochs=2, **SMALL)
+        b = FastTextModel.train(*labelled_corpus, epochs=2, **SMALL)
+        np.testing.assert_array_equal(a.embeddings, b.embeddings)
+
+
+class TestServing:
+    """Artefact round-trip and the shared backend interface."""
+
+    def test_artefact_round_trip(self, model, tmp_path, labelled_corpus):
+        path = save_artefact(str(tmp_path), model, version="v1")
+        assert read_manifest(path)["model_type"] == "fasttext"
+        loaded = load_artefact(path, verify=True)
+        assert isinstance(loaded, FastTextModel)
+        texts, _ = labelled_corpus
+        np.testing.assert_allclose(loaded.predict_proba(texts), model.predict_proba(texts))
+
+    def test_backend_from_artefact(self, model, tmp_path):
+        path = save_artefact(str(tmp_path), model, version="v1")
+        backend = backend_from_artefact(path)
+        assert isinstance(backend, FastTextBackend)
+        assert backend.name == "fasttext:v1"
+        [(label, confidence)] = backend.predict(["great tasty food"])
+        assert label == 1 and 0.5 <= confidence <= 1.0
+
+    def test_registry_serves_fasttext_versions(self, model, tmp_path):
+        save_artefact(str(tmp_path), model, version="v1")
+        serving = HotSwapModel(ModelRegistry(str(tmp_path)))
+        assert serving.load() == "v1"
+        assert serving.current.predict(["rude cold staff"])[0][0] == 0
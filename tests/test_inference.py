@@ -0,0 +1,77 @@
+"""
+test_inference.py - Tests for the DistilBERT Inference Backend
+===============================================================
+Checks that ``TransformerBackend``, which calls the pipeline's tokenizer
+and model stage by stage, gives the same labels and scores as
+``transformers.pipeline`` itself. Skipped unless the DistilBERT weights
+are already in the Hugging Face cache (no download during tests).
+
+Run:
+    pytest tests/test_inference.py -v
+"""
+
+import sys
+import os
+
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from inference import DISTILBERT_MODEL
+
+REVIEWS = [
+    "Wow... Loved this place.",
+    "Crust is not good.",
+    "The food was absolutely delicious and the service was outstanding!",
+    "Terrible experience. Cold food, rude staff, waited 2 hours.",
+    "It was okay, nothing special.",
+    # Longer than max_chars, and much longer than the others (padding)
+    "The waiter was friendly but the kitchen was slow; " * 15,
+    "Great food!!! 5/5 stars *****",
+]
+
+
+def _cached(model_id):
+    try:
+        from huggingface_hub import try_to_load_from_cache
+    except ImportError:
+        return False
+    weights = ("model.safetensors", "pytorch_model.bin")
+    return isinstance(try_to_load_from_cache(model_id, "config.json"), str) and any(
+        isinstance(try_to_load_from_cache(model_id, name), str) for name in weights
+    )
+
+
+@pytest.fixture(scope="module")
+def backend():
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    if not _cached(DISTILBERT_MODEL):
+        pytest.skip(f"{DISTILBERT_MODEL} is not in the Hugging Face cache")
+    from inference import TransformerBackend
+
+    return TransformerBackend(max_batch_size=4)
+
+
+class TestPipelineEquivalence:
+    """Staged predict() matches transformers.pipeline(...)."""
+
+    def test_matches_pipeline(self, backend):
+        expected = backend.pipeline(
+            [text[: backend.max_chars] for text in REVIEWS], batch_size=backend.max_batch_size
+        )
+        predictions = backend.predict(REVIEWS)
+        assert [label for label, _ in predictions] == [
+            1 if result["label"] == "POSITIVE" else 0 for result in expected
+        ]
+        assert [score for _, score in predictions] == pytest.approx(
+            [result["score"] for result in expected], abs=1e-4
+        )
+
+    def test_batching_does_not_change_results(self, backend):
+        one_by_one = [backend.predict([text])[0] for text in REVIEWS]
+        batched = backend.predict(REVIEWS)
+        assert [label for label, _ in batched] == [label for label, _ in one_by_one]
+        assert [s for _, s in batched] == pytest.approx([s for _, s in one_by_one], abs=1e-4)
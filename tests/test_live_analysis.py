@@ -0,0 +1,149 @@
+"""
+test_live_analysis.py - Tests for Debounced Live Analysis
+==========================================================
+Tests for live_analysis.py checking that bursts of updates are scored
+once, that results for superseded revisions are discarded, and that
+continuous typing still gets results after ``max_delay``.
+
+Run:
+    pytest tests/test_live_analysis.py -v
+"""
+
+import sys
+import os
+import time
+import asyncio
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from live_analysis import LiveAnalysisSession
+
+
+class _Recorder:
+    """Blocking scorer plus async sink recording what happened."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.scored = []
+        self.sent = []
+
+    def score(self, text):
+        time.sleep(self.delay)
+        self.scored.append(text)
+        return {"prediction": int("good" in text)}
+
+    async def send(self, result):
+        self.sent.append(result)
+
+
+async def _session(recorder, **kwargs):
+    session = LiveAnalysisSession(recorder.score, recorder.send, **kwargs)
+    return session, asyncio.create_task(session.run())
+
+
+async def _stop(worker):
+    worker.cancel()
+    try:
+        await worker
+    except asyncio.CancelledError:
+        pass
+
+
+class TestDebounce:
+    """Only the newest text of a burst is scored."""
+
+    async def test_burst_scores_latest_once(self):
+        recorder = _Recorder()
+        session, worker = await _session(recorder, debounce=0.05, max_delay=5)
+        for revision, text in enumerate(["g", "go", "goo", "good"], start=1):
+            session.update(revision, text)
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+        await _stop(worker)
+        assert recorder.scored == ["good"]
+        assert recorder.sent == [{"revision": 4, "prediction": 1}]
+        assert session.stats["superseded"] == 3
+
+    async def test_separate_pauses_score_each(self):
+        recorder = _Recorder()
+        session, worker = await _session(recorder, debounce=0.02, max_delay=5)
+        session.update(1, "bad")
+        await asyncio.sleep(0.15)
+        session.update(2, "good")
+        await asyncio.sleep(0.15)
+        await _stop(worker)
+        assert [r["revision"] for r in recorder.sent] == [1, 2]
+
+    async def test_old_revision_ignored(self):
+        recorder = _Recorder()
+        session, worker = await _session(recorder, debounce=0.02, max_delay=5)
+        session.update(5, "good")
+        session.update(3, "bad")  # arrived out of order
+        await asyncio.sleep(0.15)
+        await _stop(worker)
+        assert recorder.sent == [{"revision": 5, "prediction": 1}]
+
+    async def test_max_delay_under_continuous_typing(self):
+        recorder = _Recorder()
+        session, worker = await _session(recorder, debounce=0.1, max_delay=0.15)
+        for revision in range(1, 16):
+            session.update(revision, "good" + "!" * revision)
+            await asyncio.sleep(0.03)  # never quiet for `debounce`
+        await _stop(worker)
+        assert recorder.scored  # scored before typing stopped
+        assert len(recorder.scored) < 15
+
+
+class TestStaleResults:
+    """A result is dropped if a newer revision arrived while scoring."""
+
+    async def test_stale_result_not_sent(self):
+        recorder = _Recorder(delay=0.1)
+        session, worker = await _session(recorder, debounce=0.01, max_delay=5)
+        session.update(1, "bad")
+        await asyncio.sleep(0.05)  # revision 1 is now being scored
+        session.update(2, "good")
+        await asyncio.sleep(0.4)
+        await _stop(worker)
+        assert recorder.scored == ["bad", "good"]
+        assert recorder.sent == [{"revision": 2, "prediction": 1}]
+        assert session.stats["stale_results"] == 1
+
+    async def test_scoring_error_is_reported(self):
+        def fail(text):
+            raise RuntimeError("model unavailable")
+
+        sent = []
+
+        async def send(result):
+            sent.append(result)
+
+        session = LiveAnalysisSession(fail, send, debounce=0.01)
+        worker = asyncio.create_task(session.run())
+        session.update(1, "good")
+        await asyncio.sleep(0.1)
+        await _stop(worker)
+        assert sent == [{"revision": 1, "error": "model unavailable"}]
+
+
+class TestThrottle:
+    """An exhausted budget delays scoring; the latest text is scored after."""
+
+    async def test_waits_for_budget_then_scores_latest(self):
+        recorder = _Recorder()
+        budget = [0.05, 0.05]  # two "wait" answers, then allowed
+
+        def throttle():
+            return budget.pop(0) if budget else 0.0
+
+        session, worker = await _session(recorder, debounce=0.01, max_delay=5, throttle=throttle)
+        session.update(1, "bad")
+        await asyncio.sleep(0.04)  # revision 1 is waiting for budget
+        session.update(2, "good")
+        await asyncio.sleep(0.3)
+        await _stop(worker)
+        assert recorder.scored == ["good"]
+        assert recorder.sent == [{"revision": 2, "prediction": 1}]
+        assert session.stats["throttled"] == 2
@@ -0,0 +1,54 @@
+"""
+test_memory_profile.py - Tests for the Low-Memory Serving Profile
+==================================================================
+Tests for memory_profile.py covering RSS measurement, the allocator
+helpers and when the burst trimmer fires.
+
+Run:
+    pytest tests/test_memory_profile.py -v
+"""
+
+import sys
+import os
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from memory_profile import BurstTrimmer, limit_malloc_arenas, malloc_trim, rss_bytes
+
+
+class TestMeasurement:
+    """RSS is reported and tracks allocations."""
+
+    def test_rss_grows_with_allocation(self):
+        before = rss_bytes()
+        block = bytearray(64 * 1024 * 1024)
+        block[::4096] = b"x" * len(block[::4096])  # touch every page
+        assert rss_bytes() - before > 32 * 1024 * 1024
+        del block
+
+    def test_allocator_helpers_never_raise(self):
+        assert isinstance(malloc_trim(), bool)
+        assert isinstance(limit_malloc_arenas(8), bool)
+
+
+class TestBurstTrimmer:
+    """Trims once per burst, only after it has gone quiet."""
+
+    def test_no_trim_without_activity(self):
+        assert not BurstTrimmer(idle_seconds=0).trim_if_idle()
+
+    def test_waits_for_idle_period(self):
+        trimmer = BurstTrimmer(idle_seconds=60)
+        trimmer.note_activity()
+        assert not trimmer.trim_if_idle()
+
+    def test_trims_once_per_burst(self):
+        trimmer = BurstTrimmer(idle_seconds=0)
+        trimmer.note_activity()
+        assert trimmer.trim_if_idle()
+        assert not trimmer.trim_if_idle()
+        trimmer.note_activity()
+        assert trimmer.trim_if_idle()
+        assert trimmer.stats["trims"] == 2
@@ -0,0 +1,103 @@
+"""
+test_model_artefact.py - Tests for Versioned Model Artefacts
+=============================================================
+Tests for model_artefact.py covering save/load round-trips, memory
+mapping, hash verification and version selection.
+
+Run:
+    pytest tests/test_model_artefact.py -v
+"""
+
+import sys
+import os
+import json
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from compiled_scorer import CompiledScorer
+from model_artefact import (
+    MANIFEST_NAME,
+    ArtefactError,
+    latest_artefact,
+    load_artefact,
+    read_manifest,
+    save_artefact,
+)
+
+TEXTS = ["great food", "cold rude staff", "tasty pasta friendly", "slow bland soup"]
+LABELS = [1, 0, 1, 0]
+
+
+@pytest.fixture
+def scorer():
+    vectorizer = TfidfVectorizer().fit(TEXTS)
+    classifier = MultinomialNB().fit(vectorizer.transform(TEXTS), LABELS)
+    return CompiledScorer.from_sklearn(vectorizer, classifier)
+
+
+class TestSaveLoad:
+    """Round-trips through the artefact directory."""
+
+    def test_round_trip(self, scorer, tmp_path):
+        path = save_artefact(str(tmp_path), scorer, version="v1", metadata={"f1": 0.9})
+        loaded = load_artefact(path, verify=True)
+        np.testing.assert_allclose(loaded.predict_proba(TEXTS), scorer.predict_proba(TEXTS))
+        assert read_manifest(path)["metadata"] == {"f1": 0.9}
+
+    def test_arrays_are_memory_mapped(self, scorer, tmp_path):
+        loaded = load_artefact(save_artefact(str(tmp_path), scorer, version="v1"))
+        assert not loaded.feature_log_prob.flags.owndata
+        assert not loaded.feature_log_prob.flags.writeable
+
+    def test_existing_version_is_not_overwritten(self, scorer, tmp_path):
+        save_artefact(str(tmp_path), scorer, version="v1")
+        with pytest.raises(ArtefactError):
+            save_artefact(str(tmp_path), scorer, version="v1")
+
+    def test_no_temporary_directories_left(self, scorer, tmp_path):
+        save_artefact(str(tmp_path), scorer, version="v1")
+        assert os.listdir(tmp_path) == ["v1"]
+
+
+class TestValidation:
+    """Corrupt or foreign artefacts are rejected."""
+
+    def test_tampered_array_fails_verification(self, scorer, tmp_path):
+        path = save_artefact(str(tmp_path), scorer, version="v1")
+        np.save(os.path.join(path, "idf.npy"), np.zeros_like(scorer.idf))
+        with pytest.raises(ArtefactError):
+            load_artefact(path, verify=True)
+
+    def test_unknown_format_version(self, scorer, tmp_path):
+        path = save_artefact(str(tmp_path), scorer, version="v1")
+        manifest_path = os.path.join(path, MANIFEST_NAME)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest["format_version"] = 999
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+        with pytest.raises(ArtefactError):
+            load_artefact(path)
+
+    def test_missing_manifest(self, tmp_path):
+        with pytest.raises(ArtefactError):
+            load_artefact(str(tmp_path))
+
+
+class TestLatestArtefact:
+    """Version selection."""
+
+    def test_picks_newest(self, scorer, tmp_path):
+        save_artefact(str(tmp_path), scorer, version="20260101_000000")
+        save_artefact(str(tmp_path), scorer, version="20260201_000000")
+        assert latest_artefact(str(tmp_path)).endswith("20260201_000000")
+
+    def test_empty_directory(self, tmp_path):
+        assert latest_artefact(str(tmp_path)) is None
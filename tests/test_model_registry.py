@@ -0,0 +1,151 @@
+"""
+test_model_registry.py - Tests for the Model Registry and Hot-Swap
+===================================================================
+Tests for model_registry.py covering version discovery, the ACTIVE
+pointer, atomic activation, in-flight isolation, rollback and the
+background watcher.
+
+Run:
+    pytest tests/test_model_registry.py -v
+"""
+
+import sys
+import os
+import time
+
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+import preprocess
+from compiled_scorer import CompiledScorer
+from model_artefact import save_artefact
+from model_registry import HotSwapModel, ModelRegistry
+
+TEXTS = ["great food", "cold rude staff", "tasty pasta friendly", "slow bland soup"]
+
+
+def _publish(models_dir, version, labels, preprocess=None):
+    vectorizer = TfidfVectorizer().fit(TEXTS)
+    classifier = MultinomialNB().fit(vectorizer.transform(TEXTS), labels)
+    save_artefact(
+        models_dir,
+        CompiledScorer.from_sklearn(vectorizer, classifier),
+        version=version,
+        metadata={"preprocess": preprocess or {"lemmatize": False}},
+    )
+
+
+@pytest.fixture
+def registry(tmp_path):
+    models_dir = str(tmp_path)
+    _publish(models_dir, "v1", [1, 0, 1, 0])
+    _publish(models_dir, "v2", [0, 1, 0, 1])  # deliberately inverted
+    return ModelRegistry(models_dir)
+
+
+class TestModelRegistry:
+    """Version discovery and the ACTIVE pointer."""
+
+    def test_versions(self, registry):
+        assert registry.versions() == ["v1", "v2"]
+
+    def test_defaults_to_newest(self, registry):
+        assert registry.active_version() == "v2"
+
+    def test_pointer_wins(self, registry):
+        registry.set_active("v1")
+        assert registry.active_version() == "v1"
+
+    def test_unknown_version(self, registry):
+        with pytest.raises(KeyError):
+            registry.set_active("v9")
+
+    def test_model_type_filter(self, registry, tmp_path):
+        mnb_only = ModelRegistry(str(tmp_path), model_types=("tfidf-mnb", "hashed-mnb"))
+        assert mnb_only.versions() == ["v1", "v2"]
+        fasttext_only = ModelRegistry(str(tmp_path), model_types=("fasttext",))
+        assert fasttext_only.versions() == []
+        assert fasttext_only.active_version() is None
+        with pytest.raises(KeyError, match="tfidf-mnb artefact, not fasttext"):
+            fasttext_only.load("v1")
+
+    def test_lemmatised_artefact_needs_wordnet(self, registry, monkeypatch):
+        _publish(registry.models_dir, "v3", [1, 0, 1, 0], preprocess={"lemmatize": True})
+        monkeypatch.setattr(preprocess, "lemmatizer_available", lambda: False)
+        with pytest.raises(RuntimeError, match="WordNet"):
+            registry.load("v3")
+        assert registry.load("v1").predict(["great food"])
+
+
+class TestHotSwapModel:
+    """Atomic switching and rollback."""
+
+    def test_load_and_activate(self, registry):
+        model = HotSwapModel(registry)
+        model.load("v1")
+        assert model.current.predict(["great food"])[0][0] == 1
+
+        model.activate("v2")
+        assert model.version == "v2"
+        assert model.current.predict(["great food"])[0][0] == 0
+        assert registry.pinned_version() == "v2"
+
+    def test_in_flight_request_keeps_old_backend(self, registry):
+        model = HotSwapModel(registry)
+        model.load("v1")
+        in_flight = model.current
+        model.activate("v2")
+        assert in_flight.predict(["great food"])[0][0] == 1
+        assert model.current is not in_flight
+
+    def test_rollback(self, registry):
+        model = HotSwapModel(registry)
+        model.load("v1")
+        v1_backend = model.current
+        model.activate("v2")
+        assert model.rollback() == "v1"
+        assert model.current is v1_backend
+        assert registry.pinned_version() == "v1"
+
+    def test_rollback_without_history(self, registry):
+        model = HotSwapModel(registry)
+        model.load("v1")
+        with pytest.raises(RuntimeError):
+            model.rollback()
+
+    def test_failed_activation_keeps_serving(self, registry):
+        model = HotSwapModel(registry)
+        model.load("v1")
+        os.remove(os.path.join(registry.path("v2"), "idf.npy"))
+        with pytest.raises(Exception):
+            model.activate("v2")
+        assert model.version == "v1"
+
+    def test_watcher_follows_pointer(self, registry):
+        model = HotSwapModel(registry)
+        model.load("v1")
+        registry.set_active("v1")
+        model.start_watcher(interval=0.01)
+        try:
+            registry.set_active("v2")
+            deadline = time.time() + 5
+            while model.version != "v2" and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            model.stop_watcher()
+        assert model.version == "v2"
+
+    def test_new_artefact_needs_activation(self, registry):
+        model = HotSwapModel(registry)
+        model.load()
+        assert model.version == "v2"
+        _publish(registry.models_dir, "v3", [1, 0, 1, 0])
+        assert model.sync() is None
+        assert model.version == "v2"
+        registry.set_active("v3")
+        assert model.sync() == "v3"
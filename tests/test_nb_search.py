@@ -0,0 +1,118 @@
+"""
+test_nb_search.py - Tests for the Fold-Cached Naive Bayes Search
+=================================================================
+Tests for nb_search.py checking closed-form alpha scoring against
+sklearn's MultinomialNB / GridSearchCV and the successive-halving mode.
+
+Run:
+    pytest tests/test_nb_search.py -v
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import f1_score, make_scorer
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from nb_search import NaiveBayesSearchCV, predict_for_alphas, weighted_f1
+
+PARAM_GRID = {
+    "tfidf__max_features": [5, 10, None],
+    "clf__alpha": [0.1, 0.5, 1.0, 2.0],
+}
+
+
+@pytest.fixture
+def labelled_corpus():
+    rng = np.random.default_rng(0)
+    positive = ["great", "tasty", "friendly", "amazing", "love", "fresh"]
+    negative = ["cold", "rude", "slow", "bland", "never", "dirty"]
+    neutral = ["food", "place", "service", "staff", "table", "menu"]
+    corpus, y = [], []
+    for i in range(60):
+        label = i % 2
+        words = list(rng.choice(positive if label else negative, 3))
+        words += list(rng.choice(neutral + positive + negative, 3))
+        corpus.append(" ".join(words))
+        y.append(label)
+    return corpus, np.array(y)
+
+
+def _by_params(results):
+    return {
+        (p["tfidf__max_features"], p["clf__alpha"]): s
+        for p, s in zip(results["params"], results["mean_test_score"])
+    }
+
+
+class TestClosedForm:
+    """Vectorised scoring must match sklearn's estimators."""
+
+    def test_weighted_f1_matches_sklearn(self):
+        rng = np.random.default_rng(1)
+        y_true = rng.integers(0, 2, 50)
+        y_pred = rng.integers(0, 2, (4, 50))
+        expected = [f1_score(y_true, row, average="weighted") for row in y_pred]
+        np.testing.assert_allclose(weighted_f1(y_true, y_pred, np.array([0, 1])), expected)
+
+    def test_predictions_match_multinomial_nb(self, labelled_corpus):
+        corpus, y = labelled_corpus
+        X = TfidfVectorizer().fit_transform(corpus)
+        classes = np.array([0, 1])
+        onehot = (y[:, None] == classes).astype(float)
+        feature_counts = np.asarray(X.T @ onehot).T
+        alphas = [0.1, 1.0, 3.0]
+
+        preds = predict_for_alphas(feature_counts, onehot.sum(0), X, alphas, classes)
+        for row, alpha in zip(preds, alphas):
+            expected = MultinomialNB(alpha=alpha).fit(X, y).predict(X)
+            np.testing.assert_array_equal(row, expected)
+
+
+class TestNaiveBayesSearchCV:
+    """End-to-end search behaviour."""
+
+    def test_matches_grid_search(self, labelled_corpus):
+        corpus, y = labelled_corpus
+        cv = StratifiedKFold(n_splits=3, shuffle=True, random_state=0)
+        reference = GridSearchCV(
+            Pipeline([("tfidf", TfidfVectorizer()), ("clf", MultinomialNB())]),
+            PARAM_GRID,
+            cv=cv,
+            scoring=make_scorer(f1_score, average="weighted"),
+        ).fit(corpus, y)
+        search = NaiveBayesSearchCV(PARAM_GRID, cv=cv).fit(corpus, y)
+
+        expected = _by_params(reference.cv_results_)
+        actual = _by_params(search.cv_results_)
+        for params, score in expected.items():
+            assert actual[params] == pytest.approx(score)
+        assert search.best_score_ == pytest.approx(reference.best_score_)
+
+    def test_best_estimator_is_refitted(self, labelled_corpus):
+        corpus, y = labelled_corpus
+        search = NaiveBayesSearchCV(PARAM_GRID, cv=3).fit(corpus, y)
+        assert search.best_estimator_.predict(corpus[:2]).shape == (2,)
+        assert search.best_estimator_.named_steps["clf"].alpha == search.best_params_["clf__alpha"]
+
+    def test_halving_scores_survivors_on_all_folds(self, labelled_corpus):
+        corpus, y = labelled_corpus
+        search = NaiveBayesSearchCV(PARAM_GRID, cv=4, halving=True, factor=2).fit(corpus, y)
+        n_folds = search.cv_results_["n_folds"]
+        assert n_folds.max() == 4
+        assert n_folds.min() == 1
+        assert n_folds[search.best_index_] == 4
+        assert search.cv_results_["rank_test_score"][search.best_index_] == 1
+
+    def test_rejects_unknown_parameters(self):
+        with pytest.raises(ValueError):
+            NaiveBayesSearchCV({"clf__fit_prior": [True]})
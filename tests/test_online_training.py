@@ -0,0 +1,157 @@
+"""
+test_online_training.py - Tests for Incremental Naive Bayes Training
+=====================================================================
+Tests for online_training.py covering mini-batch equivalence with a
+single fit, checkpoint round-trips, resuming partially consumed files,
+and exporting the model as a servable artefact.
+
+Run:
+    pytest tests/test_online_training.py -v
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from inference import backend_from_artefact
+import online_training
+from online_training import OnlineTrainer, export_artefact, train_batch
+
+REVIEWS = [
+    ("The food was absolutely delicious", 1),
+    ("Terrible service and cold soup", 0),
+    ("Amazing pasta, friendly staff", 1),
+    ("Rude waiter, never coming back", 0),
+    ("Great atmosphere and tasty dishes", 1),
+    ("Bland, overpriced and slow", 0),
+]
+
+
+@pytest.fixture
+def trainer(tmp_path):
+    return OnlineTrainer(
+        str(tmp_path / "ckpt.pkl"), n_features=2 ** 10, clean_kwargs={"lemmatize": False}
+    )
+
+
+@pytest.fixture
+def reviews_file(tmp_path):
+    path = tmp_path / "new.tsv"
+    lines = ["Review\tLiked"] + [f"{text}\t{label}" for text, label in REVIEWS]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+class TestUpdate:
+    """Mini-batch updates."""
+
+    def test_batches_equal_single_fit(self, trainer, tmp_path):
+        texts, labels = zip(*REVIEWS)
+        trainer.update(texts[:3], labels[:3])
+        trainer.update(texts[3:], labels[3:])
+
+        single = OnlineTrainer(
+            str(tmp_path / "other.pkl"), n_features=2 ** 10, clean_kwargs={"lemmatize": False}
+        )
+        single.update(texts, labels)
+
+        np.testing.assert_allclose(
+            trainer.classifier.feature_count_, single.classifier.feature_count_
+        )
+        assert trainer.n_samples_seen == 6
+        assert trainer.n_batches == 2
+
+    def test_predicts_training_sentiment(self, trainer):
+        texts, labels = zip(*REVIEWS)
+        trainer.update(texts, labels)
+        assert trainer.predict(["delicious pasta"])[0] == 1
+        assert trainer.predict(["rude cold service"])[0] == 0
+
+    def test_length_mismatch_raises(self, trainer):
+        with pytest.raises(ValueError):
+            trainer.update(["one review"], [1, 0])
+
+
+class TestCheckpoints:
+    """Checkpointing and resuming."""
+
+    def test_round_trip(self, trainer):
+        texts, labels = zip(*REVIEWS)
+        trainer.update(texts, labels)
+        path = trainer.save_checkpoint()
+
+        restored = OnlineTrainer.load_checkpoint(path)
+        assert restored.n_samples_seen == trainer.n_samples_seen
+        np.testing.assert_allclose(
+            restored.predict_proba(["tasty food"]), trainer.predict_proba(["tasty food"])
+        )
+
+    def test_train_file_checkpoints_each_batch(self, trainer, reviews_file):
+        assert trainer.train_file(reviews_file, batch_size=2) == 6
+        assert trainer.n_batches == 3
+        assert os.path.isfile(trainer.checkpoint_path)
+
+    def test_resume_skips_consumed_rows(self, trainer, reviews_file):
+        trainer.train_file(reviews_file, batch_size=4)
+        with open(reviews_file, "a") as f:
+            f.write("Wonderful dessert\t1\n")
+
+        resumed = OnlineTrainer.load_or_create(trainer.checkpoint_path)
+        assert resumed.train_file(reviews_file, batch_size=4) == 1
+        assert resumed.n_samples_seen == 7
+
+
+class TestSharedCheckpoint:
+    """API-style batches and export to the model registry."""
+
+    def test_train_batch_accumulates(self, tmp_path):
+        path = str(tmp_path / "ckpt.pkl")
+        texts, labels = zip(*REVIEWS)
+        assert train_batch(texts[:4], labels[:4], path) == {"n_samples_seen": 4, "n_batches": 1}
+        assert train_batch(texts[4:], labels[4:], path) == {"n_samples_seen": 6, "n_batches": 2}
+
+    def test_train_batch_rejects_bad_labels(self, tmp_path):
+        with pytest.raises(ValueError, match="Labels"):
+            train_batch(["Fine"], [2], str(tmp_path / "ckpt.pkl"))
+
+    def test_api_batches_between_file_batches_are_kept(self, trainer, reviews_file, monkeypatch):
+        read_csv = pd.read_csv
+
+        def read_with_api_batch(*args, **kwargs):
+            for i, chunk in enumerate(read_csv(*args, **kwargs)):
+                if i == 1:  # a POST /admin/training lands between two file batches
+                    train_batch(["Superb dessert"], [1], trainer.checkpoint_path)
+                yield chunk
+
+        train_batch(["Dreadful coffee"], [0], trainer.checkpoint_path)  # after the CLI loaded
+        monkeypatch.setattr(online_training.pd, "read_csv", read_with_api_batch)
+        assert trainer.train_file(reviews_file, batch_size=2) == 6
+
+        saved = OnlineTrainer.load_checkpoint(trainer.checkpoint_path)
+        assert saved.n_samples_seen == 8
+        assert saved.n_batches == 5
+        assert saved.sources == {os.path.abspath(reviews_file): 6}
+
+    def test_export_serves_same_predictions(self, trainer, tmp_path):
+        texts, labels = zip(*REVIEWS)
+        trainer.update(texts, labels)
+        trainer.save_checkpoint()
+
+        path = export_artefact(str(tmp_path / "models"), trainer.checkpoint_path)
+        backend = backend_from_artefact(path)
+        probe = ["Tasty pasta and friendly staff", "Cold, bland and rude", ""]
+        expected = trainer.predict_proba(probe)[:, 1]
+        for (label, confidence), positive in zip(backend.predict(probe), expected):
+            assert label == int(positive > 0.5)
+            assert confidence == pytest.approx(max(positive, 1 - positive))
+
+    def test_export_untrained_raises(self, tmp_path):
+        with pytest.raises(ValueError, match="not been trained"):
+            export_artefact(str(tmp_path / "models"), str(tmp_path / "ckpt.pkl"))
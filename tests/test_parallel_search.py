@@ -0,0 +1,120 @@
+"""
+test_parallel_search.py - Tests for the Parallel, Checkpointed Search
+======================================================================
+Tests for parallel_search.py checking that pooled, memory-mapped scoring
+matches NaiveBayesSearchCV and that checkpoints resume correctly.
+
+Run:
+    pytest tests/test_parallel_search.py -v
+"""
+
+import sys
+import os
+import json
+
+import numpy as np
+import pytest
+from sklearn.model_selection import StratifiedKFold
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from nb_search import NaiveBayesSearchCV
+from parallel_search import ParallelNaiveBayesSearchCV
+
+PARAM_GRID = {
+    "tfidf__max_features": [5, 10, None],
+    "clf__alpha": [0.1, 0.5, 1.0, 2.0],
+}
+CV = StratifiedKFold(n_splits=3, shuffle=True, random_state=0)
+
+
+@pytest.fixture
+def labelled_corpus():
+    rng = np.random.default_rng(0)
+    positive = ["great", "tasty", "friendly", "amazing", "love", "fresh"]
+    negative = ["cold", "rude", "slow", "bland", "never", "dirty"]
+    neutral = ["food", "place", "service", "staff", "table", "menu"]
+    corpus, y = [], []
+    for i in range(60):
+        label = i % 2
+        words = list(rng.choice(positive if label else negative, 3))
+        words += list(rng.choice(neutral + positive + negative, 3))
+        corpus.append(" ".join(words))
+        y.append(label)
+    return corpus, np.array(y)
+
+
+@pytest.fixture
+def reference(labelled_corpus):
+    return NaiveBayesSearchCV(PARAM_GRID, cv=CV, refit=False).fit(*labelled_corpus)
+
+
+def _search(**kwargs):
+    return ParallelNaiveBayesSearchCV(PARAM_GRID, cv=CV, refit=False, **kwargs)
+
+
+class TestParallelSearch:
+    """Pooled scoring matches the serial engine exactly."""
+
+    @pytest.mark.parametrize("n_jobs", [1, 2])
+    def test_matches_serial_search(self, labelled_corpus, reference, n_jobs, tmp_path):
+        search = _search(n_jobs=n_jobs, workdir=str(tmp_path)).fit(*labelled_corpus)
+        np.testing.assert_array_equal(
+            search.cv_results_["mean_test_score"], reference.cv_results_["mean_test_score"]
+        )
+        assert search.best_params_ == reference.best_params_
+        # Shared arrays are removed after the search
+        assert os.listdir(tmp_path) == []
+
+    def test_halving_matches_serial(self, labelled_corpus):
+        expected = NaiveBayesSearchCV(PARAM_GRID, cv=CV, halving=True, factor=2, refit=False)
+        expected.fit(*labelled_corpus)
+        search = _search(n_jobs=1, halving=True, factor=2).fit(*labelled_corpus)
+        np.testing.assert_array_equal(
+            search.cv_results_["n_folds"], expected.cv_results_["n_folds"]
+        )
+        assert search.best_params_ == expected.best_params_
+
+
+class TestCheckpoint:
+    """Finished tasks are recorded and skipped on resume."""
+
+    def test_resume_from_partial_checkpoint(self, labelled_corpus, reference, tmp_path):
+        checkpoint = tmp_path / "search.jsonl"
+        _search(n_jobs=1, checkpoint=str(checkpoint)).fit(*labelled_corpus)
+        lines = checkpoint.read_text().splitlines()
+        # header + one line per (fold, max_features)
+        assert len(lines) == 1 + 3 * 3
+
+        # Simulate a crash: keep four tasks and a torn final line
+        checkpoint.write_text("\n".join(lines[:5]) + '\n{"fold": 2, "max_f')
+        search = _search(n_jobs=1, checkpoint=str(checkpoint)).fit(*labelled_corpus)
+        assert search.resumed_tasks_ == 4
+        np.testing.assert_array_equal(
+            search.cv_results_["mean_test_score"], reference.cv_results_["mean_test_score"]
+        )
+
+    def test_complete_checkpoint_skips_all_work(self, labelled_corpus, tmp_path):
+        checkpoint = tmp_path / "search.jsonl"
+        _search(n_jobs=1, checkpoint=str(checkpoint)).fit(*labelled_corpus)
+        size = checkpoint.stat().st_size
+        search = _search(n_jobs=1, checkpoint=str(checkpoint)).fit(*labelled_corpus)
+        assert search.resumed_tasks_ == 9
+        assert checkpoint.stat().st_size == size
+
+    def test_rejects_checkpoint_of_other_search(self, labelled_corpus, tmp_path):
+        checkpoint = tmp_path / "search.jsonl"
+        checkpoint.write_text(json.dumps({"fingerprint": "other"}) + "\n")
+        with pytest.raises(ValueError, match="different search"):
+            _search(n_jobs=1, checkpoint=str(checkpoint)).fit(*labelled_corpus)
+
+    def test_replaces_stale_checkpoint_when_allowed(self, labelled_corpus, tmp_path):
+        checkpoint = tmp_path / "search.jsonl"
+        checkpoint.write_text(json.dumps({"fingerprint": "other"}) + "\n")
+        search = _search(n_jobs=1, checkpoint=str(checkpoint), replace_stale_checkpoint=True)
+        search.fit(*labelled_corpus)
+        assert search.resumed_tasks_ == 0
+        resumed = _search(n_jobs=1, checkpoint=str(checkpoint)).fit(*labelled_corpus)
+        assert resumed.resumed_tasks_ == 9
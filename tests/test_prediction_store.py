@@ -0,0 +1,172 @@
+"""
+test_prediction_store.py - Tests for the Asynchronous Prediction Store
+=======================================================================
+Tests for prediction_store.py covering batched writes, the flush
+interval, WAL mode, the drop/block queue policies and shutdown draining.
+
+Run:
+    pytest tests/test_prediction_store.py -v
+"""
+
+import sys
+import os
+import time
+import sqlite3
+import threading
+
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from prediction_store import PredictionStore
+
+
+def _record(i=0, **extra):
+    return {"model": "m", "prediction": i % 2, "confidence": 0.9, "text": f"review {i}", **extra}
+
+
+def _count(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestWriter:
+    """Batching, flush interval and shutdown."""
+
+    def test_full_batches_are_written_together(self, tmp_path):
+        path = str(tmp_path / "p.db")
+        store = PredictionStore(path, batch_size=10, flush_interval=60)
+        store.start()
+        for i in range(25):
+            store.submit(_record(i))
+        assert _wait_for(lambda: store.stats()["written"] == 20)
+        assert store.stats()["batches"] == 2
+        store.close()
+        # The remainder is flushed on close
+        assert _count(path) == 25
+
+    def test_flush_interval_writes_partial_batch(self, tmp_path):
+        path = str(tmp_path / "p.db")
+        store = PredictionStore(path, batch_size=1000, flush_interval=0.05)
+        store.start()
+        store.submit(_record(aspects={"taste": {"prediction": 1}}))
+        assert _wait_for(lambda: store.stats()["written"] == 1)
+        store.close()
+        with sqlite3.connect(path) as conn:
+            row = conn.execute("SELECT prediction, aspects FROM predictions").fetchone()
+        assert row == (0, '{"taste": {"prediction": 1}}')
+
+    def test_wal_mode(self, tmp_path):
+        path = str(tmp_path / "p.db")
+        store = PredictionStore(path)
+        store.start()
+        store.close()
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_bad_record_is_counted_not_fatal(self, tmp_path):
+        path = str(tmp_path / "p.db")
+        store = PredictionStore(path, batch_size=1)
+        store.start()
+        store.submit({"model": "m"})  # no prediction/confidence
+        store.submit(_record())
+        store.close()
+        assert store.stats()["errors"] == 1
+        assert _count(path) == 1
+
+
+class TestPolicies:
+    """Full queue: drop immediately or block until space."""
+
+    def test_drop_policy(self, tmp_path):
+        store = PredictionStore(str(tmp_path / "p.db"), queue_size=3, policy="drop")
+        # Writer not started: nothing drains the queue
+        results = [store.submit(_record(i)) for i in range(5)]
+        assert results == [True, True, True, False, False]
+        assert store.stats()["dropped"] == 2
+
+    def test_block_policy_waits_for_space(self, tmp_path):
+        path = str(tmp_path / "p.db")
+        store = PredictionStore(path, queue_size=1, policy="block", batch_size=1)
+        store.submit(_record(0))
+        done = threading.Event()
+
+        def producer():
+            store.submit(_record(1))
+            done.set()
+
+        threading.Thread(target=producer, daemon=True).start()
+        assert not done.wait(0.1)  # blocked on the full queue
+        store.start()
+        assert done.wait(5)
+        store.close()
+        assert _count(path) == 2
+        assert store.stats()["dropped"] == 0
+
+    def test_block_timeout_drops(self, tmp_path):
+        store = PredictionStore(
+            str(tmp_path / "p.db"), queue_size=1, policy="block", block_timeout=0.01
+        )
+        assert store.submit(_record(0)) is True
+        assert store.submit(_record(1)) is False
+
+    def test_default_block_timeout_is_finite(self, tmp_path):
+        store = PredictionStore(str(tmp_path / "p.db"), policy="block")
+        assert store.block_timeout is not None
+
+    def test_rejects_unknown_policy(self, tmp_path):
+        with pytest.raises(ValueError):
+            PredictionStore(str(tmp_path / "p.db"), policy="spill")
+
+
+class TestWriterFailure:
+    """A dead or stuck writer must not hang producers or shutdown."""
+
+    def test_dead_writer_drops_instead_of_blocking(self, tmp_path, monkeypatch):
+        import prediction_store
+
+        real_connect = prediction_store.connect
+        calls = []
+
+        def connect_then_fail(path):
+            calls.append(path)
+            if len(calls) > 1:  # the writer thread's own connection
+                raise sqlite3.OperationalError("disk I/O error")
+            return real_connect(path)
+
+        monkeypatch.setattr(prediction_store, "connect", connect_then_fail)
+        store = PredictionStore(
+            str(tmp_path / "p.db"), queue_size=1, policy="block", block_timeout=None
+        )
+        store.start()
+        assert _wait_for(lambda: not store.stats()["writer_alive"])
+        started = time.monotonic()
+        assert store.submit(_record(0)) is False
+        assert store.submit(_record(1)) is False
+        assert time.monotonic() - started < 1.0
+        assert store.stats()["errors"] == 1
+        store.close(1)
+
+    def test_close_with_full_queue_and_stuck_writer(self, tmp_path, monkeypatch):
+        store = PredictionStore(str(tmp_path / "p.db"), queue_size=1, policy="block", batch_size=1)
+        release = threading.Event()
+        monkeypatch.setattr(store, "_flush", lambda conn, batch: release.wait(5))
+        store.start()
+        store.submit(_record(0))
+        assert _wait_for(lambda: store.stats()["queued"] == 0)  # writer is stuck on it
+        store.submit(_record(1))  # fills the queue
+        started = time.monotonic()
+        store.close(0.1)
+        assert time.monotonic() - started < 1.0
+        release.set()
@@ -11,6 +11,8 @@ Run:
 import sys
 import os
 
+import pytest
+
 # Ensure project root is importable
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -170,3 +172,82 @@ class TestPreprocessCorpus:
             assert "#" not in cleaned
             assert "$" not in cleaned
             assert "<" not in cleaned
+
+
+# ── Lazy NLTK resources ──────────────────────────────────────────────────
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_isolated(code: str) -> str:
+    """Run ``code`` in a fresh interpreter from the project root."""
+    import subprocess
+
+    env = dict(os.environ, NLTK_OFFLINE="true")
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return out.stdout.strip()
+
+
+class TestLazyResources:
+    """Importing the module must not load NLTK or hit the network."""
+
+    IMPORT_BUDGET_SECONDS = 0.5
+
+    def test_import_does_not_load_nltk(self):
+        out = _run_isolated(
+            "import sys, time\n"
+            "t = time.perf_counter()\n"
+            "import scripts.preprocess\n"
+            "print(time.perf_counter() - t, 'nltk' in sys.modules)"
+        )
+        elapsed, nltk_loaded = out.split()
+        assert nltk_loaded == "False"
+        assert float(elapsed) < self.IMPORT_BUDGET_SECONDS
+
+    def test_no_lemmatize_skips_nltk(self):
+        out = _run_isolated(
+            "import sys\n"
+            "from scripts.preprocess import clean_text\n"
+            "print(clean_text('The cats were running', lemmatize=False))\n"
+            "print('nltk' in sys.modules)"
+        )
+        cleaned, nltk_loaded = out.splitlines()
+        assert cleaned == "cats running"
+        assert nltk_loaded == "False"
+
+    def test_bundled_stop_words(self):
+        from scripts.preprocess import get_stop_words
+
+        words = get_stop_words()
+        assert "the" in words
+        assert "food" not in words
+
+
+class TestArtefactLemmatisation:
+    """Artefacts record whether lemmatisation really ran."""
+
+    def test_fallback_recorded_as_no_lemmatize(self, monkeypatch):
+        import scripts.preprocess as preprocess
+
+        monkeypatch.setattr(preprocess, "lemmatizer_available", lambda: False)
+        applied = preprocess.applied_clean_kwargs({"min_word_length": 1})
+        assert applied == {"min_word_length": 1, "lemmatize": False}
+        preprocess.check_lemmatizer(applied)
+        with pytest.raises(RuntimeError, match="WordNet"):
+            preprocess.check_lemmatizer({})
+
+    def test_wordnet_recorded(self, monkeypatch):
+        import scripts.preprocess as preprocess
+
+        monkeypatch.setattr(preprocess, "lemmatizer_available", lambda: True)
+        assert preprocess.applied_clean_kwargs() == {"lemmatize": True}
+        assert preprocess.applied_clean_kwargs({"lemmatize": False}) == {"lemmatize": False}
+        preprocess.check_lemmatizer({})
@@ -0,0 +1,87 @@
+"""
+test_request_profiling.py - Tests for Opt-In Request Profiling
+===============================================================
+Tests for request_profiling.py checking that both profile formats are
+written and readable, that backend stages appear as separate frames, and
+that a failing call still leaves its profile behind.
+
+Run:
+    pytest tests/test_request_profiling.py -v
+"""
+
+import sys
+import os
+import time
+import pstats
+
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from request_profiling import CollapsedStackProfiler, profile_call
+
+
+class _StagedBackend:
+    def tokenize(self, texts):
+        return [text.split() for text in texts]
+
+    def forward(self, tokens):
+        time.sleep(0.01)
+        return [len(t) % 2 for t in tokens]
+
+    def postprocess(self, labels):
+        return [(label, 0.9) for label in labels]
+
+    def predict(self, texts):
+        return self.postprocess(self.forward(self.tokenize(texts)))
+
+
+def _parse_collapsed(path):
+    with open(path) as f:
+        return {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in f}
+
+
+class TestCollapsed:
+    """Collapsed stacks with the backend stages as frames."""
+
+    def test_stages_are_separate_frames(self, tmp_path):
+        result, path = profile_call(
+            "collapsed", str(tmp_path), _StagedBackend().predict, ["a b", "c"]
+        )
+        assert result == [(0, 0.9), (1, 0.9)]
+        assert path.endswith(".collapsed")
+        stacks = _parse_collapsed(path)
+        leaves = {stack.split(";")[-1] for stack in stacks}
+        backend = "test_request_profiling.py:_StagedBackend"
+        for stage in ("forward", "postprocess", "tokenize"):
+            assert any(s.startswith(f"{backend}.predict;{backend}.{stage}") for s in stacks)
+        assert "time.sleep" in leaves
+        sleep_us = sum(us for stack, us in stacks.items() if stack.endswith("time.sleep"))
+        assert sleep_us >= 10_000
+
+    def test_restores_previous_profile_hook(self):
+        CollapsedStackProfiler().runcall(len, "abc")
+        assert sys.getprofile() is None
+
+
+class TestProfileCall:
+    """Formats, errors and unknown formats."""
+
+    def test_pstats_readable(self, tmp_path):
+        _, path = profile_call("pstats", str(tmp_path), _StagedBackend().predict, ["a"])
+        names = {func for _, _, func in pstats.Stats(path).stats}
+        assert {"tokenize", "forward", "postprocess"} <= names
+
+    def test_profile_saved_when_call_fails(self, tmp_path):
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            profile_call("collapsed", str(tmp_path), fail)
+        assert len(os.listdir(tmp_path)) == 1
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown profile format"):
+            profile_call("perf", str(tmp_path), len, "abc")
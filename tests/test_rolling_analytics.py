@@ -0,0 +1,183 @@
+"""
+test_rolling_analytics.py - Tests for Rolling Sentiment Analytics
+==================================================================
+Tests for rolling_analytics.py checking windowed totals against a brute
+force count, bucket expiry, merging across trackers, persistence and
+the cached multi-worker view.
+
+Run:
+    pytest tests/test_rolling_analytics.py -v
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from rolling_analytics import RollingAnalytics, SharedAnalytics, load_merged, parse_window
+
+T0 = 1_000_000 * 60  # bucket-aligned start time
+
+
+def _events(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    times = T0 + np.cumsum(rng.uniform(0, 4, n))
+    labels = rng.integers(0, 2, n)
+    confidences = rng.uniform(0.5, 1.0, n)
+    return list(zip(times.tolist(), labels.tolist(), confidences.tolist()))
+
+
+def _brute_force(events, now, seconds, bucket=60):
+    k = -(-seconds // bucket)
+    start = (int(now // bucket) - k + 1) * bucket
+    window = [(p, c) for t, p, c in events if start <= t <= now]
+    return len(window), sum(p for p, _ in window), sum(c for _, c in window)
+
+
+class TestWindows:
+    """O(1) window totals equal a rescan of the events."""
+
+    @pytest.mark.parametrize("seconds", [60, 300, 1800, 3600])
+    def test_matches_brute_force(self, seconds):
+        events = _events()
+        tracker = RollingAnalytics(60, 3600)
+        for t, p, c in events:
+            tracker.record(p, c, now=t)
+        now = events[-1][0]
+        count, positives, conf_sum = _brute_force(events, now, seconds)
+        summary = tracker.summary(seconds, now=now)
+        assert summary["count"] == count
+        assert summary["positive_share"] == pytest.approx(positives / count)
+        assert summary["mean_confidence"] == pytest.approx(conf_sum / count)
+
+    def test_old_buckets_expire(self):
+        tracker = RollingAnalytics(60, 3600)
+        tracker.record(1, 0.9, now=T0)
+        assert tracker.summary(300, now=T0 + 240)["count"] == 1
+        assert tracker.summary(300, now=T0 + 300)["count"] == 0
+        # Beyond the horizon everything has expired, even the longest window
+        assert tracker.summary(3600, now=T0 + 2 * 3600)["count"] == 0
+
+    def test_top_negative_aspects(self):
+        tracker = RollingAnalytics(60, 3600)
+        for aspect, n in (("wait_time", 3), ("price", 1), ("staff", 2), ("taste", 1)):
+            for _ in range(n):
+                tracker.record(0, 0.8, [aspect], now=T0)
+        top = tracker.summary(60, now=T0)["top_negative_aspects"]
+        assert top == [
+            {"aspect": "wait_time", "count": 3},
+            {"aspect": "staff", "count": 2},
+            {"aspect": "price", "count": 1},
+        ]
+
+    def test_empty_window(self):
+        summary = RollingAnalytics().summary(300, now=T0)
+        assert summary["count"] == 0
+        assert summary["positive_share"] is None
+
+    def test_parse_window(self):
+        assert parse_window("5m") == 300
+        assert parse_window("1h") == 3600
+        assert parse_window("1d") == 86400
+        with pytest.raises(ValueError):
+            parse_window("soon")
+
+
+class TestMerge:
+    """Workers' trackers combine into the totals of all their events."""
+
+    def test_merge_equals_single_tracker(self):
+        events = _events()
+        single, a, b = (RollingAnalytics(60, 3600) for _ in range(3))
+        for i, (t, p, c) in enumerate(events):
+            single.record(p, c, ["price"] if p == 0 else [], now=t)
+            (a if i % 3 else b).record(p, c, ["price"] if p == 0 else [], now=t)
+        now = events[-1][0]
+        merged = a.merge(b)
+        for seconds in (60, 600, 3600):
+            np.testing.assert_allclose(merged.window(seconds, now), single.window(seconds, now))
+
+    def test_idle_worker_merges(self):
+        busy, idle = RollingAnalytics(60, 3600), RollingAnalytics(60, 3600)
+        busy.record(1, 0.9, now=T0 + 600)
+        idle.record(0, 0.7, now=T0)
+        merged = busy.merge(idle)
+        assert merged.summary(3600, now=T0 + 600)["count"] == 2
+        assert merged.summary(300, now=T0 + 600)["count"] == 1
+
+    def test_rejects_different_buckets(self):
+        with pytest.raises(ValueError):
+            RollingAnalytics(60, 3600).merge(RollingAnalytics(30, 3600))
+
+    def test_save_and_load_merged(self, tmp_path):
+        own = RollingAnalytics(60, 3600, clock=lambda: T0 + 30)
+        own.record(1, 0.9)
+        other = RollingAnalytics(60, 3600)
+        other.record(0, 0.6, ["staff"], now=T0)
+        other.save(str(tmp_path / "worker-2.npz"))
+        own_path = str(tmp_path / "worker-1.npz")
+        own.save(own_path)
+
+        merged, workers = load_merged(str(tmp_path), own=own, own_path=own_path)
+        assert workers == 2
+        summary = merged.summary(300)
+        assert summary["count"] == 2
+        assert summary["top_negative_aspects"] == [{"aspect": "staff", "count": 1}]
+
+
+class TestSharedAnalytics:
+    """Queries over worker files without reloading them each time."""
+
+    @pytest.fixture
+    def worker_dir(self, tmp_path):
+        other = RollingAnalytics(60, 3600)
+        other.record(0, 0.6, ["staff"], now=T0)
+        other.save(str(tmp_path / "worker-2.npz"))
+        os.utime(tmp_path / "worker-2.npz", (T0, T0))
+        return tmp_path
+
+    def _own(self):
+        own = RollingAnalytics(60, 3600, clock=lambda: T0 + 30)
+        own.record(1, 0.9)
+        return own
+
+    def test_matches_load_merged(self, worker_dir):
+        own = self._own()
+        shared = SharedAnalytics(str(worker_dir), own, str(worker_dir / "worker-1.npz"))
+        merged, workers = load_merged(str(worker_dir), own=own)
+        assert shared.workers == workers == 2
+        np.testing.assert_allclose(shared.window(300), merged.window(300))
+        assert shared.summary(300)["top_negative_aspects"] == [{"aspect": "staff", "count": 1}]
+
+    def test_files_reloaded_only_when_changed(self, worker_dir, monkeypatch):
+        shared = SharedAnalytics(str(worker_dir), self._own(), refresh_seconds=0)
+        shared.summary(300)
+        loads, load = [], RollingAnalytics.load
+        monkeypatch.setattr(
+            RollingAnalytics, "load", classmethod(lambda cls, *a: loads.append(a) or load(*a))
+        )
+        shared.summary(300)
+        assert loads == []
+
+        os.utime(worker_dir / "worker-2.npz", (T0 + 1, T0 + 1))
+        shared.summary(300)
+        assert len(loads) == 1
+
+    def test_refresh_interval(self, worker_dir):
+        shared = SharedAnalytics(str(worker_dir), self._own(), refresh_seconds=3600)
+        assert shared.workers == 2
+        os.remove(worker_dir / "worker-2.npz")
+        assert shared.workers == 2
+        shared.refresh()
+        assert shared.workers == 1
+
+    def test_skips_files_older_than_horizon(self, worker_dir):
+        os.utime(worker_dir / "worker-2.npz", (T0 - 7200, T0 - 7200))
+        own = self._own()
+        assert SharedAnalytics(str(worker_dir), own).workers == 1
+        assert load_merged(str(worker_dir), own=own)[1] == 1
@@ -0,0 +1,96 @@
+"""
+test_shadow_scoring.py - Tests for Sampled Shadow Scoring
+==========================================================
+Tests for shadow_scoring.py covering sampling, the non-blocking queue,
+the bounded ring buffer and the summary statistics.
+
+Run:
+    pytest tests/test_shadow_scoring.py -v
+"""
+
+import sys
+import os
+import threading
+
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from shadow_scoring import ShadowScorer
+
+
+class FixedBackend:
+    """Predicts positive with a fixed confidence; can be made to block."""
+
+    name = "fixed"
+
+    def __init__(self, confidence=0.9):
+        self.confidence = confidence
+        self.release = threading.Event()
+        self.release.set()
+
+    def predict(self, texts):
+        self.release.wait()
+        return [(1, self.confidence) for _ in texts]
+
+
+class TestSubmit:
+    """Sampling and back-pressure on the request side."""
+
+    def test_sample_rate(self):
+        shadow = ShadowScorer(FixedBackend(), sample_rate=0.25, queue_size=10_000, seed=0)
+        queued = sum(shadow.submit("text", 1, 0.8) for _ in range(4000))
+        assert 800 < queued < 1200
+        assert shadow.summary()["submitted"] == 4000
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        backend = FixedBackend()
+        backend.release.clear()
+        shadow = ShadowScorer(backend, sample_rate=1.0, queue_size=2)
+        shadow.start()
+        try:
+            results = [shadow.submit("text", 1, 0.8) for _ in range(10)]
+            # The worker holds at most one item, the queue two more
+            assert results.count(True) <= 3
+            assert shadow.summary()["dropped"] == results.count(False)
+        finally:
+            backend.release.set()
+            shadow.stop(timeout=5)
+
+    def test_rejects_invalid_rate(self):
+        with pytest.raises(ValueError):
+            ShadowScorer(FixedBackend(), sample_rate=1.5)
+
+
+class TestSummary:
+    """Agreement, deltas and latency over the ring buffer."""
+
+    def test_worker_records_comparisons(self):
+        shadow = ShadowScorer(FixedBackend(confidence=0.9), sample_rate=1.0)
+        shadow.start()
+        shadow.submit("agrees", 1, 0.7)
+        shadow.submit("disagrees", 0, 0.6)
+        shadow.stop(timeout=5)
+
+        summary = shadow.summary()
+        assert summary["scored"] == 2
+        assert summary["agreement_rate"] == pytest.approx(0.5)
+        assert summary["flips"] == {"negative_to_positive": 1, "positive_to_negative": 0}
+        # P(positive): shadow 0.9 vs primary 0.7 and 0.4
+        assert summary["confidence_delta"]["mean"] == pytest.approx((0.2 + 0.5) / 2)
+        assert summary["latency_ms"]["p50"] >= 0
+
+    def test_ring_buffer_is_bounded(self):
+        shadow = ShadowScorer(FixedBackend(), buffer_size=5)
+        for _ in range(12):
+            shadow.score("text", 1, 0.9)
+        summary = shadow.summary()
+        assert summary["window"] == 5
+        assert summary["scored"] == 12
+
+    def test_empty_summary(self):
+        summary = ShadowScorer(FixedBackend()).summary()
+        assert summary["window"] == 0
+        assert "agreement_rate" not in summary
@@ -0,0 +1,125 @@
+"""
+test_sharded_validation.py - Tests for Sharded, Parallel Validation
+====================================================================
+Tests for mergeable statistics (data_validation.merge_statistics) and
+sharded_validation.py covering range planning, parallel workers and
+report equivalence with validate_dataset.
+
+Run:
+    pytest tests/test_sharded_validation.py -v
+"""
+
+import sys
+import os
+
+import pandas as pd
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from data_validation import compute_statistics, merge_statistics, validate_dataset
+from sharded_validation import plan_ranges, validate_shards
+
+REVIEWS = [
+    "Great food", "Great food", "  ", "ok", "Loved the pasta", "Cold soup",
+    "Rude staff", "Great food", "Loved the pasta!", "x" * 30,
+]
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"Review": REVIEWS, "Liked": [1, 0] * 5})
+
+
+def _write_tsv(path, frame):
+    frame.to_csv(path, sep="\t", index=False)
+    return str(path)
+
+
+class TestMergeStatistics:
+    """Merged partial statistics equal whole-dataset statistics."""
+
+    def test_merge_matches_whole(self, df):
+        whole = compute_statistics(df)
+        merged = merge_statistics(compute_statistics(df[:4]), compute_statistics(df[4:]))
+        assert merged["n_rows"] == whole["n_rows"]
+        assert merged["null_counts"] == whole["null_counts"]
+        assert merged["labels"] == whole["labels"]
+        for key in ("n_duplicates", "n_empty", "length_min", "length_max",
+                    "length_sum", "too_short", "too_long"):
+            assert merged["text"][key] == whole["text"][key], key
+
+    def test_signatures_concatenate_in_order(self, df):
+        whole = compute_statistics(df, minhash=True)
+        merged = merge_statistics(
+            compute_statistics(df[:3], minhash=True), compute_statistics(df[3:], minhash=True)
+        )
+        assert (merged["text"]["signatures"] == whole["text"]["signatures"]).all()
+
+    def test_sketch_estimates_duplicates(self):
+        texts = pd.Series([f"review {i % 5000}" for i in range(20000)])
+        stats = compute_statistics(pd.DataFrame({"Review": texts}), sketch_size=1024)
+        assert stats["text"]["duplicates_estimated"] is True
+        assert stats["text"]["n_duplicates"] == pytest.approx(15000, rel=0.1)
+
+    def test_in_memory_count_is_exact(self):
+        texts = pd.Series([f"review {i % 5000}" for i in range(20000)])
+        stats = compute_statistics(pd.DataFrame({"Review": texts}))
+        assert stats["text"]["duplicates_estimated"] is False
+        assert stats["text"]["n_duplicates"] == 15000
+
+    def test_mismatched_settings_rejected(self, df):
+        with pytest.raises(ValueError):
+            merge_statistics(
+                compute_statistics(df, min_length=3), compute_statistics(df, min_length=5)
+            )
+
+
+class TestPlanRanges:
+    """Tests for line-aligned byte ranges."""
+
+    def test_ranges_cover_rows(self, tmp_path, df):
+        path = _write_tsv(tmp_path / "reviews.tsv", df)
+        ranges = plan_ranges(path, chunk_bytes=16)
+        with open(path, "rb") as f:
+            data = f.read()
+        header_end = data.index(b"\n") + 1
+        assert ranges[0][0] == header_end
+        assert ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start and data[end - 1:end] == b"\n"
+
+    def test_header_only(self, tmp_path):
+        path = tmp_path / "empty.tsv"
+        path.write_text("Review\tLiked\n")
+        assert plan_ranges(str(path)) == []
+
+
+class TestValidateShards:
+    """Sharded validation reproduces the single-file report."""
+
+    def test_matches_validate_dataset(self, tmp_path, df):
+        path = _write_tsv(tmp_path / "reviews.tsv", df)
+        expected = validate_dataset(path, near_duplicates=True, verbose=False)
+        report = validate_shards([path], chunk_bytes=20, processes=1,
+                                 near_duplicates=True, verbose=False)
+        assert report["summary"]["ranges"] > 1
+        assert report["checks"] == expected["checks"]
+        assert report["is_valid"] == expected["is_valid"]
+
+    def test_multiple_shards_in_parallel(self, tmp_path, df):
+        whole = _write_tsv(tmp_path / "whole.tsv", df)
+        shards = [
+            _write_tsv(tmp_path / "part-0.tsv", df[:6]),
+            _write_tsv(tmp_path / "part-1.tsv", df[6:]),
+        ]
+        expected = validate_dataset(whole, near_duplicates=False, verbose=False)
+        report = validate_shards(shards, chunk_bytes=32, processes=2, verbose=False)
+        assert report["summary"]["total_rows"] == len(df)
+        assert report["checks"][2:] == expected["checks"][1:]
+
+    def test_missing_shard(self, tmp_path):
+        report = validate_shards([str(tmp_path / "missing.tsv")], verbose=False)
+        assert report["is_valid"] is False
@@ -0,0 +1,94 @@
+"""
+test_single_flight.py - Tests for Single-Flight Deduplication
+==============================================================
+Tests for single_flight.py checking that concurrent identical calls run
+once, that different keys and later calls run separately, and that
+errors and cancellations are handled per caller.
+
+Run:
+    pytest tests/test_single_flight.py -v
+"""
+
+import sys
+import os
+import time
+import asyncio
+import threading
+
+import pytest
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from single_flight import SingleFlight
+
+
+class _SlowModel:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def predict(self, text):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return (int("good" in text), 0.9)
+
+
+class TestCollapse:
+    """Concurrent identical keys share one execution."""
+
+    async def test_burst_runs_once(self):
+        flights, model = SingleFlight(), _SlowModel()
+        results = await asyncio.gather(
+            *(flights.do("good food", model.predict, "good food") for _ in range(20))
+        )
+        assert model.calls == 1
+        assert results == [(1, 0.9)] * 20
+        assert flights.summary() == {"in_flight": 0, "calls": 20, "executions": 1, "collapsed": 19}
+
+    async def test_different_keys_run_separately(self):
+        flights, model = SingleFlight(), _SlowModel()
+        results = await asyncio.gather(
+            flights.do("a", model.predict, "good"),
+            flights.do("b", model.predict, "bad"),
+        )
+        assert model.calls == 2
+        assert results == [(1, 0.9), (0, 0.9)]
+
+    async def test_not_a_cache(self):
+        flights, model = SingleFlight(), _SlowModel(delay=0)
+        await flights.do("k", model.predict, "good")
+        await flights.do("k", model.predict, "good")
+        assert model.calls == 2
+
+
+class TestFailures:
+    """Errors reach every waiter; cancelling one waiter spares the rest."""
+
+    async def test_error_propagates_to_all(self):
+        flights = SingleFlight()
+
+        def fail():
+            time.sleep(0.02)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            *(flights.do("k", fail) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flights.summary()["in_flight"] == 0
+
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        flights, model = SingleFlight(), _SlowModel(delay=0.1)
+        leader = asyncio.create_task(flights.do("k", model.predict, "good"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flights.do("k", model.predict, "good"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == (1, 0.9)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert model.calls == 1
@@ -0,0 +1,84 @@
+"""
+test_sparse_features.py - Tests for Count-Once Sparse TF-IDF Features
+======================================================================
+Tests for sparse_features.py checking that column slices of a single
+count matrix reproduce ``TfidfVectorizer(max_features=k)`` exactly.
+
+Run:
+    pytest tests/test_sparse_features.py -v
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Scripts import their siblings by bare name
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from sparse_features import (
+    build_vectorizer,
+    count_corpus,
+    term_frequency_order,
+    tfidf_from_counts,
+    top_k_columns,
+)
+
+
+@pytest.fixture
+def corpus():
+    return [
+        "food great service great",
+        "terrible cold soup rude staff",
+        "pasta amazing ambiance great",
+        "worst meal never coming back",
+        "food okay nothing special average food",
+        "staff friendly food tasty",
+    ]
+
+
+class TestTopKColumns:
+    """Slices must match TfidfVectorizer(max_features=k)."""
+
+    @pytest.mark.parametrize("k", [1, 3, 5, 8, None])
+    def test_matches_vectorizer(self, corpus, k):
+        counter, counts = count_corpus(corpus)
+        cols = top_k_columns(counts, k, term_frequency_order(counts))
+        X, idf = tfidf_from_counts(counts[:, cols])
+
+        ref = TfidfVectorizer(max_features=k)
+        X_ref = ref.fit_transform(corpus)
+
+        assert list(counter.get_feature_names_out()[cols]) == list(ref.get_feature_names_out())
+        np.testing.assert_allclose(idf, ref.idf_)
+        np.testing.assert_allclose(X.toarray(), X_ref.toarray())
+
+    def test_stays_sparse(self, corpus):
+        _, counts = count_corpus(corpus)
+        X, _ = tfidf_from_counts(counts[:, top_k_columns(counts, 4)])
+        assert sp.issparse(X)
+
+    def test_k_larger_than_vocabulary(self, corpus):
+        _, counts = count_corpus(corpus)
+        assert len(top_k_columns(counts, 10_000)) == counts.shape[1]
+
+
+class TestBuildVectorizer:
+    """The assembled vectoriser must transform new text like a refit one."""
+
+    def test_transform_matches_refit(self, corpus):
+        counter, counts = count_corpus(corpus)
+        cols = top_k_columns(counts, 5)
+        _, idf = tfidf_from_counts(counts[:, cols])
+        vectorizer = build_vectorizer(counter.get_feature_names_out()[cols], idf)
+
+        ref = TfidfVectorizer(max_features=5).fit(corpus)
+        new_text = ["great food and rude staff", "nothing in vocabulary"]
+        np.testing.assert_allclose(
+            vectorizer.transform(new_text).toarray(),
+            ref.transform(new_text).toarray(),
+        )